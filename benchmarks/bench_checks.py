@@ -0,0 +1,123 @@
+"""Compares the built-in vectorized checks (and a check expression) against the same checks written
+as row-wise functions.
+
+    python benchmarks/bench_checks.py --rows 200000
+
+Both run through the serial executor and the alias map, so the numbers include binding the
+columns, not only the checks themselves. The verdicts of each pair are compared before timing.
+"""
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from tempcli.core import checks
+from tempcli.core.components.alias_map import AliasMap
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.components.reference import Reference
+from tempcli.core.support.executor import Executor, Task
+
+ID_PATTERN = re.compile(r"[A-Z]-\d{4}")
+STATUSES = frozenset({"open", "closed"})
+KNOWN_IDS = Reference([f"{c}-{n:04d}" for c in "AB" for n in range(10**4)], name="known_ids")
+KNOWN_ID_SET = set(KNOWN_IDS.values)
+
+
+def not_null_row(price) -> bool:
+    return not pd.isna(price)
+
+
+def in_range_row(price) -> bool:
+    return not pd.isna(price) and 0 <= price <= 100
+
+
+def in_set_row(status) -> bool:
+    return status in STATUSES
+
+
+def matches_row(order_id) -> bool:
+    return isinstance(order_id, str) and ID_PATTERN.fullmatch(order_id) is not None
+
+
+def known_id_row(order_id) -> bool:
+    return order_id in KNOWN_ID_SET
+
+
+def ordered_row(placed, shipped) -> bool:
+    return not pd.isna(placed) and not pd.isna(shipped) and placed < shipped
+
+
+def tolerance_row(price, quoted) -> bool:
+    if pd.isna(price) or pd.isna(quoted):
+        return False
+    return abs(price - quoted) <= max(0.01, 0.01 * abs(quoted))
+
+
+PAIRS = [
+    ("not null", checks.not_null("price"), Fn(not_null_row)),
+    ("in range", checks.in_range("price", low=0, high=100), Fn(in_range_row)),
+    ("in set", checks.in_set("status", STATUSES), Fn(in_set_row)),
+    ("matches", checks.matches("order_id", ID_PATTERN), Fn(matches_row)),
+    ("reference", checks.in_reference("order_id", KNOWN_IDS), Fn(known_id_row)),
+    ("ordered", checks.ordered("placed", "shipped"), Fn(ordered_row)),
+    ("tolerance", checks.within_tolerance("price", "quoted", abs_tol=0.01, rel_tol=0.01), Fn(tolerance_row)),
+    ("expression", checks.expression("0 <= price <= 100", name="price_range"), Fn(in_range_row)),
+]
+
+
+def build_source(n_rows: int) -> DataSource:
+    rng = np.random.default_rng(seed=0)
+    price = rng.uniform(-10, 110, size=n_rows)
+    price[rng.random(n_rows) < 0.01] = np.nan
+    placed = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, size=n_rows), unit="D")
+    prefixes = rng.choice(list("ABc"), size=n_rows)
+    numbers = rng.integers(0, 10**4, size=n_rows)
+    df = pd.DataFrame({
+        "order id": [f"{c}-{n:04d}" for c, n in zip(prefixes, numbers)],
+        "status": rng.choice(["open", "closed", "lost"], size=n_rows),
+        "price": price,
+        "quoted": price * rng.normal(1, 0.01, size=n_rows),
+        "placed": placed,
+        "shipped": placed + pd.to_timedelta(rng.integers(-2, 10, size=n_rows), unit="D"),
+    })
+    return DataSource("orders", df)
+
+
+def run(alias_map: AliasMap, task: Task) -> tuple[np.ndarray, float]:
+    start = time.perf_counter()
+    [(_, result)] = list(Executor().map(alias_map, [task]))
+    seconds = time.perf_counter() - start
+    [fn_result] = result.unwrap().unwrap()
+    return np.asarray(fn_result.result, dtype=bool), seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    alias_map = AliasMap({
+        "order_id": "order id",
+        "status": "status",
+        "price": "price",
+        "quoted": "quoted",
+        "placed": "placed",
+        "shipped": "shipped",
+    })
+    source = build_source(args.rows)
+
+    print(f"{args.rows} rows")
+    print(f"{'check':<11} {'vectorized':>11} {'row-wise':>10} {'speedup':>8}")
+    for label, vectorized, row_wise in PAIRS:
+        fast, fast_seconds = run(alias_map, Task(source, vectorized))
+        slow, slow_seconds = run(alias_map, Task(source, row_wise))
+        if not np.array_equal(fast, slow):
+            raise AssertionError(f"`{label}` disagrees with its row-wise version on {int((fast != slow).sum())} rows")
+        print(f"{label:<11} {fast_seconds:10.4f}s {slow_seconds:9.4f}s {slow_seconds / fast_seconds:7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
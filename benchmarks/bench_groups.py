@@ -0,0 +1,80 @@
+"""Times a grouped check, called per group on slices and as a groupwise kernel, against the same check
+run through `DataFrame.groupby(...).apply`.
+
+    python benchmarks/bench_groups.py --rows 1000000 --groups 10000
+
+The check fails every row of an account whose prices don't add up to the account total.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from tempcli.core.components.alias_map import AliasMap
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.support.executor import Executor, Task
+from tempcli.core.support.group import Groups
+
+
+def totals_match(price: pd.Series, total: pd.Series) -> bool:
+    return bool(np.isclose(price.sum(), total.iloc[0]))
+
+
+def totals_match_kernel(price: pd.Series, total: pd.Series, groups: Groups) -> np.ndarray:
+    sums = np.bincount(groups.codes, weights=price.to_numpy(), minlength=len(groups))
+    return groups.broadcast(np.isclose(sums, groups.first(total.to_numpy())))
+
+
+def build_source(n_rows: int, n_groups: int) -> DataSource:
+    rng = np.random.default_rng(seed=0)
+    account = rng.integers(0, n_groups, size=n_rows)
+    price = rng.uniform(0, 100, size=n_rows)
+    total = pd.Series(price).groupby(account).transform("sum").to_numpy(copy=True)
+    total[rng.random(n_rows) < 0.001] += 1.0
+    return DataSource("ledger", pd.DataFrame({"account": account, "price": price, "total": total}))
+
+
+def with_apply(df: pd.DataFrame) -> np.ndarray:
+    passed = df.groupby("account", group_keys=False)[["price", "total"]].apply(
+        lambda g: pd.Series(np.isclose(g["price"].sum(), g["total"].iloc[0]), index=g.index)
+    )
+    return passed.reindex(df.index).to_numpy()
+
+
+def run(alias_map: AliasMap, task: Task) -> tuple[np.ndarray, float]:
+    start = time.perf_counter()
+    [(_, result)] = list(Executor().map(alias_map, [task]))
+    seconds = time.perf_counter() - start
+    [fn_result] = result.unwrap().unwrap()
+    return np.asarray(fn_result.result, dtype=bool), seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--groups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    source = build_source(args.rows, args.groups)
+    alias_map = AliasMap({"account": "account", "price": "price", "total": "total"})
+
+    per_group, per_group_seconds = run(alias_map, Task(source, Fn(totals_match, group_by="account")))
+    kernel, kernel_seconds = run(alias_map, Task(source, Fn(totals_match_kernel, group_by="account")))
+    start = time.perf_counter()
+    applied = with_apply(source.data)
+    apply_seconds = time.perf_counter() - start
+
+    for label, verdicts in (("per group", per_group), ("kernel", kernel)):
+        if not np.array_equal(verdicts, applied):
+            raise AssertionError(f"{label} disagrees with groupby.apply on {int((verdicts != applied).sum())} rows")
+
+    print(f"{args.rows} rows, {args.groups} groups, {int((~kernel).sum())} failed")
+    print(f"per group:      {per_group_seconds:8.3f}s")
+    print(f"kernel:         {kernel_seconds:8.3f}s")
+    print(f"groupby.apply:  {apply_seconds:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Times a keyed reconciliation of two large sources, against the same job done with `pd.merge`.
+
+    python benchmarks/bench_reconcile.py --rows 10000000
+
+The right source is the left one shuffled, with a few rows dropped, added and changed.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from tempcli.core.components.data import DataSource
+from tempcli.core.reconcile import Reconciler, Tolerance
+
+
+def build_sources(n_rows: int) -> tuple[DataSource, DataSource]:
+    rng = np.random.default_rng(seed=0)
+    left = pd.DataFrame({
+        "iid": rng.permutation(n_rows * 2)[:n_rows],
+        "price": rng.uniform(0, 100, size=n_rows),
+        "category": rng.choice(["A", "B", "C"], size=n_rows),
+    })
+    right = left.sample(frac=0.99, random_state=1).rename(columns={"iid": "Item ID", "price": "Unit Price"})
+    changed = rng.random(len(right)) < 0.01
+    right.loc[changed, "Unit Price"] += 1.0
+    extra = pd.DataFrame({"Item ID": -np.arange(1, n_rows // 100 + 1), "Unit Price": 1.0, "category": "A"})
+    right = pd.concat([right, extra], ignore_index=True)
+    return DataSource("system", left), DataSource("vendor", right)
+
+
+def with_merge(left: pd.DataFrame, right: pd.DataFrame) -> dict[str, int]:
+    joined = left.merge(right, left_on="iid", right_on="Item ID", how="outer", indicator=True)
+    both = joined[joined["_merge"] == "both"]
+    mismatched = ((both["price"] - both["Unit Price"]).abs() > 0.01) | (both["category_x"] != both["category_y"])
+    return {
+        "mismatched": int(mismatched.sum()),
+        "missing_left": int((joined["_merge"] == "right_only").sum()),
+        "missing_right": int((joined["_merge"] == "left_only").sum()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    left, right = build_sources(args.rows)
+    aliases = {"iid": ["iid", "Item ID"], "price": ["price", "Unit Price"], "category": "category"}
+
+    start = time.perf_counter()
+    reconciler = Reconciler(left, aliases, key="iid", compare={"price": Tolerance(abs_tol=0.01), "category": None})
+    indexed = time.perf_counter()
+    outcome = reconciler.against(right)
+    done = time.perf_counter()
+    merged = with_merge(left.data, right.data)
+    merge_done = time.perf_counter()
+
+    counts = outcome.counts()
+    for name, n in merged.items():
+        if counts[name] != n:
+            raise AssertionError(f"{name}: {counts[name]} reconciled, {n} with pd.merge")
+
+    print(f"{args.rows} rows: {counts}")
+    print(f"index left:  {indexed - start:8.3f}s")
+    print(f"reconcile:   {done - indexed:8.3f}s")
+    print(f"pd.merge:    {merge_done - done:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
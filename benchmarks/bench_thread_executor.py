@@ -0,0 +1,70 @@
+"""Compares the serial and thread-pool executors on a pure Python, CPU bound check.
+
+Run it once on a regular build and once on a free-threaded build, e.g.
+
+    python3.13 benchmarks/bench_thread_executor.py
+    python3.13t benchmarks/bench_thread_executor.py
+
+With the GIL the thread pool is no faster than running serially. Without it,
+the speedup should approach the number of workers.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from tempcli.core.components.alias_map import AliasMap
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.support.executor import Executor, Task, ThreadExecutor
+
+
+def digits_sum_is_even(iid: int) -> bool:
+    """deliberately slow, pure Python row check."""
+    total = 0
+    for _ in range(50):
+        total += sum(int(d) for d in str(iid))
+    return total % 2 == 0
+
+
+def build_tasks(n_sources: int, n_rows: int) -> list[Task]:
+    rng = np.random.default_rng(seed=0)
+    fn = Fn(digits_sum_is_even)
+    tasks = []
+    for i in range(n_sources):
+        df = pd.DataFrame({"iid": rng.integers(0, 10**9, size=n_rows)})
+        tasks.append(Task(DataSource(f"source_{i}", df), fn))
+    return tasks
+
+
+def time_executor(executor: Executor, alias_map: AliasMap, tasks: list[Task]) -> float:
+    start = time.perf_counter()
+    for _ in executor.map(alias_map, tasks):
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    alias_map = AliasMap({"iid": "iid"})
+    tasks = build_tasks(args.sources, args.rows)
+
+    serial = time_executor(Executor(), alias_map, tasks)
+    threaded = time_executor(ThreadExecutor(max_workers=args.workers), alias_map, tasks)
+
+    print(f"python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled else 'disabled'}")
+    print(f"{args.sources} sources x {args.rows} rows, {args.workers} threads")
+    print(f"serial:   {serial:8.3f}s")
+    print(f"threaded: {threaded:8.3f}s  ({serial / threaded:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Columnar (Feather or Parquet) storage of full check outputs, partitioned by run, data source and check.
+
+    <root>/run_id=<uuid>/data_source=<name>/check=<name>/part-<n>.<feather|parquet>
+
+Each part holds one FnResult (one column group of the check) with two columns:
+`result`, the raw output of the check, and `failed`, the rows that did not pass.
+Row positions are implicit in the row order.
+"""
+import os
+from collections.abc import Collection
+from pathlib import Path
+from urllib.parse import quote
+from uuid import UUID
+
+import numpy as np
+import pandas as pd
+
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.support.interfaces import FnResult
+from tempcli.core.support.sink import ResultSink
+from tempcli.core.support.summary import check_label, columns_label, failed_mask
+from tempcli.core.types.result import Result
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency, see the `columnar` extra
+    pa = None
+    pq = None
+
+FORMATS = {"feather": ".feather", "parquet": ".parquet"}
+_COLUMNS_KEY = b"tempcli.columns"
+
+
+class ColumnarStore(ResultSink):
+    """writes the full output of every check to its own partition, as the checks finish.
+
+    Used as a sink for `Pipeline.run_summary(sinks=[store])`. Each FnResult is streamed to disk in
+    batches of `batch_rows` rows, so the run never has to hold its outputs as one DataFrame.
+    Reading one check of one run only opens that check's partition, and Feather files are
+    memory-mapped rather than loaded.
+    """
+
+    def __init__(self, root: str | os.PathLike, format: str = "feather", batch_rows: int = 1_000_000):
+        """
+        :param root: the directory holding every run.
+        :param format: `feather` (uncompressed, memory-mappable) or `parquet` (compressed).
+        :param batch_rows: the rows per written batch (Feather) or row group (Parquet).
+        """
+        if pa is None:
+            raise ImportError("ColumnarStore needs pyarrow. Install it with `pip install tempcli[columnar]`.")
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {list(FORMATS)}, got {format!r}.")
+        self.root = Path(root)
+        self.format = format
+        self.batch_rows = batch_rows
+
+    def partition(self, run_id: UUID, data_source: str, check: str) -> Path:
+        """returns the directory of one check, on one data source, for one run."""
+        return (
+            self.root
+            / f"run_id={run_id}"
+            / f"data_source={quote(data_source, safe='')}"
+            / f"check={quote(check, safe='')}"
+        )
+
+    def write(
+            self,
+            run_id: UUID,
+            data: DataSource,
+            fn: Fn,
+            result: Result[Collection[FnResult], str],
+    ) -> None:
+        if result.is_err():
+            return
+        for i, fn_result in enumerate(result.unwrap()):
+            if fn_result is None:
+                continue
+            # the outputs of a multi-output check each get their own partition, like their summary rows
+            path = self.partition(run_id, data.name, check_label(fn, fn_result))
+            path.mkdir(parents=True, exist_ok=True)
+            self._write_part(path / f"part-{i}{FORMATS[self.format]}", fn, fn_result)
+
+    def read(self, run_id: UUID, data_source: str, check: str) -> pd.DataFrame:
+        """reads back the output of one check, on one data source, for one run.
+
+        :return: pd.DataFrame with `columns` (the column group), `result` and `failed`, in row order per group.
+        """
+        path = self.partition(run_id, data_source, check)
+        parts = sorted(path.glob(f"part-*{FORMATS[self.format]}"), key=lambda p: int(p.stem.split("-")[1]))
+        if not parts:
+            raise FileNotFoundError(f"No results for check {check} on {data_source} in run {run_id}.")
+
+        frames = []
+        for part in parts:
+            table = self._read_part(part)
+            columns = (table.schema.metadata or {}).get(_COLUMNS_KEY, b"").decode() or None
+            frames.append(table.to_pandas().assign(columns=columns))
+        return pd.concat(frames, ignore_index=True)[["columns", "result", "failed"]]
+
+    def runs(self) -> list[UUID]:
+        """returns the runs found under `root`."""
+        return [UUID(p.name.split("=", 1)[1]) for p in self.root.glob("run_id=*") if p.is_dir()]
+
+    def _write_part(self, path: Path, fn: Fn, fn_result: FnResult) -> None:
+        result = fn_result.result
+        values = result if isinstance(result, pd.Series) else pd.Series(np.atleast_1d(np.asarray(result)))
+        label = columns_label(fn, fn_result) or ""
+
+        writer = None
+        try:
+            for start in range(0, max(len(values), 1), self.batch_rows):
+                chunk = values.iloc[start:start + self.batch_rows]
+                batch = pa.record_batch({
+                    "result": pa.array(chunk, from_pandas=True),
+                    "failed": pa.array(failed_mask(fn, chunk)),
+                })
+                if writer is None:
+                    schema = batch.schema.with_metadata({_COLUMNS_KEY: label.encode()})
+                    writer = self._open_writer(path, schema)
+                batch = batch.replace_schema_metadata(schema.metadata)
+                if self.format == "parquet":
+                    writer.write_batch(batch, row_group_size=self.batch_rows)
+                else:
+                    writer.write_batch(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def _open_writer(self, path: Path, schema):
+        if self.format == "parquet":
+            return pq.ParquetWriter(path, schema)
+        return pa.ipc.new_file(str(path), schema)
+
+    def _read_part(self, path: Path):
+        if self.format == "parquet":
+            return pq.read_table(path, memory_map=True)
+        # the table's buffers point into the mapping, which stays open as long as they do
+        return pa.ipc.open_file(pa.memory_map(str(path))).read_all()
@@ -0,0 +1,266 @@
+"""SQLite backed history of `Pipeline.run_summary` results"""
+import os
+import sqlite3
+import time
+import zlib
+from datetime import datetime
+from uuid import UUID
+
+import numpy as np
+import pandas as pd
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    pipeline TEXT,
+    created_at REAL NOT NULL,
+    checks INTEGER NOT NULL,
+    failed_checks INTEGER NOT NULL,
+    errors INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS check_results (
+    run_id TEXT NOT NULL,
+    data_key TEXT NOT NULL,
+    fn_key TEXT NOT NULL,
+    data_source TEXT NOT NULL,
+    check_name TEXT NOT NULL,
+    columns TEXT,
+    rows INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    failure_rate REAL,
+    status TEXT NOT NULL,
+    message TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS source_results (
+    run_id TEXT NOT NULL,
+    data_key TEXT NOT NULL,
+    data_source TEXT NOT NULL,
+    checks INTEGER NOT NULL,
+    failed_checks INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS failing_rows (
+    run_id TEXT NOT NULL,
+    data_key TEXT NOT NULL,
+    fn_key TEXT NOT NULL,
+    check_name TEXT,
+    columns TEXT,
+    n INTEGER NOT NULL,
+    positions BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_runs_created ON runs (created_at);
+CREATE INDEX IF NOT EXISTS ix_check_results_run ON check_results (run_id);
+CREATE INDEX IF NOT EXISTS ix_check_results_fn ON check_results (fn_key, created_at);
+CREATE INDEX IF NOT EXISTS ix_check_results_data ON check_results (data_key, created_at);
+CREATE INDEX IF NOT EXISTS ix_source_results_data ON source_results (data_key, created_at);
+CREATE INDEX IF NOT EXISTS ix_failing_rows_run ON failing_rows (run_id, fn_key, data_key);
+"""
+
+
+def encode_positions(positions: np.ndarray) -> bytes:
+    """packs sorted row positions as zlib compressed deltas, which is a few bytes per run of failures."""
+    deltas = np.diff(np.asarray(positions, dtype=np.int64), prepend=0)
+    return zlib.compress(deltas.tobytes())
+
+
+def decode_positions(blob: bytes) -> np.ndarray:
+    """the inverse of `encode_positions`."""
+    return np.cumsum(np.frombuffer(zlib.decompress(blob), dtype=np.int64))
+
+
+class RunStore:
+    """a local SQLite store of pipeline run history.
+
+    Each `save` writes one run in a single transaction: the run itself, one row per check
+    result, one row per data source, and the failing row positions of each check. Check and
+    source rows carry the run's timestamp, so trend queries on `Fn.key` or `DataSource.key`
+    are answered from an index without joining back to `runs`.
+    """
+
+    def __init__(self, path: str | os.PathLike = ":memory:"):
+        """
+        :param path: the SQLite database file. Defaults to an in-memory database.
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")  # durable with WAL, without an fsync per run
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def save(
+            self,
+            summary: pd.DataFrame,
+            pipeline: str | None = None,
+            created_at: datetime | None = None,
+    ) -> UUID:
+        """stores the output of `Pipeline.run_summary`.
+
+        :param summary: the run summary. Must hold a single run.
+        :param pipeline: an optional name for the pipeline that ran.
+        :param created_at: when the run happened. Defaults to now.
+        :return: the run UUID.
+        """
+        run_ids = summary["run_id"].unique()
+        if len(run_ids) != 1:
+            raise ValueError(f"summary must hold exactly one run, got {len(run_ids)}.")
+        run_id = str(run_ids[0])
+        ts = created_at.timestamp() if created_at else time.time()
+
+        keys = summary["data_key"].astype(str)
+        fns = summary["fn_key"].astype(str)
+        check_rows = list(zip(
+            [run_id] * len(summary),
+            keys,
+            fns,
+            summary["data_source"],
+            summary["check"],
+            _nullable(summary["columns"]),
+            summary["rows"].astype(int).tolist(),
+            summary["failed"].astype(int).tolist(),
+            _nullable(summary["failure_rate"]),
+            summary["status"],
+            _nullable(summary["message"]),
+            [ts] * len(summary),
+        ))
+
+        failing = [
+            (run_id, k, f, name, c if isinstance(c, str) else None, len(p), encode_positions(p))
+            for k, f, name, c, p in zip(keys, fns, summary["check"], summary["columns"], summary["failed_rows"])
+            if len(p)
+        ]
+
+        # a summary only has checks x sources rows, a dict is far cheaper than a groupby here
+        per_source: dict[str, list] = {}
+        for k, name, status, failed in zip(keys, summary["data_source"], summary["status"], summary["failed"]):
+            totals = per_source.setdefault(k, [name, 0, 0, 0])
+            totals[1] += 1
+            totals[2] += status == "fail"
+            totals[3] += int(failed)
+        source_rows = [(run_id, k, *totals, ts) for k, totals in per_source.items()]
+
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    pipeline,
+                    ts,
+                    len(summary),
+                    int(summary["status"].eq("fail").sum()),
+                    int(summary["status"].eq("error").sum()),
+                ),
+            )
+            self._conn.executemany("INSERT INTO check_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", check_rows)
+            self._conn.executemany("INSERT INTO source_results VALUES (?, ?, ?, ?, ?, ?, ?)", source_rows)
+            self._conn.executemany(
+                "INSERT INTO failing_rows (run_id, data_key, fn_key, check_name, columns, n, positions) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                failing,
+            )
+        return UUID(run_id)
+
+    def _migrate(self) -> None:
+        """adds the columns newer versions write to a database created by an older one."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(failing_rows)")}
+        if "check_name" not in columns:
+            with self._conn:
+                self._conn.execute("ALTER TABLE failing_rows ADD COLUMN check_name TEXT")
+
+    def runs(self) -> pd.DataFrame:
+        """returns every stored run, newest first."""
+        return self._query("SELECT * FROM runs ORDER BY created_at DESC")
+
+    def check_results(self, run_id: UUID) -> pd.DataFrame:
+        """returns the check rows of a single run."""
+        return self._query("SELECT * FROM check_results WHERE run_id = ?", (str(run_id),))
+
+    def failure_trend(
+            self,
+            fn_key: UUID,
+            days: int = 90,
+            data_key: UUID | None = None,
+            check: str | None = None,
+    ) -> pd.DataFrame:
+        """returns the failure rate of one check, per run, over the last `days` days.
+
+        The outputs of a multi-output check share its `Fn.key`, and each gets its own rows.
+
+        :param fn_key: the `Fn.key` of the check.
+        :param days: how far back to look.
+        :param data_key: only count this `DataSource.key`. Defaults to every source.
+        :param check: only count this output, by the summary's `check` value, like `"price_sanity.positive"`.
+        Defaults to every output of the check.
+        :return: pd.DataFrame with `run_id`, `created_at`, `check`, `rows`, `failed` and `failure_rate`, oldest first.
+        """
+        since = time.time() - days * 86_400
+        sql = (
+            "SELECT run_id, created_at, check_name AS \"check\", SUM(rows) AS rows, SUM(failed) AS failed "
+            "FROM check_results WHERE fn_key = ? AND created_at >= ?"
+        )
+        params: tuple = (str(fn_key), since)
+        if data_key is not None:
+            sql += " AND data_key = ?"
+            params += (str(data_key),)
+        if check is not None:
+            sql += " AND check_name = ?"
+            params += (check,)
+        sql += " GROUP BY run_id, created_at, check_name ORDER BY created_at, MIN(rowid)"
+
+        trend = self._query(sql, params)
+        trend["created_at"] = pd.to_datetime(trend["created_at"], unit="s")
+        trend["failure_rate"] = trend["failed"] / trend["rows"].where(trend["rows"] > 0)
+        return trend
+
+    def failing_rows(
+            self,
+            run_id: UUID,
+            data_key: UUID,
+            fn_key: UUID,
+            columns: str | None = None,
+            check: str | None = None,
+    ) -> np.ndarray:
+        """returns the failing row positions of one check on one source, for a single run.
+
+        :param columns: only return the rows of this column group (the summary's `columns` value).
+        Defaults to every group of the check.
+        :param check: only return the rows of this output of a multi-output check (the summary's `check`
+        value). Required when the check has more than one output, since their rows can't be told apart.
+        """
+        sql = "SELECT check_name, positions FROM failing_rows WHERE run_id = ? AND fn_key = ? AND data_key = ?"
+        params: tuple = (str(run_id), str(fn_key), str(data_key))
+        if columns is not None:
+            sql += " AND columns = ?"
+            params += (columns,)
+        if check is not None:
+            sql += " AND check_name = ?"
+            params += (check,)
+        rows = self._conn.execute(sql, params).fetchall()
+        if not rows:
+            return np.empty(0, dtype=np.int64)
+        outputs = {name for name, _ in rows}
+        if len(outputs) > 1:
+            raise ValueError(f"check {fn_key} has several outputs {sorted(outputs)}, pick one with `check`.")
+        return np.concatenate([decode_positions(blob) for _, blob in rows])
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "RunStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        cursor = self._conn.execute(sql, params)
+        columns = [d[0] for d in cursor.description]
+        return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+
+def _nullable(values: pd.Series) -> list:
+    """a list of python values where missing values are None, as sqlite3 expects."""
+    return [None if pd.isna(v) else v for v in values]
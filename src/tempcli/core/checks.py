@@ -0,0 +1,422 @@
+"""ready-made, vectorized checks for the common patterns: not null, range, allowed set, reference set,
+regex, ordering, tolerance, check expressions, and column statistics.
+
+Each factory returns an `Fn` whose parameters are the alias map parameters it is given, so it binds
+to the columns like any hand written check::
+
+    class Prices(Pipeline):
+        alias_map = {"price": "price", "start": "start date", "end": "end date"}
+
+        price_present = checks.not_null("price")
+        price_positive = checks.in_range("price", low=0, inclusive="neither")
+        dates_ordered = checks.ordered("start", "end")
+
+A check given no `name` takes the name of the Pipeline field it is assigned to, like `price_positive`
+above, so two checks of the same column don't collide. On its own, it is named after its columns.
+
+The checks run once per column on whole pd.Series, never once per row, and are `row_local`, so
+they can be partitioned, chunked and budgeted. Missing values fail every check, except `is_null`,
+which is for columns that must stay empty.
+
+The column statistics checks read the column profile of the DataSource (see `DataSource.profile`),
+computed once and shared, instead of scanning the column again. Most give one verdict for the whole column.
+"""
+import inspect
+import re
+from collections.abc import Callable, Collection
+
+import numpy as np
+import pandas as pd
+
+from tempcli.core.components.func import Fn
+from tempcli.core.components.reference import Reference
+from tempcli.core.support.expression import CompiledExpression
+from tempcli.core.support.profile import ColumnProfile, Profile
+
+INCLUSIVE = ("both", "neither", "left", "right")
+
+
+class ColumnCheck:
+    """a vectorized check over named columns, usable as the callable of an `Fn`.
+
+    The parameters are the alias map parameters the check binds to, all taken as pd.Series. The
+    `kernel` gets the columns in parameter order along with the `options`. Kept as a class of
+    module level parts, rather than a closure, so the checks can be pickled into worker processes.
+    A `profiled` check also takes the `Profile`, and its kernel gets the ColumnProfile of each
+    column after the columns.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            params: Collection[str],
+            kernel: Callable[..., pd.Series],
+            profiled: bool = False,
+            named: bool = True,
+            **options,
+    ):
+        """
+        :param name: the name of the check, which is also its `Fn.name`.
+        :param params: the alias map parameters the check takes, in order.
+        :param kernel: the module level function computing the verdicts from the columns.
+        :param profiled: whether the kernel also gets the ColumnProfiles of the columns.
+        :param named: whether the name was given, rather than made up from the columns. A Pipeline
+            names a check that wasn't named after the field it is assigned to.
+        :param options: passed on to the kernel as keywords.
+        """
+        for p in params:
+            if not p.isidentifier():
+                raise ValueError(f"`{p}` can't be a parameter name. Use the alias map parameter, not the column.")
+        self.__name__ = name
+        self.params = tuple(params)
+        self.kernel = kernel
+        self.profiled = profiled
+        self.named = named
+        self.options = options
+
+    @property
+    def __signature__(self) -> inspect.Signature:
+        parameters = [
+            inspect.Parameter(p, inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=pd.Series)
+            for p in self.params
+        ]
+        if self.profiled:
+            parameters.append(inspect.Parameter("profile", inspect.Parameter.KEYWORD_ONLY, annotation=Profile))
+        return inspect.Signature(parameters, return_annotation=pd.Series)
+
+    def __call__(self, *args, **kwargs) -> pd.Series:
+        bound = self.__signature__.bind(*args, **kwargs)
+        if self.profiled:
+            profile = bound.kwargs["profile"]
+            return self.kernel(*bound.args, *(profile[p] for p in self.params), **self.options)
+        return self.kernel(*bound.args, **self.options)
+
+    def renamed(self, name: str) -> "ColumnCheck":
+        """returns the same check under `name`."""
+        return type(self)(name, self.params, self.kernel, profiled=self.profiled, **self.options)
+
+    def __repr__(self) -> str:
+        options = "".join(f", {k}={v!r}" for k, v in self.options.items())
+        return f"{type(self).__name__}({self.__name__!r}, {self.params}{options})"
+
+
+def _fn(
+        name: str | None,
+        default_name: str,
+        params: Collection[str],
+        kernel: Callable[..., pd.Series],
+        options: dict,
+        fn_options: dict,
+        profiled: bool = False,
+) -> Fn:
+    fn_options.setdefault("row_local", True)
+    check = ColumnCheck(name or default_name, params, kernel, profiled=profiled, named=name is not None, **options)
+    return Fn(check, **fn_options)
+
+
+def _whole_column(
+        name: str | None,
+        default_name: str,
+        column: str,
+        kernel: Callable[..., bool],
+        options: dict,
+        fn_options: dict,
+) -> Fn:
+    """a profiled check with one verdict for the whole column, which can't be split into rows."""
+    if fn_options.get("row_local"):
+        raise ValueError(f"`{name or default_name}` gives one verdict for the whole column, so it can't be row_local")
+    fn_options["row_local"] = False
+    return _fn(name, default_name, [column], kernel, options, fn_options, profiled=True)
+
+
+# === Kernels ===
+
+def _not_null(values: pd.Series) -> pd.Series:
+    return values.notna()
+
+
+def _is_null(values: pd.Series) -> pd.Series:
+    return values.isna()
+
+
+def _in_range(values: pd.Series, low, high, inclusive: str) -> pd.Series:
+    passed = values.notna()
+    if low is not None:
+        passed &= values >= low if inclusive in ("both", "left") else values > low
+    if high is not None:
+        passed &= values <= high if inclusive in ("both", "right") else values < high
+    return passed
+
+
+def _in_set(values: pd.Series, allowed: frozenset) -> pd.Series:
+    return values.isin(allowed)
+
+
+def _in_reference(values: pd.Series, reference: Reference) -> pd.Series:
+    return reference.contains(values)
+
+
+def _near_reference(values: pd.Series, reference: Reference, tolerance) -> pd.Series:
+    return reference.within(values, tolerance)
+
+
+def _matches(values: pd.Series, pattern: re.Pattern) -> pd.Series:
+    # through the nullable string dtype, so non-strings are matched on their text and NA fails
+    matched = values.astype("string").str.fullmatch(pattern)
+    return matched.fillna(False).astype(bool)
+
+
+def _ordered(start: pd.Series, end: pd.Series, strict: bool) -> pd.Series:
+    passed = start < end if strict else start <= end
+    return passed & start.notna() & end.notna()
+
+
+def _within_tolerance(actual: pd.Series, expected: pd.Series, abs_tol: float, rel_tol: float) -> pd.Series:
+    a = actual.to_numpy(dtype=float, na_value=np.nan)
+    e = expected.to_numpy(dtype=float, na_value=np.nan)
+    with np.errstate(invalid="ignore"):
+        passed = np.abs(a - e) <= np.maximum(abs_tol, rel_tol * np.abs(e))
+    return pd.Series(passed, index=actual.index)
+
+
+def _expression(*columns: pd.Series, expression: CompiledExpression) -> pd.Series:
+    return expression.evaluate(*columns)
+
+
+def _null_rate(values: pd.Series, stats: ColumnProfile, max_rate: float) -> bool:
+    return stats.null_rate <= max_rate
+
+
+def _distinct(values: pd.Series, stats: ColumnProfile, low: int | None, high: int | None) -> bool:
+    return (low is None or stats.distinct >= low) and (high is None or stats.distinct <= high)
+
+
+def _bounds(values: pd.Series, stats: ColumnProfile, low, high) -> bool:
+    if stats.min is None:  # every value is missing, or they can't be ordered
+        return False
+    return (low is None or stats.min >= low) and (high is None or stats.max <= high)
+
+
+def _zscore(values: pd.Series, stats: ColumnProfile, max_z: float) -> pd.Series:
+    v = values.to_numpy(dtype=float, na_value=np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        distance = np.abs(v - stats.mean)
+        passed = (distance <= max_z * stats.std) | (distance == 0)
+    return pd.Series(passed, index=values.index)
+
+
+# === Factories ===
+
+def not_null(column: str, name: str | None = None, **fn_options) -> Fn:
+    """fails the rows where `column` is missing (None, NaN or NaT).
+
+    :param column: the alias map parameter of the column.
+    :param name: the name of the check. Defaults to `<column>_not_null`.
+    :param fn_options: passed on to `Fn`, e.g. `budget` or `depends_on`.
+    """
+    return _fn(name, f"{column}_not_null", [column], _not_null, {}, fn_options)
+
+
+def is_null(column: str, name: str | None = None, **fn_options) -> Fn:
+    """fails the rows where `column` has a value, for columns that must stay empty.
+
+    :param column: the alias map parameter of the column.
+    :param name: the name of the check. Defaults to `<column>_is_null`.
+    :param fn_options: passed on to `Fn`.
+    """
+    return _fn(name, f"{column}_is_null", [column], _is_null, {}, fn_options)
+
+
+def in_range(
+        column: str,
+        low=None,
+        high=None,
+        inclusive: str = "both",
+        name: str | None = None,
+        **fn_options,
+) -> Fn:
+    """fails the rows where `column` is outside [low, high], or missing.
+
+    :param column: the alias map parameter of the column.
+    :param low: the lowest value allowed. Defaults to no lower bound.
+    :param high: the highest value allowed. Defaults to no upper bound.
+    :param inclusive: which bounds are allowed values, one of `both`, `neither`, `left` or `right`.
+    :param name: the name of the check. Defaults to `<column>_in_range`.
+    :param fn_options: passed on to `Fn`.
+    """
+    if low is None and high is None:
+        raise ValueError("in_range needs a `low` or a `high` bound.")
+    if inclusive not in INCLUSIVE:
+        raise ValueError(f"inclusive must be one of {INCLUSIVE}, got {inclusive!r}")
+    options = {"low": low, "high": high, "inclusive": inclusive}
+    return _fn(name, f"{column}_in_range", [column], _in_range, options, fn_options)
+
+
+def in_set(column: str, allowed: Collection, name: str | None = None, **fn_options) -> Fn:
+    """fails the rows where `column` isn't one of the `allowed` values.
+
+    :param column: the alias map parameter of the column.
+    :param allowed: the allowed values. Missing values only pass if None or NaN is among them.
+    :param name: the name of the check. Defaults to `<column>_in_set`.
+    :param fn_options: passed on to `Fn`.
+    """
+    return _fn(name, f"{column}_in_set", [column], _in_set, {"allowed": frozenset(allowed)}, fn_options)
+
+
+def in_reference(column: str, reference: Reference, name: str | None = None, **fn_options) -> Fn:
+    """fails the rows where `column` isn't in the `reference` set.
+
+    Unlike `in_set`, the lookup index is built once per Reference and shared by every check
+    using it, so it suits large sets, e.g. millions of valid ids.
+
+    :param column: the alias map parameter of the column.
+    :param reference: the reference set. Missing values only pass if it holds a missing value.
+    :param name: the name of the check. Defaults to `<column>_in_<reference name>`.
+    :param fn_options: passed on to `Fn`.
+    """
+    return _fn(name, f"{column}_in_{reference.name}", [column], _in_reference, {"reference": reference}, fn_options)
+
+
+def near_reference(column: str, reference: Reference, tolerance, name: str | None = None, **fn_options) -> Fn:
+    """fails the rows where no value of the `reference` set is within `tolerance` of `column`, or it is missing.
+
+    :param column: the alias map parameter of the column, of numbers or dates.
+    :param reference: the reference set, of the same kind of values.
+    :param tolerance: the largest distance to a reference value, e.g. 0.01 or pd.Timedelta("1D").
+    :param name: the name of the check. Defaults to `<column>_near_<reference name>`.
+    :param fn_options: passed on to `Fn`.
+    """
+    options = {"reference": reference, "tolerance": tolerance}
+    return _fn(name, f"{column}_near_{reference.name}", [column], _near_reference, options, fn_options)
+
+
+def matches(column: str, pattern: str | re.Pattern, name: str | None = None, **fn_options) -> Fn:
+    """fails the rows where `column` doesn't match `pattern` from start to end, or is missing.
+
+    :param column: the alias map parameter of the column.
+    :param pattern: the regular expression, compiled once here.
+    :param name: the name of the check. Defaults to `<column>_matches`.
+    :param fn_options: passed on to `Fn`.
+    """
+    options = {"pattern": re.compile(pattern)}
+    return _fn(name, f"{column}_matches", [column], _matches, options, fn_options)
+
+
+def ordered(start: str, end: str, strict: bool = True, name: str | None = None, **fn_options) -> Fn:
+    """fails the rows where `start` isn't before `end`, or either is missing.
+
+    Works on anything that compares, e.g. dates, timestamps, numbers or ISO date strings.
+
+    :param start: the alias map parameter of the column that comes first.
+    :param end: the alias map parameter of the column that comes after.
+    :param strict: whether equal values fail. Defaults to True.
+    :param name: the name of the check. Defaults to `<start>_before_<end>`.
+    :param fn_options: passed on to `Fn`.
+    """
+    return _fn(name, f"{start}_before_{end}", [start, end], _ordered, {"strict": strict}, fn_options)
+
+
+def within_tolerance(
+        actual: str,
+        expected: str,
+        abs_tol: float = 0.0,
+        rel_tol: float = 0.0,
+        name: str | None = None,
+        **fn_options,
+) -> Fn:
+    """fails the rows where `actual` is further from `expected` than the tolerance, or either is missing.
+
+    A row passes when |actual - expected| <= max(abs_tol, rel_tol * |expected|).
+
+    :param actual: the alias map parameter of the measured column.
+    :param expected: the alias map parameter of the reference column.
+    :param abs_tol: the absolute tolerance.
+    :param rel_tol: the tolerance relative to `expected`.
+    :param name: the name of the check. Defaults to `<actual>_near_<expected>`.
+    :param fn_options: passed on to `Fn`.
+    """
+    if abs_tol < 0 or rel_tol < 0:
+        raise ValueError(f"tolerances can't be negative, got abs_tol={abs_tol}, rel_tol={rel_tol}")
+    options = {"abs_tol": abs_tol, "rel_tol": rel_tol}
+    return _fn(name, f"{actual}_near_{expected}", [actual, expected], _within_tolerance, options, fn_options)
+
+
+def expression(source: str, name: str | None = None, **fn_options) -> Fn:
+    """fails the rows where the expression `source` is False, e.g. `price <= cool_price * 1.5`.
+
+    The names in the expression are alias map parameters. It is parsed and compiled once, here,
+    and runs on whole columns, see `CompiledExpression` for what it can hold. On a `Pipeline`,
+    a plain string field is turned into one of these, named after the field.
+
+    :param source: the expression.
+    :param name: the name of the check. Defaults to the expression itself.
+    :param fn_options: passed on to `Fn`.
+    :raises SyntaxError: when the source isn't a single Python expression.
+    :raises ValueError: when it uses syntax an expression can't hold.
+    """
+    compiled = CompiledExpression(source)
+    return _fn(name, compiled.source, compiled.params, _expression, {"expression": compiled}, fn_options)
+
+
+def null_rate_at_most(column: str, max_rate: float, name: str | None = None, **fn_options) -> Fn:
+    """fails the whole column when more than `max_rate` of its values are missing.
+
+    :param column: the alias map parameter of the column.
+    :param max_rate: the largest share of missing values, from 0 to 1.
+    :param name: the name of the check. Defaults to `<column>_null_rate`.
+    :param fn_options: passed on to `Fn`.
+    """
+    if not 0 <= max_rate <= 1:
+        raise ValueError(f"max_rate must be between 0 and 1, got {max_rate}")
+    return _whole_column(name, f"{column}_null_rate", column, _null_rate, {"max_rate": max_rate}, fn_options)
+
+
+def distinct_between(
+        column: str,
+        low: int | None = None,
+        high: int | None = None,
+        name: str | None = None,
+        **fn_options,
+) -> Fn:
+    """fails the whole column when its number of distinct values, leaving out missing ones, is outside [low, high].
+
+    :param column: the alias map parameter of the column.
+    :param low: the fewest distinct values. None for no lower bound.
+    :param high: the most distinct values. None for no upper bound.
+    :param name: the name of the check. Defaults to `<column>_distinct`.
+    :param fn_options: passed on to `Fn`.
+    """
+    if low is None and high is None:
+        raise ValueError("distinct_between needs at least one of `low` and `high`")
+    return _whole_column(name, f"{column}_distinct", column, _distinct, {"low": low, "high": high}, fn_options)
+
+
+def bounded(column: str, low=None, high=None, name: str | None = None, **fn_options) -> Fn:
+    """fails the whole column when its smallest value is below `low` or its largest is above `high`.
+
+    Unlike `in_range`, gives one verdict from the column profile, rather than one per row.
+
+    :param column: the alias map parameter of the column, of numbers or dates.
+    :param low: the lower bound. None for no lower bound.
+    :param high: the upper bound. None for no upper bound.
+    :param name: the name of the check. Defaults to `<column>_bounded`.
+    :param fn_options: passed on to `Fn`.
+    """
+    if low is None and high is None:
+        raise ValueError("bounded needs at least one of `low` and `high`")
+    return _whole_column(name, f"{column}_bounded", column, _bounds, {"low": low, "high": high}, fn_options)
+
+
+def zscore_within(column: str, max_z: float = 3.0, name: str | None = None, **fn_options) -> Fn:
+    """fails the outliers: the rows further than `max_z` standard deviations from the column mean, or missing.
+
+    The mean and standard deviation come from the column profile, so only the comparison runs per row.
+
+    :param column: the alias map parameter of the column, of numbers.
+    :param max_z: the most standard deviations a value can be from the mean.
+    :param name: the name of the check. Defaults to `<column>_zscore`.
+    :param fn_options: passed on to `Fn`.
+    """
+    if max_z <= 0:
+        raise ValueError(f"max_z must be positive, got {max_z}")
+    return _fn(name, f"{column}_zscore", [column], _zscore, {"max_z": max_z}, fn_options, profiled=True)
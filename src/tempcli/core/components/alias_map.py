@@ -1,12 +1,25 @@
+import asyncio
+import inspect
+import threading
 from collections import Counter
-from collections.abc import Collection
+from collections.abc import Collection, Mapping
+from concurrent.futures import Executor as PoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
 from tempcli.core.components.data import DataSource
 from tempcli.core.components.func import Fn
+from tempcli.core.support.aio import run_coroutine
+from tempcli.core.support.group import GroupCache, Groups
 from tempcli.core.support.interfaces import FnResult
+from tempcli.core.support.join import WORKER_JOINS, JoinCache, take
+from tempcli.core.support.profile import ColumnProfile, Profile
+from tempcli.core.support.partition import concat_parts, group_length, row_chunks, row_partitions, slice_group
+from tempcli.core.support.summary import failed_mask
+from tempcli.core.support.window import Rolling, WindowCache
 from tempcli.core.types.alias import One, Many, Alias
 from tempcli.core.types.result import Result, Err, Ok
 
@@ -38,6 +51,12 @@ class _RelevantAlias:
             self,
             function: Fn,
             data_source: DataSource,
+            partitions: int = 1,
+            pool: PoolExecutor | None = None,
+            chunk_rows: int | None = None,
+            joined: dict[str, pd.Series] | None = None,
+            groups: Groups | None = None,
+            rolling: Rolling | None = None,
     ) -> Collection[FnResult]:
         """List of dictionary arguments, that represent arguments for BoundArguments.
 
@@ -45,70 +64,305 @@ class _RelevantAlias:
 
         :param function: the function being called and referenced.
         :param data_source: the DataSource to use.
+        :param partitions: the number of row partitions to split `row_local` functions into.
+        :param pool: the pool running the row partitions. Defaults to a thread pool.
+        :param chunk_rows: the most rows a `row_local` function sees at once. Defaults to every row.
+        :param joined: the `parameter: pd.Series` columns taken from other DataSources, see `Fn.joins`.
+        Lined up with the rows of `data_source`, and added to every group.
+        :param groups: the groups of the rows of `data_source`, for functions with a `group_by`.
+        :param rolling: the rolling statistics over `data_source`, for functions with a `window`.
         :return: Collection[FnResult]
         """
+        joined = joined or {}
+
         # === Normalize the Data for BoundArguments ===
         collection = self._normalized_collection()
         normalized_for_bound = [tuple(group) for group in zip(*collection)]
 
+        # `parameter: column` for each group, so every FnResult knows which columns it checked
+        joined_columns = {p: s.name for p, s in joined.items()}
+        columns = [{a.parameter: a.alias for a in g} | joined_columns for g in normalized_for_bound]
+
         # === Generate the BoundArgument format arguments ===
         args = []
         # Scalars
         if function.has_scalar_params:
             _column_alias_mapping = [{a.alias: a.parameter for a in g} for g in normalized_for_bound]
             for c in _column_alias_mapping:
-                df: pd.DataFrame = data_source.data[c.keys()].copy().rename(columns=c)
-                records = df.to_dict("records")
-                args.append(records)
+                # turned into row records only when called, so a chunked call never holds them all
+                df: pd.DataFrame = data_source.data[list(c.keys())].rename(columns=c)
+                args.append(df.assign(**joined))
 
         # pd.Series
         else:
-            df = data_source.data.copy()
-            args = [{a.parameter: df[a.alias] for a in g} for g in normalized_for_bound]
+            df = data_source.data
+            args = [{a.parameter: df[a.alias] for a in g} | joined for g in normalized_for_bound]
+            if function.profile_param is not None:
+                # after the columns, so the first argument of a group is always a column
+                profiles = data_source.profile([a.alias for g in normalized_for_bound for a in g])
+                for arg, g in zip(args, normalized_for_bound):
+                    arg[function.profile_param] = Profile({a.parameter: profiles[a.alias] for a in g})
 
         # === Run the Functions ===
-        return self._apply_bound(function, args)
+        return self._apply_bound(
+            function,
+            args,
+            columns=columns,
+            data_name=data_source.name,
+            partitions=partitions,
+            pool=pool,
+            chunk_rows=chunk_rows,
+            groups=groups,
+            rolling=rolling
+        )
 
     @classmethod
-    def _apply_bound(cls, function: Fn, args: list[dict]) -> Collection[FnResult]:
+    def _apply_bound(
+            cls,
+            function: Fn,
+            args: list,
+            columns: list[dict] | None = None,
+            data_name: str | None = None,
+            partitions: int = 1,
+            pool: PoolExecutor | None = None,
+            chunk_rows: int | None = None,
+            groups: Groups | None = None,
+            rolling: Rolling | None = None,
+    ) -> Collection[FnResult]:
         """applies the bound arguments to the function and returns the results.
 
         Handles both the Scalar type of functions (int, str, etc.) and pd.Series type functions.
         Can consider this function normalizing both, the One-One and One-Many types of relationships
         as it relates to AliasMaps.
 
+        When the function is `row_local` and `partitions` is more than 1, each group of arguments is
+        split into row partitions that run on `pool`, and the partial results are joined back in order.
+        A `row_local` function with a `budget` runs in chunks instead, and stops once it goes over it.
+        With `chunk_rows`, a `row_local` function runs on one chunk at a time, to bound its memory.
+        A function with a `grid` runs on the whole group at every grid point, see `_call_grid`.
+        A function with a `group_by` runs once per group of rows, see `_call_grouped`.
+        A function with a `window` gets its rolling statistics, and runs in chunks with `chunk_rows`, see
+        `_call_windowed`.
+        A function returning a DataFrame, or a dict, of verdict columns gives one FnResult per column,
+        named by its `output`, so one pass over the data gives several verdicts.
+
         :param function: the function being called and referenced.
         :param args: the list of arguments to pass to the function. We get this from _relevant_alias.sets().
+        :param columns: the `parameter: column` mapping for each group in `args`. Stored as the FnResult kwargs.
+        :param data_name: the name of the DataSource the arguments came from.
+        :param partitions: the number of row partitions for `row_local` functions.
+        :param pool: the pool running the row partitions. Defaults to a thread pool.
+        :param chunk_rows: the most rows a `row_local` function sees at once.
+        :param groups: the groups of the rows, for functions with a `group_by`.
+        :param rolling: the rolling statistics over the rows, for functions with a `window`.
         :return: Collection[FnResult]
 
         """
+        if columns is None:
+            columns = [None for _ in args]
+
         results = []
-        # Scalars
-        if function.has_scalar_params:
-            _args = []
-            _kwargs = {}
-            for arg in args:
-                temp = [function.signature.bind_partial(**r) for r in arg]
-                for t in temp:
-                    t.apply_defaults()
-                    temp_result: Result[FnResult, Exception] = function(*t.args, **t.kwargs)
-
-                    # since fn() returns a FnResult, we need this step in order to make
-                    # a pd.Series before wrapping the result into a FnResult
-                    result: pd.Series = temp_result.unwrap().result
-                    results.append(result)
-            results = pd.Series(results)
-            results = [FnResult(result=results, args=tuple(args[0].values()), kwargs=args[-1], fn_used=function.name)]
+        for arg, mapping in zip(args, columns):
+            if function.grid is not None:
+                for point, result in zip(function.grid_points, cls._call_grid(function, arg)):
+                    if result is None:
+                        results.append(None)
+                        continue
+                    kwargs = (mapping or {}) | point
+                    results.extend(
+                        FnResult(result=r, fn_used=function.name, data_name=data_name, kwargs=kwargs, output=output)
+                        for output, r in _split_outputs(result)
+                    )
+                continue
 
-        # pd.Series
-        else:
-            for arg in args:
-                bound_args = function.signature.bind_partial(**arg)
-                bound_args.apply_defaults()
-                result: Result[FnResult, Exception] = function(*bound_args.args, **bound_args.kwargs)
-                results.append(result.unwrap_or(None))
+            stopped = False
+            if function.group_by is not None:
+                result = cls._call_grouped(function, arg, groups)
+            elif function.window is not None:
+                bound = {p: s for p, s in arg.items() if isinstance(s, pd.Series)}
+                result = cls._call_windowed(function, arg, rolling.bound(bound), chunk_rows)
+            elif function.row_local and function.budget is not None:
+                result, stopped = cls._call_budgeted(function, arg, partitions, pool, chunk_rows)
+            elif function.row_local and chunk_rows is not None:
+                result = cls._call_chunked(function, arg, chunk_rows)
+            elif function.row_local and partitions > 1:
+                result = cls._call_partitioned(function, arg, partitions, pool)
+            else:
+                result = _call_group(function, arg)
+
+            if result is None:
+                results.append(None)
+                continue
+            results.extend(
+                FnResult(
+                    result=r, fn_used=function.name, data_name=data_name, kwargs=mapping, stopped=stopped, output=output
+                )
+                for output, r in _split_outputs(result)
+            )
         return results
 
+    @classmethod
+    def _call_grid(cls, function: Fn, arg: pd.DataFrame | dict) -> list:
+        """runs one group of arguments at every point of the function's grid.
+
+        Each point is called on its own, with the columns as pd.Series. A function that `broadcast`s is
+        first called once with the columns as arrays and the grid values as column vectors, so NumPy
+        broadcasting evaluates every point in one pass over the columns. When that call fails, or
+        doesn't give one row of results per point, each point is called on its own.
+
+        :return: one raw result per `Fn.grid_points`, None where the call failed.
+        """
+        points = function.grid_points
+        if function.has_scalar_params:
+            return [_call_group(function, arg.assign(**point)) for point in points]
+
+        broadcast = _call_broadcast(function, arg, points) if function.broadcast else None
+        if broadcast is not None:
+            return broadcast
+        return [_call_group(function, arg | point) for point in points]
+
+    @classmethod
+    def _call_grouped(cls, function: Fn, arg: dict, groups: Groups):
+        """runs one group of arguments group by group, and puts the verdicts back in row order.
+
+        The columns are put in group order once, so each group is a slice of them rather than a copy.
+        The callable is called directly, without the call key `Fn.__call__` makes from the arguments,
+        which would cost more than a small group. A function taking the `Groups` is called once, on
+        the whole columns, instead.
+        """
+        if function.group_param is not None:
+            return _call_group(function, arg | {function.group_param: groups})
+
+        index = next(iter(arg.values())).index if arg else pd.RangeIndex(len(groups.codes))
+        outputs = None
+        in_order = {
+            p: (groups.sort(s.to_numpy()), s.index[groups.order], s.name)
+            for p, s in arg.items() if isinstance(s, pd.Series)
+        }
+        others = {p: v for p, v in arg.items() if p not in in_order}  # e.g. the Profile
+        parts = []
+        for start, stop in groups.slices():
+            group = {
+                p: pd.Series(v[start:stop], index=i[start:stop], name=n, copy=False)
+                for p, (v, i, n) in in_order.items()
+            } | others
+            try:
+                part = function.callable(**group)
+                if inspect.isawaitable(part):
+                    part = run_coroutine(part)
+            except Exception:
+                if function.raise_on_error:
+                    raise
+                return None
+            part = _as_outputs(part)
+            if isinstance(part, pd.DataFrame):
+                outputs = part.columns
+            part = np.asarray(part)
+            if part.ndim == 0 or outputs is not None and len(part) == 1:  # one verdict (per output) for the group
+                part = np.broadcast_to(part, (stop - start,) + part.shape[1:])
+            elif len(part) != stop - start:
+                error = ValueError(f"`{function.name}` gave {len(part)} results for a group of {stop - start} rows")
+                if function.raise_on_error:
+                    raise error
+                return None
+            parts.append(part)
+        verdicts = np.concatenate(parts) if parts else np.zeros(0, dtype=bool)
+        return _in_rows(groups.unsort(verdicts), index, outputs)
+
+    @classmethod
+    def _call_windowed(cls, function: Fn, arg: dict, rolling: Rolling, chunk_rows: int | None = None):
+        """runs one group of arguments with the rolling statistics of the function's window.
+
+        With `chunk_rows`, the rows run one chunk at a time in date order. Each chunk carries the
+        rows of the window before it, so its statistics match the unchunked ones, and only the
+        verdicts of the chunk's own rows are kept.
+        """
+        n_rows = group_length(arg)
+        if chunk_rows is None or chunk_rows >= n_rows:
+            return _call_group(function, arg | {function.rolling_param: rolling})
+
+        order = rolling.order_all
+        parts, outputs = [], None
+        for start, stop in row_chunks(n_rows, chunk_rows):
+            first = rolling.lookback(start)
+            rows = order[first:stop]
+            chunk = {p: s.iloc[rows] if isinstance(s, pd.Series) else s for p, s in arg.items()}
+            part = _call_group(function, chunk | {function.rolling_param: rolling.take(rows)})
+            if part is None:
+                return None
+            if isinstance(part, pd.DataFrame):
+                outputs = part.columns
+            parts.append(np.asarray(part)[start - first:])
+        verdicts = np.concatenate(parts)
+        in_rows = np.empty(verdicts.shape, dtype=verdicts.dtype)
+        in_rows[order] = verdicts
+        return _in_rows(in_rows, next(iter(arg.values())).index, outputs)
+
+    @classmethod
+    def _call_partitioned(cls, function: Fn, arg: pd.DataFrame | dict, partitions: int, pool: PoolExecutor | None):
+        """runs one group of arguments as row partitions and concatenates the partial results in order."""
+        bounds = row_partitions(group_length(arg), partitions)
+        with ExitStack() as stack:
+            if pool is None:
+                pool = stack.enter_context(ThreadPoolExecutor(max_workers=len(bounds)))
+            futures = [pool.submit(_call_group, function, slice_group(arg, start, stop)) for start, stop in bounds]
+            parts = [f.result() for f in futures]
+
+        if any(p is None for p in parts):
+            return None
+        return concat_parts(parts, scalar=function.has_scalar_params)
+
+    @classmethod
+    def _call_chunked(cls, function: Fn, arg: pd.DataFrame | dict, chunk_rows: int):
+        """runs one group of arguments one chunk at a time and concatenates the partial results in order."""
+        parts = []
+        for start, stop in row_chunks(group_length(arg), chunk_rows):
+            part = _call_group(function, slice_group(arg, start, stop))
+            if part is None:
+                return None
+            parts.append(part)
+        return concat_parts(parts, scalar=function.has_scalar_params)
+
+    @classmethod
+    def _call_budgeted(
+            cls,
+            function: Fn,
+            arg: pd.DataFrame | dict,
+            partitions: int,
+            pool: PoolExecutor | None,
+            chunk_rows: int | None = None,
+    ) -> tuple:
+        """runs one group of arguments in chunks of `budget.chunk_rows` rows, until the budget runs out.
+
+        With more than 1 partition, the chunks run `partitions` at a time on `pool`, and the budget
+        is checked after each batch. A `chunk_rows` limit caps the chunks, and runs them one at a time.
+
+        :return: (result, stopped), where result only covers the rows that ran, and stopped is whether
+        rows were left unchecked.
+        """
+        budget = function.budget
+        bounds = row_chunks(group_length(arg), min(budget.chunk_rows, chunk_rows or budget.chunk_rows))
+        step = 1 if chunk_rows is not None else max(partitions, 1)
+        parts, failed, checked = [], 0, 0
+        with ExitStack() as stack:
+            if pool is None and partitions > 1:
+                pool = stack.enter_context(ThreadPoolExecutor(max_workers=partitions))
+            for i in range(0, len(bounds), step):
+                batch = [slice_group(arg, start, stop) for start, stop in bounds[i:i + step]]
+                if pool is None:
+                    batch_parts = [_call_group(function, a) for a in batch]
+                else:
+                    batch_parts = [f.result() for f in [pool.submit(_call_group, function, a) for a in batch]]
+                if any(p is None for p in batch_parts):
+                    return None, False
+
+                parts.extend(batch_parts)
+                failed += sum(int(failed_mask(function, p).sum()) for p in batch_parts)
+                checked = bounds[min(i + step, len(bounds)) - 1][1]
+                if budget.exceeded(failed, checked):
+                    break
+        return concat_parts(parts, scalar=function.has_scalar_params), checked < bounds[-1][1]
+
     def _normalized_collection(self) -> Collection[Collection[Alias]]:
         """Normalizes the AliasMap collection by extrapolating the `One`
         object to match the length of the max `Many` object. Converts
@@ -120,7 +374,7 @@ class _RelevantAlias:
         """
         # Get the max Many size so the list of One can match its length
         _prev_max: str = "One"
-        _max_size: int = 1
+        _max_size: int = 0
         for a in self.alias_collection:
             if isinstance(a, Many):
                 if not _max_size:
@@ -132,6 +386,7 @@ class _RelevantAlias:
                     msg2 = f"Check {a.parameter} and {_prev_max}"
                     raise IndexError(msg + msg2)
                 _max_size = max(_max_size, len(a.aliases))
+        _max_size = _max_size or 1  # only One aliases, so a single group
 
         # Extrapolate the Ones and Convert Many to list of One
         normalized = []
@@ -147,6 +402,105 @@ class _RelevantAlias:
         return normalized
 
 
+def _call_group(function: Fn, arg: pd.DataFrame | dict):
+    """calls the function on one group of bound arguments and returns the raw result.
+
+    For scalar functions, `arg` is a DataFrame with a column per parameter, and the function is called once per row,
+    with the per-row results gathered into a pd.Series. For pd.Series functions, `arg` is a
+    `parameter: pd.Series` dict and the function is called once. Returns None when the call failed
+    and the function doesn't raise on errors.
+    """
+    if function.is_async:
+        return run_coroutine(_acall_group(function, arg))
+
+    # Scalars
+    if function.has_scalar_params:
+        values = []
+        for r in arg.to_dict("records"):
+            temp_result: Result[FnResult, Exception] = function(**r)
+
+            # since fn() returns a FnResult, we need this step in order to make
+            # a pd.Series before wrapping the result into a FnResult
+            fn_result = temp_result.unwrap_or(None)
+            values.append(fn_result.result if fn_result is not None else None)
+        return pd.Series(values)
+
+    # pd.Series
+    result: Result[FnResult, Exception] = function(**arg)
+    fn_result = result.unwrap_or(None)
+    return _as_outputs(fn_result.result) if fn_result is not None else None
+
+
+def _as_outputs(result):
+    """returns a dict of verdict columns as a DataFrame, with a column per output, and any other result as is.
+    A dict of single verdicts gives a DataFrame of one row."""
+    if not isinstance(result, Mapping):
+        return result
+    if all(np.ndim(v) == 0 for v in result.values()):
+        return pd.DataFrame([result])
+    return pd.DataFrame(dict(result))
+
+
+def _split_outputs(result) -> list[tuple[str | None, object]]:
+    """returns (output, verdicts) per column of a multi-output result, or (None, result) for any other result."""
+    if isinstance(result, pd.DataFrame):
+        return [(str(c), result[c]) for c in result.columns]
+    return [(None, result)]
+
+
+def _in_rows(verdicts: np.ndarray, index: pd.Index, outputs: pd.Index | None):
+    """wraps verdicts in row order as a pd.Series, or a DataFrame with a column per output."""
+    if outputs is not None:
+        return pd.DataFrame(verdicts, index=index, columns=outputs)
+    return pd.Series(verdicts, index=index)
+
+
+def _call_broadcast(function: Fn, arg: dict, points: list[dict]) -> list[pd.Series] | None:
+    """calls a pd.Series function once for every grid point, with the grid values broadcast against the columns.
+
+    :return: a boolean-like pd.Series per point, or None when the function can't be broadcast.
+    """
+    if function.is_async or not arg:
+        return None
+    index = next(iter(arg.values())).index
+    columns = {p: c.to_numpy() if isinstance(c, pd.Series) else c for p, c in arg.items()}
+    grid = {p: np.array([point[p] for point in points]).reshape(-1, 1) for p in function.grid}
+    try:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = np.asarray(function.callable(**columns, **grid))
+    except Exception:  # doesn't work on arrays, e.g. calls pd.Series methods
+        return None
+    if out.shape != (len(points), len(index)) or out.dtype == object:
+        return None
+    return [pd.Series(row, index=index) for row in out]
+
+
+async def _acall_group(function: Fn, arg: pd.DataFrame | dict):
+    """the `async def` version of `_call_group`, run on a single event loop.
+
+    Scalar functions are awaited row by row from `function.max_concurrency` workers that pull
+    from the same row iterator, so the calls overlap while only that many coroutines ever exist.
+    """
+    # Scalars
+    if function.has_scalar_params:
+        values = [None] * len(arg)
+        rows = iter(enumerate(arg.to_dict("records")))
+
+        async def worker():
+            for i, r in rows:  # shared iterator, each row is taken by exactly one worker
+                temp_result: Result[FnResult, Exception] = await function.acall(**r)
+                fn_result = temp_result.unwrap_or(None)
+                values[i] = fn_result.result if fn_result is not None else None
+
+        await asyncio.gather(*(worker() for _ in range(min(function.max_concurrency, len(arg)))))
+        return pd.Series(values)
+
+    # pd.Series
+    result: Result[FnResult, Exception] = await function.acall(**arg)
+    fn_result = result.unwrap_or(None)
+    return _as_outputs(fn_result.result) if fn_result is not None else None
+
+
 @dataclass
 class AliasMap:
     """Represents an Alias Map, which is a user defined dictionary that maps
@@ -171,6 +525,18 @@ class AliasMap:
         if not self.config:
             raise ValueError("`config` must not be empty.")
 
+        # guards the dicts below, since `check_columns` can add to them while checks run on other threads
+        self._lock = threading.Lock()
+
+        self.joins = JoinCache()
+        """the join indexes of the `Fn.joins`, shared by every check bound through this map."""
+
+        self.groups = GroupCache()
+        """the groups of the `Fn.group_by` keys, shared by every check bound through this map."""
+
+        self.windows = WindowCache()
+        """the rolling statistics of the `Fn.window`s, shared by every check bound through this map."""
+
         # === Dicts and Counters === [2025.09.27]
         # (1) I want a counter to see if we run into multiple same column names
         # (2) We can probably include a counter for param count for duplicates
@@ -208,6 +574,21 @@ class AliasMap:
             else:
                 raise TypeError(f"Unsupported type: {type(col)}")
 
+    def __getstate__(self) -> dict:
+        # locks can't be pickled, each copy gets its own lock, groups and windows, and shares the join
+        # indexes of its process
+        state = self.__dict__.copy()
+        for name in ("_lock", "joins", "groups", "windows"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self.joins = WORKER_JOINS
+        self.groups = GroupCache()
+        self.windows = WindowCache()
+
     def check_params(
             self,
             params: Collection,
@@ -250,6 +631,30 @@ class AliasMap:
         else:
             return Ok(params)
 
+    def resolve_column(self, param: str, data: DataSource) -> str:
+        """returns the one column of `data` that `param` is bound to.
+
+        :raises KeyError: when the parameter isn't in the alias map, or none of its columns are in `data`.
+        :raises ValueError: when several of its columns are in `data`.
+        """
+        if param not in self.p:
+            raise KeyError(f"`{param}` isn't a parameter of the alias map.")
+        found = self.p[param].map(data.columns)
+        if found.is_err():
+            raise KeyError(f"`{param}` has no column in data {data.name}.")
+        alias = found.unwrap()
+        if not isinstance(alias, One):
+            raise ValueError(f"`{param}` matches several columns of data {data.name}: {list(alias.aliases)}.")
+        return alias.alias
+
+    def profile(self, data: DataSource) -> dict[str, ColumnProfile]:
+        """profiles the columns of `data` the alias map reaches, see `DataSource.profile`.
+
+        Called on a whole source before it is split or copied, so the parts keep its profiles.
+        """
+        found = self.check_columns(columns=data.columns, match_column=True).unwrap_or([])
+        return data.profile([c for c in data.columns if c in found])
+
     def check_columns(
             self,
             columns: Collection,
@@ -288,18 +693,19 @@ class AliasMap:
         if len(columns) == 0:
             return Err(set())
 
-        if match_column:
-            matching_columns = set(columns) & set(self.p_count.keys())  # parameter exact with column
-            for col in matching_columns:
-                if not self.p_count.get(col):
-                    one = One(col, col)
-                    self.config[col] = one
-                    self.p[col] = one
-                    self.c[col] = one
-                    self.p_count[col] += 1
-                    self.c_count[col] += 1
-
-        found = set(columns) & set(self.c.keys())  # match column to column
+        with self._lock:
+            if match_column:
+                matching_columns = set(columns) & set(self.p_count.keys())  # parameter exact with column
+                for col in matching_columns:
+                    if not self.p_count.get(col):
+                        one = One(col, col)
+                        self.config[col] = one
+                        self.p[col] = one
+                        self.c[col] = one
+                        self.p_count[col] += 1
+                        self.c_count[col] += 1
+
+            found = set(columns) & set(self.c.keys())  # match column to column
         if len(found) == 0:
             return Err(columns)
         return Ok(found)
@@ -308,7 +714,10 @@ class AliasMap:
             self,
             data: DataSource,
             fn: Fn,
-            raise_missing: bool = False
+            raise_missing: bool = False,
+            partitions: int = 1,
+            pool: PoolExecutor | None = None,
+            chunk_rows: int | None = None,
     ) -> Result[Collection[FnResult], str]:
         """Takes the DataSource and Function, and returns a Collection[FnResult] if `Ok`
         If `raise_missing` if False, `Err` will return an error message. Otherwise, the
@@ -322,11 +731,16 @@ class AliasMap:
         :param data: the DataSource being used for these functions and checks.
         :param fn: the function being used to check the reports.
         :param raise_missing: whether to raise an exception if a column is missing. Defaults to False.
+        :param partitions: the number of row partitions to split the bound columns into, for functions
+        flagged `row_local`. Other functions always run on the whole column. Defaults to 1.
+        :param pool: the pool running the row partitions. Defaults to a thread pool per call.
+        :param chunk_rows: the most rows a `row_local` function sees at once, to bound its memory.
+        Defaults to every row.
         :return: a collection of FnResults[pd.Series] or an Error
         """
         # === Handling the DataSource Errors ===
         column_result = self.check_columns(columns=data.columns, match_column=True)
-        if column_result.is_err:
+        if column_result.is_err():
             r = column_result.unwrap_err()
             msg = f"None of columns {r} matched, for fn `{fn.name}`. Add {fn.param_names} to `alias_map`."
             if raise_missing:
@@ -335,7 +749,7 @@ class AliasMap:
 
         # === Handling the Function Errors ===
         fn_result = self.check_params(params=fn.param_names, raise_missing=raise_missing)
-        if fn_result.is_err:
+        if fn_result.is_err():
             r = fn_result.unwrap_err()
             msg = f"Missing columns {r} for data {data.name}. Please add it as `alias_map`."
             if raise_missing:
@@ -343,16 +757,76 @@ class AliasMap:
             return Err(msg)
 
         # === Handling the Relevant Aliases ===
-        matched_params = [self.p[p] for p in fn_result.unwrap()]
+        # signature order, so the groups and their FnResult kwargs come out the same on every run
+        params = set(fn_result.unwrap())
+        matched_params = [self.p[p] for p in fn.signature.parameters if p in params]
         columns = column_result.unwrap()
         relevant_aliases = []
+        unmatched = []
         for p in matched_params:
             result = p.map(columns)
             if isinstance(result, Ok):
                 r = result.unwrap()
                 relevant_aliases.append(r)
+            elif fn.signature.parameters[p.parameter].default is inspect.Parameter.empty:
+                unmatched.append(p.parameter)
+
+        if unmatched:
+            msg = f"Parameters {unmatched} of fn `{fn.name}` have no matching column in data {data.name}."
+            if raise_missing:
+                raise KeyError(msg)
+            return Err(msg)
+
+        # === Handling the Joined Parameters ===
+        joined = {}
+        for param, join in (fn.joins or {}).items():
+            try:
+                key = self.resolve_column(join.on, data)
+                other_key = self.resolve_column(join.on, join.source)
+                column = self.resolve_column(join.column, join.source)
+            except (KeyError, ValueError) as e:
+                msg = f"Can't join `{param}` of fn `{fn.name}` to data {data.name}. {e.args[0]}"
+                if raise_missing:
+                    raise KeyError(msg) from e
+                return Err(msg)
+            positions = self.joins.positions(data, key, join.source, other_key)
+            values = take(join.source.data[column], positions, data.data.index)
+            joined[param] = values.rename(f"{join.source.name}.{column}")
+
+        # === Handling the Group Key ===
+        groups = None
+        if fn.group_by is not None:
+            try:
+                key = tuple(self.resolve_column(p, data) for p in fn.group_by)
+            except (KeyError, ValueError) as e:
+                msg = f"Can't group fn `{fn.name}` in data {data.name}. {e.args[0]}"
+                if raise_missing:
+                    raise KeyError(msg) from e
+                return Err(msg)
+            groups = self.groups.groups(data, key)
+
+        # === Handling the Window ===
+        rolling = None
+        if fn.window is not None:
+            try:
+                on = self.resolve_column(fn.window.on, data)
+            except (KeyError, ValueError) as e:
+                msg = f"Can't window fn `{fn.name}` in data {data.name}. {e.args[0]}"
+                if raise_missing:
+                    raise KeyError(msg) from e
+                return Err(msg)
+            rolling = self.windows.rolling(data, on, fn.window)
 
         # === Handling Normalization and Bound Args Creation ===
         normalized_alias = _RelevantAlias(relevant_aliases)
-        results = normalized_alias.sets(function=fn, data_source=data)
+        results = normalized_alias.sets(
+            function=fn,
+            data_source=data,
+            partitions=partitions,
+            pool=pool,
+            chunk_rows=chunk_rows,
+            joined=joined,
+            groups=groups,
+            rolling=rolling
+        )
         return Ok(results)
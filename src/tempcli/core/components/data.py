@@ -1,11 +1,17 @@
+import threading
+from collections.abc import Collection
 from dataclasses import dataclass, field
 from uuid import uuid5, UUID
 
 import pandas as pd
 
 from tempcli.config import TEMPCLI_NAMESPACE
+from tempcli.core.support.profile import TOP_VALUES, ColumnProfile, profile_columns
 from tempcli.core.types.result import Ok, Err, Result
 
+_PROFILE_LOCK = threading.Lock()
+"""guards the profiles of every DataSource, which checks on several threads can ask for at once."""
+
 
 @dataclass(frozen=True)
 class DataSource:
@@ -21,6 +27,8 @@ class DataSource:
     name: str
     value: pd.DataFrame = None
     _DATA_SOURCE_NAMESPACE: UUID = field(init=False)
+    _profiles: dict = field(init=False, default_factory=dict, repr=False, compare=False)
+    """the memoized `ColumnProfile`s, by (column, top)."""
 
     def __post_init__(self):
         # class UUID creation
@@ -72,3 +80,56 @@ class DataSource:
         if value.is_ok():
             return list(self.value.columns)
         raise ValueError(f"Can't get columns for an empty dataset {value.unwrap_err()}.")
+
+    def profile(self, columns: Collection[str] | None = None, top: int = TOP_VALUES) -> dict[str, ColumnProfile]:
+        """returns the profile of each column: null count, distinct count, min and max, mean and std, and
+        the most common values.
+
+        The columns not profiled yet are profiled together, see `profile_columns`, and every profile is
+        kept with the DataSource, so checks on column statistics don't scan the data again. Call
+        `clear_profile` after changing the data in place.
+
+        :param columns: the columns to profile. Defaults to every column.
+        :param top: the number of most common values to keep.
+        :return: `column: ColumnProfile`, in the order of `columns`.
+        """
+        columns = self.columns if columns is None else list(dict.fromkeys(columns))
+        missing = set(columns) - set(self.columns)
+        if missing:
+            raise KeyError(f"Columns {sorted(missing)} aren't in data {self.name}.")
+        with _PROFILE_LOCK:
+            todo = [c for c in columns if (c, top) not in self._profiles]
+        if todo:
+            built = profile_columns(self.data, todo, top=top)
+            with _PROFILE_LOCK:
+                for c, column_profile in built.items():
+                    self._profiles.setdefault((c, top), column_profile)
+        with _PROFILE_LOCK:
+            return {c: self._profiles[(c, top)] for c in columns}
+
+    def clear_profile(self) -> None:
+        """forgets the column profiles, e.g. after the data changed in place."""
+        with _PROFILE_LOCK:
+            self._profiles.clear()
+
+    def known_profiles(self) -> dict[tuple[str, int], ColumnProfile]:
+        """returns the profiles computed so far, by (column, top), for `keep_profiles` on another copy."""
+        with _PROFILE_LOCK:
+            return dict(self._profiles)
+
+    def keep_profiles(self, profiles: dict[tuple[str, int], ColumnProfile]) -> None:
+        """takes on profiles computed elsewhere, e.g. on the whole source this is a part or a copy of."""
+        with _PROFILE_LOCK:
+            self._profiles.update(profiles)
+
+    def take(self, rows) -> "DataSource":
+        """returns a DataSource of only `rows`, under the same name.
+
+        It keeps the profiles already computed on this source, so the checks on column statistics
+        still read the statistics of the whole columns.
+
+        :param rows: the row positions, or a slice of them.
+        """
+        part = DataSource(self.name, self.data.iloc[rows])
+        part.keep_profiles(self.known_profiles())
+        return part
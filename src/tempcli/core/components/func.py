@@ -1,5 +1,6 @@
 """handling functions and breaking down functions"""
 import inspect
+import itertools
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from functools import cached_property
@@ -9,17 +10,30 @@ import pandas as pd
 from typing_extensions import Generic
 
 from tempcli.config import TEMPCLI_NAMESPACE
+from tempcli.core.support.aio import run_coroutine
+from tempcli.core.support.budget import FailureBudget
+from tempcli.core.support.group import Groups
 from tempcli.core.support.interfaces import FnResult
+from tempcli.core.support.join import Join
+from tempcli.core.support.profile import Profile
+from tempcli.core.support.window import Rolling, Window
 from tempcli.core.types.func_component import P, R
 from tempcli.core.types.result import Result, Ok, Err
 
 
-@dataclass
+UPSTREAM_FAILURE_MODES = ("skip", "passing_rows")
+
+
+@dataclass(frozen=True)
 class Fn(Generic[P, R]):
     """handles breaking down a function, getting signatures, and params.
 
+    Fn is immutable and keeps no per-call state, so one Fn can be called from many
+    threads at once. Per-call details, like the `call_key`, come back on the FnResult.
+
     `callable`: Callable[P, R], a function that takes parameter P, and returns a result R.
-    The result of calling it is FnResult on Ok, Exception on Err.
+    The result of calling it is FnResult on Ok, Exception on Err. A function can return a DataFrame,
+    or a dict, of verdict columns, which the pipeline reports as one result per column, see `FnResult.output`.
 
     `false_as_error`: bool, whether results returning False are errors
     or results returning True are errors. Defaults to False as the errors (did not pass).
@@ -27,6 +41,29 @@ class Fn(Generic[P, R]):
     `raise_on_error`: bool, Optional flag to raise errors on __call__ if `True` or to
     return an `Err` object on `False`. Defaults to raising an Exception.
 
+    `row_local`: bool, whether the check can be split into row partitions. Defaults to False.
+
+    `max_concurrency`: int, the limit of concurrent calls for `async def` functions. Defaults to 64.
+
+    `budget`: FailureBudget, stops a `row_local` check once too many rows failed. Defaults to no budget.
+
+    `depends_on`: tuple, the checks (by name, or the functions themselves) that must run first.
+
+    `on_upstream_failure`: str, `skip` or `passing_rows`. What to do when a check it depends on fails.
+
+    `timeout`: float, the most seconds the check may run on one DataSource. Defaults to no limit.
+
+    `grid`: dict, keyword parameters of the check and the values to run it with, giving one result per grid point.
+
+    `joins`: dict, parameters of the check bound to a column of another DataSource, as `parameter: Join`.
+
+    `group_by`: str | tuple, the alias map parameters of the key the check runs group by group on.
+
+    `window`: Window, the rolling window over a date column whose statistics the check uses.
+
+    A function with a parameter annotated `Profile` gets the column profiles of its columns, see
+    `DataSource.profile`, computed once per DataSource and shared by every check.
+
     """
     callable: Callable[P, R]
     """a function that takes parameter P, and returns a result R."""
@@ -43,31 +80,169 @@ class Fn(Generic[P, R]):
     return an `Err` object on `False`. Defaults to raising an Exception.
     """
 
+    row_local: bool = False
+    """Optional flag for checks where each row's verdict only depends on that row.
+    Row-local checks can be split into row partitions and run in parallel, with
+    the partial results concatenated back in order. Defaults to running on the
+    whole column.
+    """
+
+    max_concurrency: int = 64
+    """Only used by `async def` functions. The most calls that can be in flight at
+    once when a scalar async function runs over the rows of a column.
+    """
+
+    budget: FailureBudget | None = None
+    """Optional failure budget. A `row_local` check with a budget runs in chunks and stops after the
+    chunk that went over it, so a badly broken feed isn't checked to the last row. Other checks
+    always run on the whole column.
+    """
+
+    depends_on: tuple = ()
+    """Optional checks that gate this one, given by name or as the functions themselves. The pipeline
+    runs them first, on the same DataSource, and looks at their results before running this check.
+    """
+
+    on_upstream_failure: str = "skip"
+    """What to do when a check in `depends_on` fails on a DataSource. `skip` reports this check as
+    skipped. `passing_rows` runs it only on the rows that passed every upstream check. Either way,
+    the check is skipped if an upstream check errored.
+    """
+
+    timeout: float | None = None
+    """Optional time budget in seconds, per DataSource. A check that runs over it is reported as
+    timed out: killed when it runs on its own process, abandoned when it runs on a thread.
+    """
+
+    grid: dict | None = None
+    """Optional `parameter: values` grid for keyword parameters that aren't columns, e.g.
+    `{"tolerance": [0.01, 0.05, 0.1]}`. The check runs at every combination of the values and gives
+    one FnResult per grid point, with the point in its kwargs. Grid checks run on whole columns.
+    """
+
+    broadcast: bool = False
+    """Whether a pd.Series check with a `grid` also works on NumPy arrays, so every grid point is
+    evaluated in one broadcasted call: the columns come in as 1-D arrays and each grid parameter as
+    a column vector of the point values. Off by default, since pd.Series methods like `mean` or `std`
+    skip missing values where their NumPy counterparts don't, and would silently give other verdicts.
+    """
+
+    joins: dict | None = None
+    """Optional `parameter: Join` for parameters taken from another DataSource, e.g. a reference
+    table, lined up with the rows of the checked DataSource on a key. The join indexes are built
+    once per (DataSource, key) and shared by every check, see `JoinCache`.
+    """
+
+    group_by: str | tuple | None = None
+    """Optional alias map parameter, or tuple of them, of a group key, e.g. `"account"`. The rows
+    are grouped once per (DataSource, key), shared by every check, and the check is called once per
+    group, with each column as a slice of the rows of that group. It gives one verdict per row of the
+    group, or a single verdict for the whole group. A check with a parameter annotated `Groups` is
+    called once instead, on the whole columns, with the `Groups` to work on every group at once.
+    Grouped checks take pd.Series parameters and run on whole columns.
+    """
+
+    window: Window | None = None
+    """Optional rolling window over a date column, e.g. `Window("date", "7D")`. The check takes a
+    parameter annotated `Rolling`, with the rolling statistics of its columns over the window. The
+    statistics are computed once per (DataSource, window) and shared by every check using them.
+    When memory is short, the check runs on chunks of rows in date order, each with the rows of
+    the window before it, so the statistics come out the same. Windowed checks take pd.Series parameters.
+    """
+
     _FN_NAMESPACE: UUID = field(init=False)
     """used for UUID key creation"""
 
-    # not sure if this is the best way to do this
-    call_key: UUID = field(default=None, init=False)
-    """returns the last run function (__call__) UUID,
-    taking arg and kwargs into account"""
-
     def __post_init__(self):
         # For UUID creation under this class
-        self._FN_NAMESPACE = uuid5(TEMPCLI_NAMESPACE, type(self).__name__)
+        object.__setattr__(self, '_FN_NAMESPACE', uuid5(TEMPCLI_NAMESPACE, type(self).__name__))
 
         # Type Handling
         if not isinstance(self.callable, Callable):
             raise TypeError(f"callable must be a Callable, got {type(self.callable)}")
 
-    @property
+        if self.max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {self.max_concurrency}")
+
+        if self.timeout is not None and self.timeout <= 0:
+            raise ValueError(f"timeout must be positive, got {self.timeout}")
+
+        if self.on_upstream_failure not in UPSTREAM_FAILURE_MODES:
+            msg = f"on_upstream_failure must be one of {UPSTREAM_FAILURE_MODES}, got {self.on_upstream_failure!r}"
+            raise ValueError(msg)
+
+        if self.grid is not None:
+            unknown = set(self.grid) - set(self.signature.parameters)
+            if unknown:
+                raise ValueError(f"grid parameters {sorted(unknown)} aren't parameters of `{self.name}`")
+            grid = {p: tuple(v) for p, v in self.grid.items()}
+            if not grid or not all(grid.values()):
+                raise ValueError(f"grid needs at least one value per parameter, got {self.grid}")
+            object.__setattr__(self, 'grid', grid)
+            if self.broadcast and self.has_scalar_params:
+                raise ValueError(f"broadcast checks take pd.Series parameters, `{self.name}` has {self.scalar_params}")
+        elif self.broadcast:
+            raise ValueError(f"`{self.name}` has no grid to broadcast")
+
+        if self.joins is not None:
+            unknown = set(self.joins) - set(self.signature.parameters)
+            if unknown:
+                raise ValueError(f"joined parameters {sorted(unknown)} aren't parameters of `{self.name}`")
+            if not all(isinstance(j, Join) for j in self.joins.values()):
+                raise TypeError(f"joins must map parameters to Join, got {self.joins}")
+            if set(self.joins) & set(self.grid or ()):
+                raise ValueError(f"parameters can't be both joined and on the grid, got {sorted(set(self.joins))}")
+
+        if isinstance(self.group_by, str):
+            object.__setattr__(self, 'group_by', (self.group_by,))
+        if self.group_by is not None:
+            if not self.group_by or not all(isinstance(p, str) for p in self.group_by):
+                raise TypeError(f"group_by must be alias map parameters, got {self.group_by}")
+            object.__setattr__(self, 'group_by', tuple(self.group_by))
+            if self.grid is not None:
+                raise ValueError(f"`{self.name}` can't both be grouped and have a grid")
+            if self.has_scalar_params:
+                raise ValueError(f"grouped checks take pd.Series parameters, `{self.name}` has {self.scalar_params}")
+        elif self.group_param is not None:
+            raise ValueError(f"`{self.name}` takes the `Groups` as `{self.group_param}`, but has no group_by")
+
+        if self.window is not None:
+            if not isinstance(self.window, Window):
+                raise TypeError(f"window must be a Window, got {type(self.window)}")
+            if self.rolling_param is None:
+                raise ValueError(f"`{self.name}` has a window, but no parameter annotated `Rolling`")
+            if self.grid is not None or self.group_by is not None:
+                raise ValueError(f"`{self.name}` can't both have a window and a grid or group_by")
+            if self.has_scalar_params:
+                raise ValueError(f"windowed checks take pd.Series parameters, `{self.name}` has {self.scalar_params}")
+        elif self.rolling_param is not None:
+            raise ValueError(f"`{self.name}` takes a `Rolling` as `{self.rolling_param}`, but has no window")
+
+        if self.profile_param is not None and self.has_scalar_params:
+            msg = f"checks taking a `Profile` take pd.Series parameters, `{self.name}` has {self.scalar_params}"
+            raise ValueError(msg)
+
+        # dependencies are kept as check names, whichever way they were given
+        depends_on = self.depends_on
+        if isinstance(depends_on, str) or isinstance(depends_on, Callable):
+            depends_on = (depends_on,)
+        names = tuple(d if isinstance(d, str) else getattr(d, "name", None) or d.__name__ for d in depends_on)
+        object.__setattr__(self, 'depends_on', names)
+
+    def __hash__(self) -> int:
+        # checks are looked up and de-duplicated by their key, not by the callable's identity
+        return hash(self.key)
+
+    @cached_property
     def signature(self) -> inspect.Signature:
         """returns the function's signature."""
         return inspect.signature(self.callable)
 
     @property
     def param_names(self) -> set[str]:
-        """returns the parameters of the function as a set of strings."""
-        return set(self.signature.parameters.keys())
+        """returns the parameters of the function bound to columns of the checked DataSource, as a set
+        of strings. Leaves out the `grid`, the `joins`, the `Groups`, the `Rolling` and the `Profile`."""
+        return set(self.signature.parameters.keys()) - self._unbound_params
 
     @property
     def name(self) -> str:
@@ -86,22 +261,56 @@ class Fn(Generic[P, R]):
             pd.DataFrame,
             pd.Series
         )
-        foo = [p for p, pt in self.signature.parameters.items() if pt not in accepted_non_scalars]
-        return set(foo)
+        foo = [p for p, pt in self.signature.parameters.items() if pt.annotation not in accepted_non_scalars]
+        return set(foo) - self._unbound_params
+
+    @property
+    def _unbound_params(self) -> set[str]:
+        """the parameters that aren't bound to columns of the checked DataSource."""
+        special = {self.group_param, self.rolling_param, self.profile_param} - {None}
+        return set(self.grid or ()) | set(self.joins or ()) | special
+
+    @cached_property
+    def group_param(self) -> str | None:
+        """returns the parameter annotated `Groups`, that gets the groups of a grouped check, or None."""
+        return next((p for p, pt in self.signature.parameters.items() if pt.annotation is Groups), None)
+
+    @cached_property
+    def rolling_param(self) -> str | None:
+        """returns the parameter annotated `Rolling`, that gets the statistics of a windowed check, or None."""
+        return next((p for p, pt in self.signature.parameters.items() if pt.annotation is Rolling), None)
+
+    @cached_property
+    def profile_param(self) -> str | None:
+        """returns the parameter annotated `Profile`, that gets the column profiles of the check, or None."""
+        return next((p for p, pt in self.signature.parameters.items() if pt.annotation is Profile), None)
 
     @cached_property
     def has_scalar_params(self) -> bool:
         """returns whether the function has a scalar parameter."""
         return len(self.scalar_params) > 0
 
-    def _create_call_key(self, args: tuple, kwargs: dict):
+    @cached_property
+    def grid_points(self) -> list[dict]:
+        """returns every combination of the `grid` values as `parameter: value` dicts. Empty without a grid."""
+        if self.grid is None:
+            return []
+        return [dict(zip(self.grid, values)) for values in itertools.product(*self.grid.values())]
+
+    @cached_property
+    def is_async(self) -> bool:
+        """returns whether the function is an `async def` function."""
+        return inspect.iscoroutinefunction(self.callable)
+
+    def _create_call_key(self, args: tuple, kwargs: dict) -> UUID:
         """used to generate a key for run level
-        (taking the arguments and keyword arguments into account)
+        (taking the arguments and keyword arguments into account).
+        Returned rather than stored, so concurrent calls don't overwrite each other.
         """
         args = "_".join(str(arg) for arg in args)
         kwargs = "_".join(str(v) for v in kwargs.values())
         k = args + kwargs
-        self.call_key = uuid5(self._FN_NAMESPACE, k)
+        return uuid5(self._FN_NAMESPACE, k)
 
     def __call__(
             self,
@@ -109,7 +318,12 @@ class Fn(Generic[P, R]):
             **kwargs: P.kwargs,
     ) -> Result[FnResult, Exception]:
         """calls the function. Returns as a Result[FnResult, Exception].
+
+        `async def` functions are run to completion on their own event loop. Use `acall`
+        to await them from a running loop instead.
         """
+        if self.is_async:
+            return run_coroutine(self.acall(*args, **kwargs))
 
         try:
             # Use BoundArguments to prep the function.
@@ -117,10 +331,48 @@ class Fn(Generic[P, R]):
             sig.apply_defaults()
 
             # generates an uuid. not 100% on if this is the best way
-            self._create_call_key(sig.args, sig.kwargs)
+            call_key = self._create_call_key(sig.args, sig.kwargs)
+
+            result = self.callable(*sig.args, **sig.kwargs)
+            fn_result = FnResult(
+                result=result,
+                fn_used=self.name,
+                args=sig.args,
+                kwargs=sig.kwargs,
+                call_key=call_key
+            )
+            return Ok(fn_result)
+        except Exception as e:
+            if self.raise_on_error:
+                raise e
+            else:
+                return Err(e)
+
+    async def acall(
+            self,
+            *args: P.args,
+            **kwargs: P.kwargs,
+    ) -> Result[FnResult, Exception]:
+        """awaits the function. Returns as a Result[FnResult, Exception].
+
+        Works for regular functions too, in which case nothing is awaited.
+        """
+        try:
+            sig = self.signature.bind_partial(*args, **kwargs)
+            sig.apply_defaults()
+            call_key = self._create_call_key(sig.args, sig.kwargs)
 
             result = self.callable(*sig.args, **sig.kwargs)
-            fn_result = FnResult(result, sig.args, sig.kwargs, self.name)
+            if inspect.isawaitable(result):
+                result = await result
+
+            fn_result = FnResult(
+                result=result,
+                fn_used=self.name,
+                args=sig.args,
+                kwargs=sig.kwargs,
+                call_key=call_key
+            )
             return Ok(fn_result)
         except Exception as e:
             if self.raise_on_error:
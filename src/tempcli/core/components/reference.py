@@ -0,0 +1,129 @@
+"""handling reference sets, the allowed values that foreign-key style checks look columns up in"""
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Collection
+
+import numpy as np
+import pandas as pd
+
+from tempcli.core.components.data import DataSource
+
+_UNPICKLED: OrderedDict[uuid.UUID, dict] = OrderedDict()
+"""the indexes of the References unpickled in this process, by `Reference.token`, so a Reference
+sent to a worker process builds them once per worker rather than once per task. Only the most
+recently used `UNPICKLED_REFERENCES` are kept, so a long lived worker doesn't hold on to the
+References of past runs."""
+_UNPICKLED_LOCK = threading.Lock()
+
+UNPICKLED_REFERENCES = 16
+"""the most References whose indexes a worker process keeps between tasks."""
+
+
+class Reference:
+    """a reference set of values, e.g. the known categories or every valid instrument id.
+
+    The lookup structures are built from the values on first use, once, and shared by every check
+    that uses the Reference, across threads:
+
+        - a hash index, for membership (`contains`), one vectorized lookup per column.
+        - a sorted array, for range lookups (`within`), one binary search per column.
+
+    Declare it on a `Pipeline` next to the checks that use it, so it is listed under
+    `Pipeline.references`::
+
+        class Orders(Pipeline):
+            categories = Reference(DataSource("categories", categories_df), column="code")
+            known_category = checks.in_reference("category", categories)
+    """
+
+    def __init__(
+            self,
+            values: Collection | pd.Series | np.ndarray | DataSource,
+            column: str | None = None,
+            name: str = "reference",
+    ):
+        """
+        :param values: the reference values, or a DataSource holding them in `column`.
+        :param column: the column of the DataSource with the values.
+        :param name: the name of the reference, used in the default names of its checks.
+        """
+        if isinstance(values, DataSource):
+            if column is None:
+                raise ValueError(f"A Reference from a DataSource needs its `column`, in {values.name}.")
+            values = values.data[column]
+        if isinstance(values, (str, bytes)) or not isinstance(values, Collection):
+            raise TypeError(f"values must be a collection of values, got {type(values)}")
+        if isinstance(values, (set, frozenset)):
+            values = list(values)
+        self.values: pd.Series = values if isinstance(values, pd.Series) else pd.Series(values)
+        self.name = name
+        self.token = uuid.uuid4()
+        """identifies the Reference across processes."""
+        self._indexes = {"lock": threading.Lock()}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r}, {len(self)} values)"
+
+    def __getstate__(self) -> dict:
+        # the built indexes stay behind, the worker builds (and keeps) its own
+        return {"values": self.values, "name": self.name, "token": self.token}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        # the indexes go with this copy, and are shared with the other copies unpickled in this process
+        with _UNPICKLED_LOCK:
+            self._indexes = _UNPICKLED.setdefault(self.token, {"lock": threading.Lock()})
+            _UNPICKLED.move_to_end(self.token)
+            while len(_UNPICKLED) > UNPICKLED_REFERENCES:
+                _UNPICKLED.popitem(last=False)
+
+    def _get(self, what: str, build):
+        built = self._indexes
+        if what not in built:
+            with built["lock"]:
+                if what not in built:
+                    built[what] = build()
+        return built[what]
+
+    @property
+    def index(self) -> pd.Index:
+        """returns the hash index of the unique reference values, built on first use."""
+        return self._get("index", lambda: pd.Index(self.values.drop_duplicates().to_numpy()))
+
+    @property
+    def sorted(self) -> np.ndarray:
+        """returns the unique, non-missing reference values in order, built on first use."""
+        return self._get("sorted", lambda: np.unique(self.values.dropna().to_numpy()))
+
+    def build(self) -> "Reference":
+        """builds the lookup structures now, rather than in the first check that uses them."""
+        _ = self.index, self.sorted
+        return self
+
+    def contains(self, values: pd.Series) -> pd.Series:
+        """returns, for each value, whether it is in the reference set.
+
+        Missing values are only members when the reference holds a missing value too.
+        """
+        found = self.index.get_indexer(values.to_numpy()) >= 0
+        return pd.Series(found, index=values.index)
+
+    def within(self, values: pd.Series, tolerance: float = 0) -> pd.Series:
+        """returns, for each value, whether a reference value is within `tolerance` of it.
+
+        The values and the reference must be ordered, e.g. numbers or dates. Missing values fail.
+        """
+        ref = self.sorted
+        points = values.to_numpy()
+        if len(ref) == 0:
+            return pd.Series(np.zeros(len(points), dtype=bool), index=values.index)
+        # the reference value right after each point, and the one before it
+        after = np.clip(np.searchsorted(ref, points, side="left"), 0, len(ref) - 1)
+        before = np.clip(after - 1, 0, len(ref) - 1)
+        with np.errstate(invalid="ignore"):
+            close = (np.abs(ref[after] - points) <= tolerance) | (np.abs(points - ref[before]) <= tolerance)
+        return pd.Series(close & pd.notna(points), index=values.index)
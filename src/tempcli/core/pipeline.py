@@ -1,13 +1,36 @@
+import asyncio
 import inspect
-from collections.abc import Collection, Callable
+import time
+from collections.abc import AsyncIterator, Collection, Callable, Iterator
+from contextlib import nullcontext
+from dataclasses import asdict, replace
+from uuid import uuid4
 
+import numpy as np
 import pandas as pd
 
+from tempcli.core import checks
 from tempcli.core.components.alias_map import AliasMap
 from tempcli.core.components.data import DataSource
 from tempcli.core.components.func import Fn
+from tempcli.core.components.reference import Reference
+from tempcli.core.support.budget import FailureBudget
+from tempcli.core.support.dag import check_levels, order_checks, passing_mask
+from tempcli.core.support.executor import Executor, Task
 from tempcli.core.support.manager import PipeMixin
-from tempcli.core.types.result import Ok
+from tempcli.core.support.profile import PROFILE_COLUMNS, TOP_VALUES
+from tempcli.core.support.sample import ESTIMATE_COLUMNS, Sample, sample_positions, wilson_interval
+from tempcli.core.support.sink import ResultSink
+from tempcli.core.support.summary import (
+    BOUNDS_COLUMNS,
+    SUMMARY_COLUMNS,
+    Skipped,
+    cancelled_rows,
+    schedule_stats,
+    summarize
+)
+from tempcli.core.types.alias import One
+from tempcli.core.types.result import Err, Ok, Result
 
 
 class Pipeline(PipeMixin):
@@ -22,7 +45,13 @@ class Pipeline(PipeMixin):
         # === initialize map ===
         self.alias_map: AliasMap = self._initialize_aliases()
         self.data_sources: Collection[DataSource] = self._initialize_data_sources()
+        self.references: dict[str, Reference] = self._initialize_references()
+        """the reference sets declared on the pipeline, by field, see `checks.in_reference`."""
         self.functions: Collection[Fn] = self._initialize_functions()
+        self.results: dict = dict()
+        """the FnResults of the last `run_summary`, keyed by (DataSource.key, Fn.key)."""
+        self.estimate: pd.DataFrame | None = None
+        """the sample estimate of the last `run_summary(sample_first=...)`."""
 
     def _initialize_aliases(self) -> AliasMap:
         """goes down the inheritance chain and pulls the alias_map from each subclass.
@@ -52,6 +81,8 @@ class Pipeline(PipeMixin):
         _data_sources = list()
         acceptable_return_types = (pd.DataFrame, DataSource)
         for s_class in inspect.getmro(self.__class__)[:-1]:
+            if issubclass(Pipeline, s_class):  # skip the Pipeline's own methods
+                continue
             # (!) currently only looking for DataSources or DataFrames to turn into data sources
             for field, data in s_class.__dict__.items():
                 if isinstance(data, DataSource):
@@ -64,7 +95,7 @@ class Pipeline(PipeMixin):
                     continue
 
                 # Special case, but looks  for functions
-                elif inspect.isfunction(data):
+                elif self._is_data_factory(data):
                     return_type = inspect.signature(data).return_annotation
 
                     # Returns a DataFrame
@@ -80,39 +111,381 @@ class Pipeline(PipeMixin):
                         continue
         return _data_sources
 
+    def _initialize_references(self) -> dict[str, Reference]:
+        """goes down the inheritance chain and pulls the reference sets, a subclass overriding its bases."""
+        references = dict()
+        for s_class in reversed(inspect.getmro(self.__class__)):
+            if issubclass(Pipeline, s_class):
+                continue
+            for field, data in s_class.__dict__.items():
+                if isinstance(data, Reference):
+                    references[field] = data
+                elif field in references:
+                    del references[field]
+        return references
+
     def _initialize_functions(self):
         """gets all functions defined by the user in the subclass. The list of functions then get split into those
         that are factories for the reports we are checking, and the checks that are being used when the pipeline
         is running.
+
+        A string field is a check expression, like `"price <= cool_price * 1.5"` (see `checks.expression`).
+        A library check given no name, like `checks.in_range("price", low=0)`, is named after its field.
+
+        :raises ValueError: when two different checks have the same name.
         """
         # (1) Pulling all the functions under the class and subclass
-        all_functions = list()
-        for validation_class in inspect.getmro(self.__class__)[:-2]:
+        # base classes first, so checks run in the order they were defined. A subclass overriding a
+        # field keeps its place in the order, with the subclass's value.
+        fields: dict[str, Fn] = dict()
+        renamed: dict[int, tuple[Fn, Fn]] = dict()  # id of a library check -> (the check, named after its field)
+        for validation_class in reversed(inspect.getmro(self.__class__)):
+            if issubclass(Pipeline, validation_class):  # skip Pipeline, PipeMixin and object
+                continue
             for field, data in validation_class.__dict__.items():
-                if isinstance(data, Callable) or isinstance(data, Fn):
-                    # Given a Fn already for data
-                    if isinstance(data, Callable) and not isinstance(data, Fn):
-                        func = Fn(data)
-                        all_functions.append(func)
-                    elif isinstance(data, Fn):
-                        all_functions.append(data)
-        all_functions = list(set(all_functions))
-        return all_functions
-
-    def run_summary(self, raise_errors: bool = True) -> pd.DataFrame:
+                if field.startswith("_") or isinstance(data, type) or self._is_data_factory(data):
+                    continue
+                if isinstance(data, Fn) and isinstance(data.callable, checks.ColumnCheck) and not data.callable.named:
+                    if id(data) not in renamed:  # the same check under two fields keeps the first field's name
+                        renamed[id(data)] = (data, replace(data, callable=data.callable.renamed(field)))
+                    fields[field] = renamed[id(data)][1]
+                elif isinstance(data, Fn):
+                    fields[field] = data
+                elif isinstance(data, str):
+                    fields[field] = self._expression_check(field, data)
+                elif isinstance(data, Callable):
+                    fields[field] = Fn(data)
+                else:  # overridden with something that isn't a check
+                    fields.pop(field, None)
+
+        # (2) a check depending on a library check by its made up name follows it to its field
+        names = {fn.name for fn in fields.values()}
+        field_names: dict[str, set[str]] = dict()
+        for original, fn in renamed.values():
+            if fn.name in names:
+                field_names.setdefault(original.name, set()).add(fn.name)
+        for field, fn in fields.items():
+            if any(d not in names and d in field_names for d in fn.depends_on):
+                depends_on = tuple(self._field_dependency(fn, d, field_names, names) for d in fn.depends_on)
+                fields[field] = replace(fn, depends_on=depends_on)
+
+        # (3) the same check under two fields runs once, then dependencies go before their dependents
+        all_functions = list(dict.fromkeys(fields.values()))
+        return order_checks(all_functions)
+
+    @staticmethod
+    def _field_dependency(fn: Fn, dependency: str, field_names: dict[str, set[str]], names: set[str]) -> str:
+        """returns the name of the check `fn` depends on, for a library check renamed after its field."""
+        if dependency in names or dependency not in field_names:
+            return dependency
+        if len(field_names[dependency]) > 1:
+            msg = (f"`{fn.name}` depends on `{dependency}`, which is any of {sorted(field_names[dependency])}. "
+                   f"Depend on one of them by its field name.")
+            raise ValueError(msg)
+        return next(iter(field_names[dependency]))
+
+    def _expression_check(self, field: str, source: str) -> Fn:
+        """compiles a check expression field, and makes sure it only reads alias map parameters."""
+        fn = checks.expression(source, name=field)
+        unknown = [p for p in fn.signature.parameters if p not in self.alias_map.p]
+        if unknown:
+            raise ValueError(f"The check expression `{field} = {source!r}` reads {unknown}, which aren't in `alias_map`.")
+        return fn
+
+    @staticmethod
+    def _is_data_factory(data) -> bool:
+        """whether a class attribute is a function building a data source, rather than a check.
+
+        A factory takes no arguments, so a check returning a pd.DataFrame, like a multi-output check, isn't one.
+        """
+        if not inspect.isfunction(data):
+            return False
+        signature = inspect.signature(data)
+        if any(p.default is p.empty and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+               for p in signature.parameters.values()):
+            return False
+        return signature.return_annotation in (pd.DataFrame, DataSource)
+
+    def tasks(self) -> list[Task]:
+        """returns every (DataSource, Fn) pair of a run, in report order."""
+        return [Task(ds, f) for ds in self.data_sources for f in self.functions]
+
+    def iter_results(
+            self,
+            raise_errors: bool = True,
+            executor: Executor | None = None,
+            tasks: Collection[Task] | None = None,
+    ) -> Iterator[tuple[DataSource, Fn, Result]]:
+        """runs every check against every data source, yielding each result as soon as it is ready.
+
+        Nothing is kept once yielded, so consumers can process a run incrementally with bounded
+        memory. With a parallel executor the results come in the order they complete.
+
+        Checks with `depends_on` run as a DAG: the checks run in levels, where each level only needs
+        the levels before it, and every task of a level goes to the executor at once. Before a check
+        runs on a DataSource, its upstream results there are looked at. If one failed, the check is
+        skipped (its Result is an `Err(Skipped)`), or only runs on the rows that passed, depending on
+        `Fn.on_upstream_failure`.
+
+        :param raise_errors: whether to raise when a check can't be bound to a data source.
+        :param executor: the Executor running the checks. Defaults to running them one at a time.
+        :param tasks: the tasks to run. Defaults to `Pipeline.tasks()`.
+        :return: an iterator of (DataSource, Fn, Result), where Result is the `AliasMap.generate_results` result.
+        """
+        executor = executor or Executor()
+        tasks = self.tasks() if tasks is None else list(tasks)
+        levels = check_levels(list(dict.fromkeys(t.fn for t in tasks)))
+        upstream = {d for t in tasks for d in t.fn.depends_on}
+        passed: dict[tuple, np.ndarray | None] = {}  # pass masks of the checks something depends on
+        n_rows = {t.data.name: 0 if t.data.value is None else len(t.data.value) for t in tasks}
+
+        for level in sorted(set(levels.values())):
+            ready = []
+            for task in (t for t in tasks if levels[t.fn.key] == level):
+                gated = self._gate(task, passed)
+                if isinstance(gated, Err):
+                    passed[(task.data.name, task.fn.name)] = None
+                    yield task.data, task.fn, gated
+                    continue
+                ready.append(gated)
+
+            for task, curr_result in executor.map(self.alias_map, ready, raise_missing=raise_errors):
+                if isinstance(curr_result, Ok):
+                    r = curr_result.unwrap()  # PipeMixin.run wraps the generate_results Result
+                else:
+                    r = curr_result
+                if task.rows is not None:
+                    r = r.and_then(lambda frs, rows=task.rows: Ok([fr and replace(fr, rows=rows) for fr in frs]))
+                if task.fn.name in upstream:
+                    passed[(task.data.name, task.fn.name)] = passing_mask(task.fn, r, n_rows[task.data.name])
+                yield task.data, task.fn, r
+
+    def _gate(self, task: Task, passed: dict) -> Task | Err:
+        """returns the task to run given its upstream results: as is, cut down to the passing rows, or skipped."""
+        if not task.fn.depends_on:
+            return task
+        # upstream checks run on an earlier level, so one that isn't in `passed` isn't part of the run
+        deps = [d for d in task.fn.depends_on if (task.data.name, d) in passed]
+        masks = [passed[(task.data.name, d)] for d in deps]
+        if not masks:
+            return task
+        if any(m is None for m in masks):
+            return Err(Skipped(f"Skipped, a check upstream of `{task.fn.name}` errored or was skipped."))
+
+        ok = np.logical_and.reduce(masks)
+        if ok.all():
+            return task
+        if task.fn.on_upstream_failure == "skip" or not ok.any():
+            failed = [d for d, m in zip(deps, masks) if not m.all()]
+            return Err(Skipped(f"Skipped, upstream checks {failed} failed on {task.data.name}."))
+        rows = np.flatnonzero(ok)
+        if task.fn.profile_param is not None:  # the profile of the whole columns, not only the passing rows
+            self.alias_map.profile(task.data)
+        return Task(task.data.take(rows), task.fn, rows=rows)
+
+    async def aiter_results(
+            self,
+            raise_errors: bool = True,
+            executor: Executor | None = None,
+    ) -> AsyncIterator[tuple[DataSource, Fn, Result]]:
+        """the async iterator version of `iter_results`.
+
+        The checks run on a worker thread, so the event loop stays free while waiting on them.
+        """
+        results = self.iter_results(raise_errors=raise_errors, executor=executor)
+        done = object()
+        try:
+            while (item := await asyncio.to_thread(next, results, done)) is not done:
+                yield item
+        finally:
+            results.close()
+
+    def run_summary(
+            self,
+            raise_errors: bool = True,
+            executor: Executor | None = None,
+            sinks: Collection[ResultSink] = (),
+            aggregate_only: bool = False,
+            max_failed_rows: int = 100,
+            value_bounds: bool = False,
+            budget: FailureBudget | None = None,
+            sample_first: Sample | None = None,
+            proceed: Callable[[pd.DataFrame], bool] | None = None,
+    ) -> pd.DataFrame:
+        """runs every check against every data source and summarizes the results.
+
+        The full FnResults of the run are kept under `Pipeline.results`, keyed by
+        (DataSource.key, Fn.key). Use `iter_results` to process a run without keeping them.
+
+        With `aggregate_only`, each result is reduced to its counts and the first `max_failed_rows`
+        failing rows as soon as it arrives, and then dropped. `Pipeline.results` stays empty, so the
+        memory of a run grows with checks x sources rather than rows.
+
+        With a `budget`, the failing rows of the finished checks are added up as they arrive. Once
+        they go over it, the checks that haven't started are cancelled and reported with a
+        `cancelled` status. Checks already running are left to finish.
+
+        With `sample_first`, every check first runs on a sample of each source (see `sample_summary`).
+        The estimate is kept under `Pipeline.estimate` and handed to `proceed`. If `proceed` returns
+        False, the full run is skipped and every check is reported as `cancelled`.
+
+        :param raise_errors: whether to raise when a check can't be bound to a data source.
+        If False, the pair is reported with an `error` status instead.
+        :param executor: the Executor running the checks. Defaults to running them one at a time.
+        :param sinks: ResultSinks that get each result as soon as its check has run, and are closed at the end.
+        :param aggregate_only: whether to drop each result once it is summarized.
+        :param max_failed_rows: the failing row positions kept per result, in `aggregate_only` mode.
+        :param value_bounds: whether to add the min and max input values of the failing rows, per column.
+        :param budget: the failure budget of the whole run. Defaults to running every check.
+        :param sample_first: the sample to estimate the failure rates from before the full run.
+        :param proceed: decides from the sample estimate whether to go on with the full run. Defaults to always.
+        :return: pd.DataFrame with one row per FnResult, with the columns in `SUMMARY_COLUMNS`
+        (and `BOUNDS_COLUMNS` with `value_bounds`). How well the run kept the workers busy is
+        under `attrs["schedule"]`, see `schedule_stats`. With an executor `memory_limit`, the peak
+        memory of the run is under `attrs["memory"]`, see `MemoryGovernor.report`.
+        """
+        executor = executor or Executor()
+        tasks = self.tasks()
+        cancel_msg = None
+        if sample_first is not None:
+            self.estimate = self.sample_summary(sample_first, raise_errors=raise_errors, executor=executor)
+            if proceed is not None and not proceed(self.estimate):
+                tasks = []
+                cancel_msg = "Skipped, `proceed` turned down the sample estimate."
+
+        run_id = uuid4()
+        keep_rows = max_failed_rows if aggregate_only else None
 
         results = {}
+        summaries = {}
+        failed, checked = 0, 0
+        executor.timings.clear()
+        start = time.perf_counter()
+        tracking = nullcontext() if executor.governor is None else executor.governor.track()
+        stream = self.iter_results(raise_errors=raise_errors, executor=executor, tasks=tasks)
+        with tracking:
+            try:
+                for data, fn, r in stream:
+                    ds_id = data.key
+                    f_id = fn.key
+                    if not aggregate_only:
+                        results[(ds_id, f_id)] = r
+                    summaries[(ds_id, f_id)] = summarize(
+                        run_id,
+                        data,
+                        fn,
+                        r,
+                        max_failed_rows=keep_rows,
+                        value_bounds=value_bounds
+                    )
+                    for sink in sinks:
+                        sink.write(run_id, data, fn, r)
+
+                    if budget is not None:
+                        failed += sum(row["failed"] for row in summaries[(ds_id, f_id)])
+                        checked += sum(row["rows"] for row in summaries[(ds_id, f_id)])
+                        if budget.exceeded(failed, checked):
+                            break
+            finally:
+                stream.close()  # closing the executor cancels the tasks that haven't started
+                for sink in sinks:
+                    sink.close()
+        self.results = results
+        makespan = time.perf_counter() - start
+
+        # the executor may finish out of order, the summary follows the task order
+        rows = []
+        for task in self.tasks():
+            if task.key not in summaries:
+                msg = cancel_msg or f"Cancelled, the run went over its failure budget ({failed} of {checked} rows failed)."
+                summaries[task.key] = cancelled_rows(run_id, task.data, task.fn, msg)
+            rows.extend(summaries[task.key])
+        columns = SUMMARY_COLUMNS + BOUNDS_COLUMNS if value_bounds else SUMMARY_COLUMNS
+        out = pd.DataFrame(rows, columns=list(columns))
+        out.attrs["schedule"] = schedule_stats(makespan, executor.timings.values(), executor.workers)
+        if executor.governor is not None:
+            out.attrs["memory"] = executor.governor.report()
+        return out
+
+    def sample_summary(
+            self,
+            sample: Sample = Sample(),
+            raise_errors: bool = True,
+            executor: Executor | None = None,
+    ) -> pd.DataFrame:
+        """runs every check on a deterministic sample of each data source, and estimates the failure rates.
+
+        The sample is drawn as row positions, and only those rows are gathered from each source. In a
+        stratified sample, each failing row is weighted by the share of its stratum, so the estimate
+        stands for the whole source. The intervals are Wilson score intervals over the sampled rows.
+
+        :param sample: the size, stratifying column, seed and confidence level of the sample.
+        :param raise_errors: whether to raise when a check can't be bound to a data source.
+        :param executor: the Executor running the checks. Defaults to running them one at a time.
+        :return: pd.DataFrame with the columns in `SUMMARY_COLUMNS` and `ESTIMATE_COLUMNS`. `rows` and
+        `failed` count the sampled rows, `failure_rate` is the estimate, and `failed_rows` are source positions.
+        """
+        run_id = uuid4()
+        sampled = {}
+        profiled = any(f.profile_param is not None for f in self.functions)
         for ds in self.data_sources:
-            for f in self.functions:
-                ds_id = ds.key
-                f_id = f.key
+            if profiled:  # the checks on column statistics compare the sample to the whole columns
+                self.alias_map.profile(ds)
+            strata = self._strata_column(ds, sample.by)
+            positions, weights = sample_positions(
+                len(ds.data),
+                sample.rows,
+                strata=None if strata is None else ds.data[strata],
+                seed=sample.seed
+            )
+            sampled[ds.key] = (ds.take(positions), len(ds.data), positions, weights)
+
+        tasks = [Task(s[0], f) for s in sampled.values() for f in self.functions]
+        summaries = {}
+        for data, fn, r in self.iter_results(raise_errors=raise_errors, executor=executor, tasks=tasks):
+            _, population, positions, weights = sampled[data.key]
+            rows = summarize(run_id, data, fn, r)
+            for row in rows:
+                row["population_rows"] = population
+                if row["status"] in ("error", "skipped"):
+                    continue
+                if row["rows"] == len(positions):  # one verdict per sampled row, weighted by its stratum
+                    row["failure_rate"] = weights[row["failed_rows"]].sum() / population
+                if row["rows"] > 1:  # sampled row positions, back to source rows
+                    row["failed_rows"] = positions[row["failed_rows"]]
+            summaries[(data.key, fn.key)] = rows
 
-                curr_result = self.run(
-                    alias_map=self.alias_map,
-                    data=ds,
-                    fn=f,
-                    raise_missing=raise_errors
-                )
+        out = pd.DataFrame(
+            [row for task in tasks for row in summaries[task.key]],
+            columns=list(SUMMARY_COLUMNS + ESTIMATE_COLUMNS)
+        )
+        out["ci_low"], out["ci_high"] = wilson_interval(
+            out["failure_rate"] * out["rows"],
+            out["rows"].where(~out["status"].isin(["error", "skipped"])),
+            confidence=sample.confidence
+        )
+        return out
 
-                if isinstance(curr_result, Ok):
-                    r = curr_result.unwrap()
+    def profile(self, top: int = TOP_VALUES) -> pd.DataFrame:
+        """profiles the aliased columns of each data source, the same profiles the column statistics checks read.
+
+        :param top: the number of most common values to keep.
+        :return: pd.DataFrame with one row per data source and aliased column, and the columns in `PROFILE_COLUMNS`.
+        """
+        rows = []
+        for ds in self.data_sources:
+            aliased = [c for c in self.alias_map.c if c in ds.columns]
+            for column, stats in ds.profile(aliased, top=top).items():
+                parameter = self.alias_map.c[column].parameter
+                row = {"data_source": ds.name, "parameter": parameter, "null_rate": stats.null_rate}
+                rows.append(row | asdict(stats))
+        return pd.DataFrame(rows, columns=list(PROFILE_COLUMNS))
+
+    def _strata_column(self, data: DataSource, by: str | None) -> str | None:
+        """the column of `data` to stratify on, where `by` is a column or an alias map parameter."""
+        if by is None:
+            return None
+        alias = self.alias_map.p.get(by)
+        if isinstance(alias, One) and alias.alias in data.columns:
+            return alias.alias
+        return by if by in data.columns else None
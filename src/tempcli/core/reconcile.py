@@ -0,0 +1,254 @@
+"""module for reconciling two DataSources row by row on a key, e.g. a system extract against a vendor file.
+
+Parameters are resolved to columns through the `AliasMap`, so the two sources can name their
+columns differently::
+
+    alias_map = AliasMap({"iid": ["iid", "Item ID"], "price": ["price", "Unit Price"]})
+    outcome = Reconciler(system, alias_map, key="iid", compare={"price": Tolerance(abs_tol=0.01)}).against(vendor)
+    outcome.counts()
+
+Everything works on whole columns: the key of the left source is hashed once into a pandas index,
+the right keys are looked up in it in one call, and each column pair is compared on the aligned
+arrays. The row sets that come back are NumPy arrays of row positions.
+"""
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from tempcli.core.components.alias_map import AliasMap
+from tempcli.core.components.data import DataSource
+
+
+@dataclass(frozen=True)
+class Tolerance:
+    """how far apart the two values of a numeric column can be and still match.
+
+    They match when |left - right| <= max(abs_tol, rel_tol * |right|). Non-numeric columns are
+    always compared for equality. Two missing values match, one missing value doesn't.
+
+    `abs_tol`: float, the absolute tolerance. Defaults to an exact match.
+
+    `rel_tol`: float, the tolerance relative to the right value.
+    """
+    abs_tol: float = 0.0
+    rel_tol: float = 0.0
+
+    def __post_init__(self):
+        if self.abs_tol < 0 or self.rel_tol < 0:
+            raise ValueError(f"tolerances can't be negative, got abs_tol={self.abs_tol}, rel_tol={self.rel_tol}")
+
+
+EXACT = Tolerance()
+
+
+@dataclass(frozen=True)
+class Reconciliation:
+    """the outcome of reconciling a left and a right DataSource.
+
+    The keys found on both sides are `pairs`, kept as two aligned arrays of row positions.
+    `mismatches` holds, for each compared parameter, the positions in those arrays where the values
+    differ. The rest of the row sets are row positions in their source.
+
+    `left`: str, the name of the left DataSource.
+
+    `right`: str, the name of the right DataSource.
+
+    `left_rows`: np.ndarray, the left row of each pair.
+
+    `right_rows`: np.ndarray, the right row of each pair.
+
+    `mismatches`: dict, `parameter: pair positions` where the column pair didn't match.
+
+    `missing_right`: np.ndarray, the left rows whose key isn't in the right source.
+
+    `missing_left`: np.ndarray, the right rows whose key isn't in the left source.
+
+    `duplicate_left`: np.ndarray, left rows repeating a key seen before. Only the first is reconciled.
+
+    `duplicate_right`: np.ndarray, right rows repeating a key seen before. Only the first is reconciled.
+    """
+    left: str
+    right: str
+    left_rows: np.ndarray
+    right_rows: np.ndarray
+    mismatches: dict[str, np.ndarray] = field(default_factory=dict)
+    missing_right: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    missing_left: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    duplicate_left: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    duplicate_right: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+
+    @cached_property
+    def mismatched(self) -> np.ndarray:
+        """returns the pair positions where at least one column pair didn't match."""
+        if not self.mismatches:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(list(self.mismatches.values())))
+
+    @cached_property
+    def matched(self) -> np.ndarray:
+        """returns the pair positions where every column pair matched."""
+        keep = np.ones(len(self.left_rows), dtype=bool)
+        keep[self.mismatched] = False
+        return np.flatnonzero(keep)
+
+    def counts(self) -> dict[str, int]:
+        """returns the size of each row set."""
+        return {
+            "pairs": len(self.left_rows),
+            "matched": len(self.matched),
+            "mismatched": len(self.mismatched),
+            "missing_left": len(self.missing_left),
+            "missing_right": len(self.missing_right),
+            "duplicate_left": len(self.duplicate_left),
+            "duplicate_right": len(self.duplicate_right),
+        }
+
+    def summary(self) -> pd.DataFrame:
+        """returns one row per compared parameter, with the pairs compared, the mismatches and their rate."""
+        n_pairs = len(self.left_rows)
+        rows = [
+            {
+                "parameter": param,
+                "pairs": n_pairs,
+                "mismatched": len(positions),
+                "mismatch_rate": len(positions) / n_pairs if n_pairs else 0.0,
+            }
+            for param, positions in self.mismatches.items()
+        ]
+        return pd.DataFrame(rows, columns=["parameter", "pairs", "mismatched", "mismatch_rate"])
+
+
+class Reconciler:
+    """reconciles right DataSources against one left DataSource, on a key.
+
+    The left keys are indexed once, when the Reconciler is made. The index hashes them on the first
+    lookup and keeps the hash table for every later call to `against`, e.g. to check several vendor
+    files against the same extract.
+    """
+
+    def __init__(
+            self,
+            left: DataSource,
+            alias_map: AliasMap | dict,
+            key: str | Collection[str],
+            compare: Collection[str] | Mapping[str, Tolerance | float | None] | None = None,
+    ):
+        """
+        :param left: the DataSource the others are reconciled against.
+        :param alias_map: the AliasMap (or its config) the key and compared parameters resolve through.
+        :param key: the parameter (or parameters) identifying a row on both sides.
+        :param compare: the parameters to compare, or `parameter: Tolerance` (a float is an absolute
+        tolerance, None an exact match). Defaults to every other parameter of the alias map found in the left source.
+        :raises KeyError: when a parameter has no column in the left source.
+        :raises ValueError: when a parameter matches several columns of the left source.
+        """
+        self.left = left
+        self.alias_map = alias_map if isinstance(alias_map, AliasMap) else AliasMap(alias_map)
+        self.key = (key,) if isinstance(key, str) else tuple(key)
+        self.tolerances = self._tolerances(compare)
+
+        key_columns = [self.left.data[self.alias_map.resolve_column(p, self.left)] for p in self.key]
+        index = _key_index(key_columns)
+        first = ~index.duplicated(keep="first")
+        self._duplicate_left = np.flatnonzero(~first)
+        self._left_positions = np.flatnonzero(first)
+        self._index = index[first]
+        """the unique left keys. Position i is the left row `_left_positions[i]`."""
+
+    def _tolerances(self, compare) -> dict[str, Tolerance]:
+        if compare is None:
+            columns = self.left.columns
+            compare = [p for p in self.alias_map.p if p not in self.key and self.alias_map.p[p].map(columns).is_ok()]
+        if not isinstance(compare, Mapping):
+            compare = dict.fromkeys(compare)
+        tolerances = {}
+        for param, tolerance in compare.items():
+            if tolerance is None:
+                tolerance = EXACT
+            elif not isinstance(tolerance, Tolerance):
+                tolerance = Tolerance(abs_tol=float(tolerance))
+            tolerances[param] = tolerance
+        return tolerances
+
+    def against(self, right: DataSource) -> Reconciliation:
+        """reconciles `right` against the left DataSource.
+
+        :raises KeyError: when a parameter has no column in `right`.
+        :raises ValueError: when a parameter matches several columns of `right`.
+        """
+        key_columns = [right.data[self.alias_map.resolve_column(p, right)] for p in self.key]
+        right_keys = _key_index(key_columns)
+        first = ~right_keys.duplicated(keep="first")
+
+        hits = self._index.get_indexer(right_keys)
+        found = (hits >= 0) & first
+        right_rows = np.flatnonzero(found)
+        left_rows = self._left_positions[hits[found]]
+
+        seen = np.zeros(len(self.left.data), dtype=bool)
+        seen[left_rows] = True
+        seen[self._duplicate_left] = True
+
+        mismatches = {}
+        for param, tolerance in self.tolerances.items():
+            left_values = _values(self.left.data[self.alias_map.resolve_column(param, self.left)])[left_rows]
+            right_values = _values(right.data[self.alias_map.resolve_column(param, right)])[right_rows]
+            mismatches[param] = np.flatnonzero(~values_match(left_values, right_values, tolerance))
+
+        return Reconciliation(
+            left=self.left.name,
+            right=right.name,
+            left_rows=left_rows,
+            right_rows=right_rows,
+            mismatches=mismatches,
+            missing_right=np.flatnonzero(~seen),
+            missing_left=np.flatnonzero((hits < 0) & first),
+            duplicate_left=self._duplicate_left,
+            duplicate_right=np.flatnonzero(~first),
+        )
+
+
+def reconcile(
+        left: DataSource,
+        right: DataSource,
+        alias_map: AliasMap | dict,
+        key: str | Collection[str],
+        compare: Collection[str] | Mapping[str, Tolerance | float | None] | None = None,
+) -> Reconciliation:
+    """reconciles `right` against `left` on `key`. See `Reconciler` for the parameters."""
+    return Reconciler(left, alias_map, key, compare).against(right)
+
+
+def values_match(left: np.ndarray, right: np.ndarray, tolerance: Tolerance = EXACT) -> np.ndarray:
+    """compares two aligned arrays, element by element.
+
+    :return: np.ndarray of bool, True where the values match within `tolerance`, or are both missing.
+    """
+    left_na, right_na = pd.isna(left), pd.isna(right)
+    both = ~left_na & ~right_na
+    left, right = left[both], right[both]
+    if left.dtype.kind in "iuf" and right.dtype.kind in "iuf":
+        left, right = left.astype(float), right.astype(float)
+        close = np.abs(left - right) <= np.maximum(tolerance.abs_tol, tolerance.rel_tol * np.abs(right))
+    else:
+        close = left == right
+
+    matched = left_na & right_na
+    matched[both] = np.asarray(close, dtype=bool)
+    return matched
+
+
+def _values(column: pd.Series) -> np.ndarray:
+    """the column as an array, with nullable numbers as floats, so they compare with a tolerance."""
+    if isinstance(column.dtype, pd.api.extensions.ExtensionDtype) and column.dtype.kind in "iuf":
+        return column.to_numpy(dtype=float, na_value=np.nan)
+    return column.to_numpy()
+
+
+def _key_index(columns: list[pd.Series]) -> pd.Index:
+    if len(columns) == 1:
+        return pd.Index(columns[0].to_numpy())
+    return pd.MultiIndex.from_arrays([c.to_numpy() for c in columns])
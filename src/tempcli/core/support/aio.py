@@ -0,0 +1,22 @@
+"""module for running `async def` checks from the synchronous engine"""
+import asyncio
+from collections.abc import Coroutine
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_coroutine(coro: Coroutine):
+    """runs a coroutine to completion and returns its result.
+
+    Uses a fresh event loop. When the calling thread already has a running loop
+    (so `asyncio.run` isn't allowed), the coroutine runs on a helper thread instead.
+
+    :param coro: the coroutine to run.
+    :return: whatever the coroutine returns.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
@@ -0,0 +1,44 @@
+"""module for the failure budgets that stop a check, or a whole run, once enough rows have failed"""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class FailureBudget:
+    """how many failing rows to tolerate before giving up.
+
+    Used per check (`Fn(budget=...)`), where a `row_local` check is run in chunks of
+    `chunk_rows` rows and stops after the chunk that used up the budget. Also used per run
+    (`Pipeline.run_summary(budget=...)`), where the failures of every finished check are added up
+    and the checks that haven't run yet are cancelled.
+
+    `max_failures`: int, the most failing rows. Defaults to no limit.
+
+    `max_failure_rate`: float, the highest share of failing rows, between 0 and 1. Defaults to no limit.
+
+    `min_rows`: int, the rows to check before `max_failure_rate` applies, so a few bad rows at the
+    start don't stop everything. Defaults to 0.
+
+    `chunk_rows`: int, the rows per chunk when a check runs under a budget. Defaults to 10,000.
+    """
+    max_failures: int | None = None
+    max_failure_rate: float | None = None
+    min_rows: int = 0
+    chunk_rows: int = 10_000
+
+    def __post_init__(self):
+        if self.max_failures is None and self.max_failure_rate is None:
+            raise ValueError("A FailureBudget needs `max_failures`, `max_failure_rate` or both.")
+        if self.max_failures is not None and self.max_failures < 0:
+            raise ValueError(f"max_failures must not be negative, got {self.max_failures}")
+        if self.max_failure_rate is not None and not 0 <= self.max_failure_rate <= 1:
+            raise ValueError(f"max_failure_rate must be between 0 and 1, got {self.max_failure_rate}")
+        if self.chunk_rows < 1:
+            raise ValueError(f"chunk_rows must be at least 1, got {self.chunk_rows}")
+
+    def exceeded(self, failed: int, rows: int) -> bool:
+        """returns whether `failed` failing rows out of `rows` checked rows is over the budget."""
+        if self.max_failures is not None and failed > self.max_failures:
+            return True
+        if self.max_failure_rate is not None and rows and rows >= self.min_rows:
+            return failed / rows > self.max_failure_rate
+        return False
@@ -0,0 +1,49 @@
+"""module for caching what is built from a DataFrame, for as long as the DataFrame lives"""
+import threading
+import weakref
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import pandas as pd
+
+
+class FrameCache:
+    """values built from a DataFrame, once per (DataFrame, key), and shared by every check that asks.
+
+    DataFrames are told apart by identity, not their DataSource name, and entries go once the
+    DataFrame is freed.
+    """
+
+    def __init__(self):
+        self._values: dict[tuple, tuple[weakref.ref, Any]] = {}
+        # reentrant, since a DataFrame can be freed (and forgotten) while the lock is held
+        self._lock = threading.RLock()
+        self.builds = 0
+        """the number of values built, for telling whether the cache was used."""
+
+    def get(self, df: pd.DataFrame, key: Hashable, build: Callable[[pd.DataFrame], Any]) -> Any:
+        """returns the value of `key` for `df`, built with `build(df)` the first time."""
+        cache_key = (id(df), key)
+        with self._lock:
+            cached = self._values.get(cache_key)
+            if cached is not None and cached[0]() is df:
+                return cached[1]
+
+        value = build(df)
+        with self._lock:
+            cached = self._values.get(cache_key)
+            if cached is not None and cached[0]() is df:  # built on another thread meanwhile
+                return cached[1]
+            self._values[cache_key] = (weakref.ref(df, self._forget), value)
+            self.builds += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _forget(self, ref: weakref.ref) -> None:
+        """drops the entries of a freed DataFrame."""
+        with self._lock:
+            for cache_key in [k for k, v in self._values.items() if v[0] is ref]:
+                del self._values[cache_key]
@@ -0,0 +1,86 @@
+"""module for ordering checks by their dependencies, and gating them on the checks upstream"""
+from collections.abc import Collection
+from uuid import UUID
+
+import numpy as np
+
+from tempcli.core.components.func import Fn
+from tempcli.core.support.interfaces import FnResult
+from tempcli.core.support.summary import failed_mask
+from tempcli.core.types.result import Result
+
+
+def order_checks(functions: Collection[Fn], ignore_missing: bool = False) -> list[Fn]:
+    """sorts the checks so that each comes after everything it `depends_on`.
+
+    Checks keep their given order otherwise, so the same pipeline always runs in the same order.
+
+    :param functions: the checks to sort.
+    :param ignore_missing: whether to leave out dependencies that aren't among `functions`, rather than raise.
+    :raises ValueError: when two different checks have the same name, a dependency isn't a check of
+        the pipeline, or the dependencies loop.
+    """
+    by_name: dict[str, Fn] = {}
+    for f in functions:
+        if by_name.setdefault(f.name, f) != f:
+            raise ValueError(f"Two different checks are named `{f.name}`. Give one of them another name.")
+    for f in functions:
+        missing = [d for d in f.depends_on if d not in by_name]
+        if missing and not ignore_missing:
+            raise ValueError(f"`{f.name}` depends on {missing}, which aren't checks of the pipeline.")
+
+    ordered: dict[str, Fn] = {}
+    visiting: list[str] = []
+
+    def visit(f: Fn):
+        if f.name in ordered:
+            return
+        if f.name in visiting:
+            raise ValueError(f"Check dependencies loop: {' -> '.join(visiting + [f.name])}.")
+        visiting.append(f.name)
+        for d in f.depends_on:
+            if d in by_name:
+                visit(by_name[d])
+        visiting.pop()
+        ordered[f.name] = f
+
+    for f in functions:
+        visit(f)
+    return list(ordered.values())
+
+
+def check_levels(functions: Collection[Fn]) -> dict[UUID, int]:
+    """returns the level of each check by `Fn.key`: 0 without dependencies, else one more than its deepest upstream.
+
+    Checks on the same level don't depend on each other, so they can run at the same time.
+    Dependencies that aren't among `functions` (a pipeline with some checks taken out) are left out.
+    """
+    by_name = {f.name: f for f in functions}
+    levels: dict[str, int] = {}
+    for f in order_checks(functions, ignore_missing=True):
+        levels[f.name] = 1 + max((levels[d] for d in f.depends_on if d in levels), default=-1)
+    return {by_name[name].key: level for name, level in levels.items()}
+
+
+def passing_mask(fn: Fn, result: Result[Collection[FnResult], str], n_rows: int) -> np.ndarray | None:
+    """returns which of the `n_rows` source rows passed every FnResult of a check.
+
+    Rows a result doesn't cover (a check stopped on its budget, or restricted to some rows) count as
+    not passed. Returns None when the check errored or was skipped, so nothing is known to pass.
+    """
+    if result.is_err():
+        return None
+    passed = np.ones(n_rows, dtype=bool)
+    for fn_result in result.unwrap():
+        if fn_result is None:
+            return None
+        failed = failed_mask(fn, fn_result.result)
+        covered = np.zeros(n_rows, dtype=bool)
+        if fn_result.rows is not None:
+            covered[fn_result.rows[~failed]] = True
+        elif len(failed) == n_rows:
+            covered[~failed] = True
+        elif len(failed) == 1:  # one verdict for the whole source
+            covered[:] = not failed[0]
+        passed &= covered
+    return passed
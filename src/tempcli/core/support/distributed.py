@@ -0,0 +1,341 @@
+"""module for spreading a pipeline run across worker processes on other machines.
+
+The `Coordinator` splits the run into (check, source, row range) tasks and hands them to
+workers that connect to it over TCP. Workers build the same pipeline locally, run the
+tasks, and send back compact summary rows (counts and failing row positions, never the
+full result columns). A task whose worker dies is handed to another worker.
+
+Workers are started with `run_worker`, or from the command line:
+
+    python -m tempcli.core.support.distributed HOST:PORT package.module:MyPipeline
+
+Both sides authenticate with the same `authkey` (the `TEMPCLI_AUTHKEY` environment
+variable on the command line). Messages are pickled, so only connect trusted machines.
+"""
+import argparse
+import importlib
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from multiprocessing.connection import Client, Connection, Listener
+from uuid import UUID, uuid4
+
+import numpy as np
+import pandas as pd
+
+from tempcli.core.components.data import DataSource
+from tempcli.core.support.manager import PipeMixin
+from tempcli.core.support.partition import row_chunks
+from tempcli.core.support.summary import SUMMARY_COLUMNS, summarize
+
+
+@dataclass(frozen=True)
+class RangeTask:
+    """one check, on one data source, over rows [start, stop).
+
+    `data_key`, `fn_key`: the keys of the DataSource and Fn, which are the same on every machine.
+
+    `attempt`: how many times the task has been handed out before.
+    """
+    task_id: int
+    run_id: UUID
+    data_key: UUID
+    fn_key: UUID
+    start: int
+    stop: int
+    attempt: int = 0
+
+
+@dataclass(frozen=True)
+class RangeResult:
+    """the summary rows of a RangeTask, with `failed_rows` already offset to source positions."""
+    task_id: int
+    start: int
+    rows: list[dict]
+
+
+class Coordinator:
+    """hands the work of `Pipeline.run_summary` out to connected workers and merges what they send back.
+
+    Checks flagged `row_local` are split into ranges of `chunk_rows` rows. Every other check runs
+    on the whole source as a single task.
+
+    Tasks run independently of each other, so checks with a `depends_on`, a `timeout` or a failure
+    `budget` aren't supported, and the Coordinator refuses pipelines that have them.
+    """
+
+    def __init__(
+            self,
+            pipeline,
+            authkey: bytes,
+            address: tuple[str, int] = ("127.0.0.1", 0),
+            chunk_rows: int = 100_000,
+            max_retries: int = 2,
+    ):
+        """
+        :param pipeline: the Pipeline to run. Workers must be able to build the same one.
+        :param authkey: the shared secret workers authenticate with.
+        :param address: the (host, port) to listen on. Port 0 picks a free port, see `address`.
+        :param chunk_rows: the most rows in a single task, for `row_local` checks.
+        :param max_retries: how many times a task is handed out again after its worker died.
+        :raises ValueError: when a check has a `depends_on`, a `timeout` or a `budget`.
+        """
+        unsupported = [
+            f"{f.name} ({', '.join(o for o in ('depends_on', 'timeout', 'budget') if getattr(f, o))})"
+            for f in pipeline.functions
+            if f.depends_on or f.timeout is not None or f.budget is not None
+        ]
+        if unsupported:
+            raise ValueError(f"Distributed runs don't gate, time or budget checks, got {', '.join(unsupported)}.")
+        self.pipeline = pipeline
+        self.chunk_rows = chunk_rows
+        self.max_retries = max_retries
+        self._listener = Listener(address, authkey=authkey)
+        self._pending: queue.Queue = queue.Queue()
+        self._finished: queue.Queue = queue.Queue()
+        self._handlers: set[threading.Thread] = set()
+        """the handlers of the workers still connected."""
+        self._lock = threading.Lock()
+        self._closed = False
+        self._accepting = threading.Thread(target=self._accept, daemon=True)
+        self._accepting.start()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """returns the (host, port) workers should connect to."""
+        return self._listener.address
+
+    def tasks(self, run_id: UUID) -> list[RangeTask]:
+        """splits the pipeline into RangeTasks, in `run_summary` order."""
+        tasks = []
+        for ds in self.pipeline.data_sources:
+            n_rows = len(ds.data)
+            for f in self.pipeline.functions:
+                ranges = row_chunks(n_rows, self.chunk_rows) if f.row_local else [(0, n_rows)]
+                for start, stop in ranges:
+                    tasks.append(RangeTask(len(tasks), run_id, ds.key, f.key, start, stop))
+        return tasks
+
+    def run_summary(self, timeout: float | None = None) -> pd.DataFrame:
+        """runs the pipeline on the connected workers. Same output as `Pipeline.run_summary`
+        with `raise_errors=False`. A check that errored on any of its row ranges is one error row.
+
+        :param timeout: the most seconds to wait for the next result before giving up.
+        :return: pd.DataFrame with the columns in `SUMMARY_COLUMNS`.
+        """
+        run_id = uuid4()
+        tasks = self.tasks(run_id)
+        for task in tasks:
+            self._pending.put(task)
+
+        results: dict[int, RangeResult] = {}
+        while len(results) < len(tasks):
+            try:
+                result: RangeResult = self._finished.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(f"No worker result within {timeout}s, {len(tasks) - len(results)} tasks left.")
+            results[result.task_id] = result
+
+        names = {ds.key: ds.name for ds in self.pipeline.data_sources}
+        names |= {f.key: f.name for f in self.pipeline.functions}
+        return _merge(tasks, results, names)
+
+    def close(self, timeout: float = 5) -> None:
+        """tells the connected workers to stop and stops listening.
+
+        :param timeout: the most seconds to wait, in all, for the workers to be told.
+        """
+        with self._lock:
+            self._closed = True
+            handlers = list(self._handlers)
+        self._listener.close()
+        for _ in handlers:  # one stop per connected worker, workers that died already took none
+            self._pending.put(None)
+        deadline = time.monotonic() + timeout
+        for handler in handlers:
+            handler.join(timeout=max(deadline - time.monotonic(), 0))
+
+        # a worker that died before taking its stop leaves it behind. The leftovers are dropped, and
+        # the handlers still busy with a task get their stop for when they are done
+        while True:
+            try:
+                self._pending.get_nowait()
+            except queue.Empty:
+                break
+        with self._lock:
+            for _ in self._handlers:
+                self._pending.put(None)
+
+    def __enter__(self) -> "Coordinator":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn = self._listener.accept()
+            except OSError:  # listener closed
+                return
+            handler = threading.Thread(target=self._serve, args=(conn,), daemon=True)
+            with self._lock:
+                if self._closed:
+                    conn.close()
+                    return
+                self._handlers.add(handler)
+            handler.start()
+
+    def _serve(self, conn: Connection) -> None:
+        """feeds one worker, one task at a time."""
+        try:
+            self._feed(conn)
+        finally:
+            with self._lock:
+                self._handlers.discard(threading.current_thread())
+
+    def _feed(self, conn: Connection) -> None:
+        with conn:
+            while True:
+                task: RangeTask | None = self._pending.get()
+                if task is None:
+                    try:
+                        conn.send(None)
+                    except OSError:
+                        pass
+                    return
+                try:
+                    conn.send(task)
+                    result = conn.recv()
+                except (EOFError, OSError):  # the worker died, someone else gets the task
+                    self._retry(task)
+                    return
+                self._finished.put(result)
+
+    def _retry(self, task: RangeTask) -> None:
+        if task.attempt < self.max_retries:
+            self._pending.put(replace(task, attempt=task.attempt + 1))
+            return
+        msg = f"Task gave up after {task.attempt + 1} attempts, the worker died each time."
+        self._finished.put(RangeResult(task.task_id, task.start, [{"status": "error", "message": msg}]))
+
+
+def run_worker(address: tuple[str, int], authkey: bytes, pipeline_factory: Callable) -> None:
+    """connects to a Coordinator and runs tasks until told to stop.
+
+    :param address: the (host, port) of the Coordinator.
+    :param authkey: the shared secret.
+    :param pipeline_factory: builds the pipeline, usually the Pipeline subclass itself.
+    """
+    pipeline = pipeline_factory()
+    sources = {ds.key: ds for ds in pipeline.data_sources}
+    functions = {f.key: f for f in pipeline.functions}
+
+    with Client(address, authkey=authkey) as conn:
+        while True:
+            try:
+                task: RangeTask | None = conn.recv()
+            except EOFError:
+                return
+            if task is None:
+                return
+            conn.send(_run_task(pipeline.alias_map, sources[task.data_key], functions[task.fn_key], task))
+
+
+def _run_task(alias_map, data: DataSource, fn, task: RangeTask) -> RangeResult:
+    try:
+        if fn.profile_param is not None:  # profiled once per worker, on every row, so each range reads the same
+            alias_map.profile(data)
+        sliced = data.take(slice(task.start, task.stop))
+        result = PipeMixin.run(alias_map=alias_map, data=sliced, fn=fn, raise_missing=False)
+        if result.is_ok():
+            result = result.unwrap()
+        rows = summarize(task.run_id, sliced, fn, result)
+    except Exception as e:
+        rows = [{"status": "error", "message": f"{type(e).__name__}: {e}"}]
+
+    for row in rows:
+        if "failed_rows" in row:
+            row["failed_rows"] = row["failed_rows"] + task.start
+    return RangeResult(task.task_id, task.start, rows)
+
+
+def _merge(tasks: list[RangeTask], results: dict[int, RangeResult], names: dict[UUID, str]) -> pd.DataFrame:
+    """adds the row ranges of each (source, check, columns) back together.
+
+    A check that errored on any range is reported as a single error row, with the first error,
+    rather than a partial result from the ranges that ran.
+
+    :param tasks: the tasks of the run, in order.
+    :param results: the result of each task, by task_id.
+    :param names: the names of the data sources and functions, by key.
+    """
+    merged: dict[tuple, dict[tuple, dict]] = {}
+    errors: dict[tuple, dict] = {}
+    ranges = Counter((task.data_key, task.fn_key) for task in tasks)
+    for task in tasks:
+        check = (task.data_key, task.fn_key)
+        parts = merged.setdefault(check, {})
+        for row in results[task.task_id].rows:
+            if row["status"] == "error":
+                if ranges[check] > 1:  # say which range, when the check was split
+                    row = row | {"message": f"rows {task.start}-{task.stop}: {row.get('message')}"}
+                errors.setdefault(check, _error_fields(task, row, names))
+                continue
+
+            key = (row["check"], row["columns"])
+            if key not in parts:
+                parts[key] = row | {"failed_rows": [row["failed_rows"]]}
+                continue
+            total = parts[key]
+            total["rows"] += row["rows"]
+            total["failed"] += row["failed"]
+            total["failed_rows"].append(row["failed_rows"])
+
+    out = []
+    for check, parts in merged.items():
+        if check in errors:
+            out.append(errors[check])
+            continue
+        for row in parts.values():
+            row["failed_rows"] = np.concatenate(row["failed_rows"])
+            row["failure_rate"] = row["failed"] / row["rows"] if row["rows"] else 0.0
+            row["status"] = "fail" if row["failed"] else "pass"
+            out.append(row)
+    return pd.DataFrame(out, columns=list(SUMMARY_COLUMNS))
+
+
+def _error_fields(task: RangeTask, row: dict, names: dict[UUID, str]) -> dict:
+    return {
+        "run_id": task.run_id,
+        "data_source": names[task.data_key],
+        "data_key": task.data_key,
+        "check": names[task.fn_key],
+        "fn_key": task.fn_key,
+        "columns": None,
+        "rows": 0,
+        "failed": 0,
+        "failure_rate": np.nan,
+        "failed_rows": np.empty(0, dtype=np.int64),
+    } | {k: v for k, v in row.items() if k != "failed_rows"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Runs a tempcli worker for a Coordinator.")
+    parser.add_argument("address", help="HOST:PORT of the coordinator")
+    parser.add_argument("pipeline", help="module:PipelineClass to build the pipeline from")
+    args = parser.parse_args()
+
+    host, port = args.address.rsplit(":", 1)
+    module, name = args.pipeline.split(":")
+    pipeline_factory = getattr(importlib.import_module(module), name)
+    authkey = os.environ["TEMPCLI_AUTHKEY"].encode()
+    run_worker((host, int(port)), authkey, pipeline_factory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,550 @@
+"""module for the executors that run the (DataSource, Fn) checks of a pipeline"""
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Collection, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import AbstractContextManager, ExitStack, nullcontext
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait as connection_wait
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+from uuid import UUID
+
+import numpy as np
+import pandas as pd
+
+from tempcli.core.components.alias_map import AliasMap
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.support.manager import PipeMixin
+from tempcli.core.support.memory import MemoryGovernor
+from tempcli.core.support.shared import SharedFrame
+from tempcli.core.support.summary import TimedOut
+from tempcli.core.support.timings import TimingHistory
+from tempcli.core.types.result import Err, Result
+
+
+@dataclass(frozen=True, eq=False)
+class Task:
+    """a single unit of pipeline work, one check against one data source.
+
+    `data`: DataSource, the data the check runs against.
+
+    `fn`: Fn, the check being run.
+
+    `rows`: np.ndarray, the source row positions `data` was cut down to, when the check only runs
+    on the rows that passed the checks upstream of it. Defaults to every row.
+    """
+    data: DataSource
+    fn: Fn
+    rows: np.ndarray | None = None
+
+    @property
+    def key(self) -> tuple[UUID, UUID]:
+        """returns the (DataSource.key, Fn.key) pair identifying the task."""
+        return self.data.key, self.fn.key
+
+
+class Executor:
+    """runs the tasks one after the other in the calling process.
+
+    Base class for the parallel executors. Subclasses override `map`, and may yield
+    the tasks in the order they complete rather than the order they were given.
+
+    With a `history`, the tasks are reordered by their expected runtime before they start (see
+    `schedule_tasks`), and each runtime is added to the history once the task is done. Either way,
+    the seconds each task took are kept under `timings`.
+
+    A check with an `Fn.timeout` that runs over it is given up on and yields an `Err(TimedOut)`.
+    Here and in `ThreadExecutor` the check's thread is abandoned, since Python threads can't be
+    stopped: it keeps running in the background, but the run doesn't wait for it.
+
+    With a `memory_limit`, each task is admitted through a `MemoryGovernor`: it waits until its
+    estimated working set fits next to the running tasks, and `row_local` checks too big for their
+    share of the limit run in row chunks.
+    """
+
+    def __init__(
+            self,
+            partitions: int = 1,
+            history: TimingHistory | None = None,
+            memory_limit: int | None = None,
+    ):
+        """
+        :param partitions: the number of row partitions `row_local` functions are split into.
+        The partitions run on a thread pool. Defaults to running on the whole column.
+        :param history: the past runtimes to order the tasks by. Defaults to running them in the given order.
+        :param memory_limit: the memory budget of the running tasks in bytes. Defaults to no budget.
+        """
+        self.partitions = partitions
+        self.history = history
+        self.memory_limit = memory_limit
+        self.timings: dict[tuple[UUID, UUID], float] = {}
+        """the seconds each task took, by `Task.key`."""
+
+    @property
+    def workers(self) -> int:
+        """the number of tasks that run at the same time."""
+        return 1
+
+    def schedule(self, tasks: Iterable[Task]) -> list[Task]:
+        """returns the tasks in the order they should start."""
+        if self.history is None:
+            return list(tasks)
+        return schedule_tasks(tasks, self.history, self.workers)
+
+    @functools.cached_property
+    def governor(self) -> MemoryGovernor | None:
+        """admits the tasks within `memory_limit`. None without a limit."""
+        if self.memory_limit is None:
+            return None
+        return MemoryGovernor(self.memory_limit, self.workers)
+
+    def _plan(self, alias_map: AliasMap, task: Task) -> tuple[AbstractContextManager, int | None]:
+        """returns (the reservation to hold while the task runs, its chunk_rows)."""
+        if self.governor is None:
+            return nullcontext(), None
+        n_bytes, chunk_rows = self.governor.plan(alias_map, task.fn, task.data)
+        return self.governor.reserve(n_bytes), chunk_rows
+
+    def _done(self, task: Task, seconds: float) -> None:
+        self.timings[task.key] = seconds
+        if self.history is not None:
+            self.history.record(task.fn, task.data, seconds)
+
+    def map(
+            self,
+            alias_map: AliasMap,
+            tasks: Iterable[Task],
+            raise_missing: bool = False,
+    ) -> Iterator[tuple[Task, Result]]:
+        """runs each task through `PipeMixin.run`.
+
+        :param alias_map: the AliasMap shared by every task.
+        :param tasks: the tasks to run.
+        :param raise_missing: passed on to `PipeMixin.run`.
+        :return: an iterator of (Task, Result) pairs.
+        """
+        with ExitStack() as stack:
+            abandoned = []
+            pool = None
+            if self.partitions > 1:
+                pool = ThreadPoolExecutor(max_workers=self.partitions)
+                stack.callback(lambda: pool.shutdown(wait=not abandoned, cancel_futures=True))
+            for task in self.schedule(tasks):
+                reservation, chunk_rows = self._plan(alias_map, task)
+                call = functools.partial(
+                    _timed,
+                    PipeMixin.run,
+                    alias_map=alias_map,
+                    data=task.data,
+                    fn=task.fn,
+                    raise_missing=raise_missing,
+                    partitions=self.partitions,
+                    pool=pool,
+                    chunk_rows=chunk_rows
+                )
+                with reservation:
+                    if task.fn.timeout is None:
+                        result, seconds = call()
+                    else:
+                        try:
+                            result, seconds = _call_with_timeout(task.fn.timeout, call)
+                        except _CheckTimedOut:
+                            abandoned.append(task)
+                            result, seconds = _timed_out(task), task.fn.timeout
+                self._done(task, seconds)
+                yield task, result
+
+
+class ThreadExecutor(Executor):
+    """runs the tasks on a thread pool, yielding them as they complete.
+
+    `Fn` and `AliasMap` are safe to share across threads, so no data is copied. With the GIL,
+    only checks that spend their time in NumPy or pandas overlap. On a free-threaded build
+    (`python3.13t`), pure Python checks run on every core without any process overhead.
+
+    A check with an `Fn.timeout` runs on a daemon thread of its own, which its pool thread waits
+    on. When it runs over, it is abandoned and the pool thread moves on to the next task, so a
+    stuck check never holds a worker.
+    """
+
+    def __init__(
+            self,
+            max_workers: int | None = None,
+            partitions: int = 1,
+            history: TimingHistory | None = None,
+            memory_limit: int | None = None,
+    ):
+        """
+        :param max_workers: the number of threads. Defaults to the ThreadPoolExecutor default.
+        :param partitions: the number of row partitions `row_local` functions are split into.
+        :param history: the past runtimes to order the tasks by.
+        :param memory_limit: the memory budget of the running tasks in bytes.
+        """
+        super().__init__(partitions=partitions, history=history, memory_limit=memory_limit)
+        self.max_workers = max_workers
+
+    @property
+    def workers(self) -> int:
+        return self.max_workers or min(32, (os.cpu_count() or 1) + 4)  # the ThreadPoolExecutor default
+
+    def map(
+            self,
+            alias_map: AliasMap,
+            tasks: Iterable[Task],
+            raise_missing: bool = False,
+    ) -> Iterator[tuple[Task, Result]]:
+        with ExitStack() as stack:
+            # abandoned checks may still be running, on the partition pool too, so only wait if there are none
+            abandoned = []
+
+            def shutdown(p: ThreadPoolExecutor) -> None:
+                p.shutdown(wait=not abandoned, cancel_futures=True)
+
+            # a separate pool for row partitions, since waiting on our own pool from a task can deadlock
+            partition_pool = None
+            if self.partitions > 1:
+                partition_pool = ThreadPoolExecutor(max_workers=self.partitions)
+                stack.callback(shutdown, partition_pool)
+
+            pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            stack.callback(shutdown, pool)
+            # submitted in schedule order, so the pool starts them in that order
+            futures = {}
+            for t in self.schedule(tasks):
+                reservation, chunk_rows = self._plan(alias_map, t)
+                run = PipeMixin.run if t.fn.timeout is None else functools.partial(
+                    _call_with_timeout, t.fn.timeout, PipeMixin.run
+                )
+                future = pool.submit(
+                    _reserved,
+                    reservation,
+                    run,
+                    alias_map=alias_map,
+                    data=t.data,
+                    fn=t.fn,
+                    raise_missing=raise_missing,
+                    partitions=self.partitions,
+                    pool=partition_pool,
+                    chunk_rows=chunk_rows
+                )
+                futures[future] = t
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # popped, so a finished result is freed once the consumer drops it
+                    task = futures.pop(future)
+                    try:
+                        result, seconds = future.result()
+                    except _CheckTimedOut:
+                        abandoned.append(task)
+                        result, seconds = _timed_out(task), task.fn.timeout
+                    self._done(task, seconds)
+                    yield task, result
+
+
+class ProcessExecutor(Executor):
+    """runs the tasks on a process pool, so CPU heavy Python checks aren't held back by the GIL.
+
+    Rather than pickling `DataSource.value` for every task, the columns the alias map needs are
+    copied into shared memory once per source (see `SharedFrame`). Workers attach to them and
+    rebuild a read-only DataFrame on top of the buffers. The segments are always freed when `map`
+    finishes, fails, or is closed early.
+
+    Checks with an `Fn.timeout` each run on a process of their own, next to the pool (at most
+    `workers` of them at a time), so one that runs over can be killed without taking the pool down.
+
+    With a `memory_limit`, tasks are only handed to the pool while their estimates fit within it,
+    so the workers don't all pick up a large check at once.
+
+    Checks must be picklable, so define them at module level (not as lambdas).
+    """
+
+    def __init__(
+            self,
+            max_workers: int | None = None,
+            mp_context: BaseContext | None = None,
+            history: TimingHistory | None = None,
+            memory_limit: int | None = None,
+    ):
+        """
+        :param max_workers: the number of worker processes. Defaults to the number of CPUs.
+        :param mp_context: the multiprocessing context used to start the workers.
+        :param history: the past runtimes to order the tasks by.
+        :param memory_limit: the memory budget of the running tasks in bytes.
+        """
+        super().__init__(history=history, memory_limit=memory_limit)
+        self.max_workers = max_workers
+        self.mp_context = mp_context
+
+    @property
+    def workers(self) -> int:
+        return self.max_workers or os.cpu_count() or 1
+
+    def map(
+            self,
+            alias_map: AliasMap,
+            tasks: Iterable[Task],
+            raise_missing: bool = False,
+    ) -> Iterator[tuple[Task, Result]]:
+        tasks = self.schedule(tasks)
+        with ExitStack() as stack:
+            # === Share each DataFrame once ===
+            # by the DataFrame, not `DataSource.key`, since a gated task holds only some rows of its source
+            frames: dict[int, SharedFrame] = {}
+            for task in tasks:
+                if id(task.data.data) not in frames:
+                    shared = SharedFrame.create(needed_columns(alias_map, task.data))
+                    frames[id(task.data.data)] = stack.enter_context(shared)
+
+            # entered after the frames, so the pool shuts down before the segments are unlinked
+            pool = stack.enter_context(
+                ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context)
+            )
+            # (task, bytes, chunk_rows), handed out while they fit within the memory budget
+            pooled = [(t, *self._estimate(alias_map, t)) for t in tasks if t.fn.timeout is None]
+            waiting = [(t, *self._estimate(alias_map, t)) for t in tasks if t.fn.timeout is not None]
+            futures = {}
+            reserved: dict[Task, int] = {}
+            running: dict[Connection, tuple[Task, BaseProcess, float]] = {}
+            stack.callback(_kill_all, running)
+            context = self.mp_context or multiprocessing.get_context()
+
+            try:
+                while pooled or futures or waiting or running:
+                    while pooled and self._admit(reserved, *pooled[0][:2]):
+                        task, _, chunk_rows = pooled.pop(0)
+                        frame = frames[id(task.data.data)]
+                        args = (alias_map, frame, task.data.name, task.fn, raise_missing, chunk_rows)
+                        future = pool.submit(_timed, _run_shared, *args, _profiles(alias_map, task))
+                        futures[future] = task
+
+                    while waiting and len(running) < self.workers and self._admit(reserved, *waiting[0][:2]):
+                        task, _, chunk_rows = waiting.pop(0)
+                        receiver, sender = context.Pipe(duplex=False)
+                        frame = frames[id(task.data.data)]
+                        args = (alias_map, frame, task.data.name, task.fn, raise_missing, chunk_rows)
+                        args += (_profiles(alias_map, task),)
+                        process = context.Process(target=_run_isolated, args=(sender, *args), daemon=True)
+                        process.start()
+                        sender.close()
+                        running[receiver] = (task, process, time.perf_counter())
+
+                    if futures:
+                        timeout = _POLL_SECONDS if running else None
+                        done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+                    else:
+                        done = ()
+                        connection_wait(list(running), timeout=_POLL_SECONDS)
+
+                    for future in done:
+                        # popped, so a finished result is freed once the consumer drops it
+                        task = futures.pop(future)
+                        result, seconds = future.result()
+                        self._release(reserved, task)
+                        self._done(task, seconds)
+                        yield task, result
+
+                    now = time.perf_counter()
+                    for receiver, (task, process, start) in list(running.items()):
+                        if receiver.poll():
+                            del running[receiver]
+                            result, seconds = _receive(receiver, task)
+                            process.join()
+                        elif now - start > task.fn.timeout:
+                            del running[receiver]
+                            process.kill()
+                            process.join()
+                            receiver.close()
+                            result, seconds = _timed_out(task), now - start
+                        else:
+                            continue
+                        self._release(reserved, task)
+                        self._done(task, seconds)
+                        yield task, result
+            except BaseException:
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+            finally:
+                for task in list(reserved):
+                    self._release(reserved, task)
+
+    def _estimate(self, alias_map: AliasMap, task: Task) -> tuple[int, int | None]:
+        """returns (bytes, chunk_rows) of the task, see `MemoryGovernor.plan`."""
+        if self.governor is None:
+            return 0, None
+        return self.governor.plan(alias_map, task.fn, task.data)
+
+    def _admit(self, reserved: dict[Task, int], task: Task, n_bytes: int) -> bool:
+        """reserves the bytes of the task if they fit. Always True without a memory budget."""
+        if self.governor is None:
+            return True
+        if not self.governor.try_acquire(n_bytes):
+            return False
+        reserved[task] = n_bytes
+        return True
+
+    def _release(self, reserved: dict[Task, int], task: Task) -> None:
+        if task in reserved:
+            self.governor.release(reserved.pop(task))
+
+
+def schedule_tasks(tasks: Iterable[Task], history: TimingHistory, workers: int, quick: float = 0.05) -> list[Task]:
+    """orders the tasks by their expected runtime.
+
+    On a single worker the order doesn't change when the run ends, so the shortest tasks go first
+    and results come in as early as possible. On several workers, the tasks known to take under
+    `quick` seconds still go first, for early feedback, and the rest go longest first (LPT), so
+    a long task doesn't start last and hold up the end of the run. Tasks that never ran count as
+    the longest, since nothing is known about them.
+
+    :param tasks: the tasks to order.
+    :param history: the past runtimes.
+    :param workers: the number of tasks that run at the same time.
+    :param quick: the runtime in seconds under which a task counts as cheap.
+    :return: the tasks in the order they should start. Ties keep their given order.
+    """
+    estimates = [(t, history.estimate(t.fn, t.data)) for t in tasks]
+    unknown = float("inf")
+    if workers <= 1:
+        return [t for t, e in sorted(estimates, key=lambda te: unknown if te[1] is None else te[1])]
+
+    cheap = sorted(((t, e) for t, e in estimates if e is not None and e < quick), key=lambda te: te[1])
+    rest = sorted(((t, e) for t, e in estimates if e is None or e >= quick), key=lambda te: -(te[1] or unknown))
+    return [t for t, _ in cheap + rest]
+
+
+def needed_columns(alias_map: AliasMap, data: DataSource) -> pd.DataFrame:
+    """returns the part of the DataSource the alias map can reach, without copying it.
+
+    :param alias_map: the AliasMap used by the pipeline.
+    :param data: the DataSource to trim down.
+    :return: pd.DataFrame, only the aliased columns. Has no columns if none matched.
+    """
+    found = alias_map.check_columns(columns=data.columns, match_column=True)
+    columns: Collection = found.unwrap_or([])
+    return data.data[[c for c in data.columns if c in columns]]
+
+
+def _timed(fn, /, *args, **kwargs) -> tuple[Result, float]:
+    """calls `fn`, returning its result with the seconds it took. Runs where the task runs."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+_POLL_SECONDS = 0.05
+"""how often to look at the clock while checks with a timeout run."""
+
+
+def _timed_out(task: Task) -> Err:
+    return Err(TimedOut(f"`{task.fn.name}` timed out after {task.fn.timeout}s on {task.data.name}."))
+
+
+def _reserved(reservation: AbstractContextManager, fn, /, *args, **kwargs) -> tuple[Result, float]:
+    """`_timed` within the task's memory reservation, which can hold the task back."""
+    with reservation:
+        return _timed(fn, *args, **kwargs)
+
+
+class _CheckTimedOut(Exception):
+    """raised by `_call_with_timeout`, apart from any TimeoutError the check raises itself."""
+
+
+def _call_with_timeout(timeout: float, fn, /, *args, **kwargs):
+    """calls `fn` on a daemon thread and waits up to `timeout` seconds for it.
+
+    :raises _CheckTimedOut: when `fn` didn't finish in time. The thread is left running.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome["value"] = fn(*args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise _CheckTimedOut(f"No result after {timeout}s.")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
+
+
+def _run_isolated(conn: Connection, *args) -> None:
+    """process side of a check with a timeout. Sends back (True, (result, seconds)) or (False, exception)."""
+    try:
+        conn.send((True, _timed(_run_shared, *args)))
+    except BaseException as e:
+        conn.send((False, e))
+    finally:
+        conn.close()
+
+
+def _receive(receiver: Connection, task: Task) -> tuple[Result, float]:
+    try:
+        ok, payload = receiver.recv()
+    except EOFError:  # the process died before sending anything
+        return Err(f"The process running `{task.fn.name}` on {task.data.name} died."), 0.0
+    finally:
+        receiver.close()
+    if not ok:
+        raise payload
+    return payload
+
+
+def _kill_all(running: dict) -> None:
+    """kills the processes of the checks still running when `map` stops early."""
+    for receiver, (_, process, _) in running.items():
+        process.kill()
+        process.join()
+        receiver.close()
+    running.clear()
+
+
+def _profiles(alias_map: AliasMap, task: Task) -> dict | None:
+    """the column profiles a check on column statistics needs, computed in the parent rather than once per task."""
+    if task.fn.profile_param is None:
+        return None
+    alias_map.profile(task.data)
+    return task.data.known_profiles()
+
+
+_ATTACHED: dict[tuple, tuple[SharedFrame, pd.DataFrame]] = {}
+"""per worker process cache of attached frames, so each source is only attached once."""
+
+
+def _run_shared(
+        alias_map: AliasMap,
+        frame: SharedFrame,
+        name: str,
+        fn: Fn,
+        raise_missing: bool,
+        chunk_rows: int | None = None,
+        profiles: dict | None = None,
+) -> Result:
+    """worker side of the ProcessExecutor. Attaches to the shared columns and runs the check.
+
+    `profiles` are the column profiles of the source, computed once in the parent, see `_profiles`.
+    """
+    cache_key = (name, frame.segment_names)
+    if cache_key not in _ATTACHED:
+        # the SharedFrame is kept with the DataFrame, so the segments stay mapped
+        _ATTACHED[cache_key] = (frame, frame.attach())
+    _, df = _ATTACHED[cache_key]
+    data = DataSource(name, df)
+    data.keep_profiles(profiles or {})
+    return PipeMixin.run(
+        alias_map=alias_map,
+        data=data,
+        fn=fn,
+        raise_missing=raise_missing,
+        chunk_rows=chunk_rows
+    )
@@ -0,0 +1,195 @@
+"""module for parsing check expressions like `price <= cool_price * 1.5` into vectorized column operations"""
+import ast
+import operator
+
+import numpy as np
+import pandas as pd
+
+FUNCTIONS = {
+    "abs": np.abs,
+    "isna": pd.isna,
+    "notna": pd.notna,
+}
+"""the functions an expression can call, each working on a whole column at once."""
+
+_ALLOWED = (
+    ast.Expression, ast.Name, ast.Load, ast.Constant, ast.Tuple, ast.List,
+    ast.BoolOp, ast.And, ast.Or,
+    ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn,
+    ast.Call,
+)
+
+
+class CompiledExpression:
+    """a check expression, parsed and validated once, and compiled into one code object.
+
+    The expression is plain Python syntax over alias map parameters: arithmetic, comparisons
+    (chained too), `and`/`or`/`not`, `in` a tuple of constants, and the calls in `FUNCTIONS`.
+    The boolean operators are rewritten into their element-wise forms, so evaluating the code
+    once on whole NumPy columns gives the verdict of every row. Missing values fail comparisons.
+
+    The code object is left out when pickled, and compiled again on the other side.
+    """
+
+    def __init__(self, source: str):
+        """
+        :param source: the expression.
+        :raises SyntaxError: when the source isn't a single Python expression.
+        :raises ValueError: when it uses anything but the syntax above.
+        """
+        self.source = source.strip()
+        tree = ast.parse(self.source, mode="eval")
+        self.params = _validate(tree, self.source)
+        """the alias map parameters the expression reads, in order of appearance."""
+        self._code = _compile(tree, self.source)
+
+    def __getstate__(self) -> dict:
+        return {"source": self.source}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["source"])
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.source!r})"
+
+    def evaluate(self, *columns: pd.Series) -> pd.Series:
+        """evaluates the expression on `columns`, given in the order of `params`.
+
+        :return: pd.Series of bool, on the index of the first column.
+        """
+        values = {p: _values(c) for p, c in zip(self.params, columns)}
+        namespace = {**FUNCTIONS, **_HELPERS, **values}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = eval(self._code, {"__builtins__": {}}, namespace)
+        result = np.broadcast_to(np.asarray(result), len(columns[0]) if columns else 1)
+        index = columns[0].index if columns else None
+        return pd.Series(result.astype(bool), index=index)
+
+
+def _values(column: pd.Series) -> np.ndarray:
+    """the column as an array. Nullable dtypes turn their NA into NaN, which fails comparisons."""
+    if not isinstance(column.dtype, pd.api.extensions.ExtensionDtype):
+        return column.to_numpy()
+    if column.dtype.kind in "iufb":
+        return column.to_numpy(dtype=float, na_value=np.nan)
+    return column.to_numpy(dtype=object, na_value=np.nan)
+
+
+def _validate(tree: ast.Expression, source: str) -> tuple[str, ...]:
+    """checks the syntax of the expression, and returns the parameters it reads."""
+    params = []
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED):
+            raise ValueError(f"`{type(node).__name__}` isn't allowed in the check expression `{source}`.")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+                raise ValueError(f"Only the calls {sorted(FUNCTIONS)} are allowed in `{source}`.")
+            if len(node.args) != 1:
+                raise ValueError(f"`{node.func.id}` takes one argument, in `{source}`.")
+        elif isinstance(node, ast.Compare):
+            for op, right in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.NotIn)) and not _is_constants(right):
+                    raise ValueError(f"`in` needs a tuple of constants, in `{source}`.")
+    calls = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and id(node) not in calls:
+            if node.id.startswith("_"):
+                raise ValueError(f"`{node.id}` can't be a parameter, in `{source}`.")
+            params.append(node.id)
+    if not params:
+        raise ValueError(f"The check expression `{source}` doesn't read any column.")
+    return tuple(dict.fromkeys(params))
+
+
+def _is_constants(node: ast.AST) -> bool:
+    return isinstance(node, (ast.Tuple, ast.List)) and all(isinstance(e, ast.Constant) for e in node.elts)
+
+
+def _compile(tree: ast.Expression, source: str):
+    tree = ast.fix_missing_locations(_Vectorize().visit(tree))
+    return compile(tree, f"<check {source}>", "eval")
+
+
+class _Vectorize(ast.NodeTransformer):
+    """rewrites the boolean operators, which work on single values, into element-wise ones."""
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        result = _as_bool(node.values[0])
+        for value in node.values[1:]:
+            result = ast.BinOp(left=result, op=op, right=_as_bool(value))
+        return result
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.UnaryOp(op=ast.Invert(), operand=_as_bool(node.operand))
+        return node
+
+    def visit_Compare(self, node: ast.Compare) -> ast.AST:
+        self.generic_visit(node)
+        # a < b < c is (a < b) & (b < c)
+        parts = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)):
+                call = ast.Call(func=ast.Name(id="_isin", ctx=ast.Load()), args=[left, right], keywords=[])
+                parts.append(call if isinstance(op, ast.In) else ast.UnaryOp(op=ast.Invert(), operand=call))
+            elif type(op).__name__ in _ORDERINGS:
+                args = [left, ast.Constant(type(op).__name__), right]
+                parts.append(ast.Call(func=ast.Name(id="_ordered", ctx=ast.Load()), args=args, keywords=[]))
+            else:
+                parts.append(ast.Compare(left=left, ops=[op], comparators=[right]))
+            left = right
+        result = parts[0]
+        for part in parts[1:]:
+            result = ast.BinOp(left=result, op=ast.BitAnd(), right=part)
+        return result
+
+
+def _as_bool(node: ast.AST) -> ast.AST:
+    return ast.Call(func=ast.Name(id="_as_bool", ctx=ast.Load()), args=[node], keywords=[])
+
+
+def _isin(values, allowed) -> np.ndarray:
+    return pd.Series(values).isin(allowed).to_numpy() if np.ndim(values) else np.asarray(values in allowed)
+
+
+_ORDERINGS = {"Lt": operator.lt, "LtE": operator.le, "Gt": operator.gt, "GtE": operator.ge}
+
+
+def _ordered(left, op: str, right) -> np.ndarray:
+    """`left op right` for an ordering comparison, False where either side is missing.
+
+    Numbers compare NaN as False by themselves. Object values, like strings, are compared where
+    both sides are there, since their missing values can't be ordered against anything.
+    """
+    compare = _ORDERINGS[op]
+    left, right = np.asarray(left), np.asarray(right)
+    if left.dtype != object and right.dtype != object:
+        return compare(left, right)
+    left, right = np.broadcast_arrays(left, right)
+    present = ~(pd.isna(left) | pd.isna(right))
+    result = np.zeros(left.shape, dtype=bool)
+    result[present] = compare(left[present], right[present])
+    return result
+
+
+def _bool_values(values) -> np.ndarray:
+    """the truth of each value, with missing values as False."""
+    values = np.asarray(values)
+    if values.dtype == bool:
+        return values
+    if values.dtype.kind in "iuf":
+        return np.nan_to_num(values) != 0
+    return pd.notna(values) & values.astype(bool)
+
+
+_HELPERS = {
+    "_isin": _isin,
+    "_ordered": _ordered,
+    "_as_bool": _bool_values,
+}
@@ -0,0 +1,77 @@
+"""module for running checks group by group, on the groups of a key column"""
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from tempcli.core.components.data import DataSource
+from tempcli.core.support.cache import FrameCache
+
+
+@dataclass(frozen=True, eq=False)
+class Groups:
+    """the groups of the rows of a DataSource, from one sort of its key columns.
+
+    Group numbers follow the order each key first appears in. Within a group, rows keep their
+    order. Rows with a missing key form a group of their own.
+
+    A check with a parameter annotated `Groups` gets this instead of being called once per group,
+    so it can work on every group at once, e.g. with `np.bincount(groups.codes, weights=...)`.
+
+    `codes`: np.ndarray, the group number of each row, in row order.
+
+    `order`: np.ndarray, the rows sorted by group.
+
+    `starts`: np.ndarray, where each group starts in `order`, followed by the number of rows.
+    """
+    codes: np.ndarray
+    order: np.ndarray
+    starts: np.ndarray
+
+    @classmethod
+    def from_keys(cls, keys: pd.DataFrame) -> "Groups":
+        """groups the rows of `keys` on all of its columns."""
+        codes = keys.groupby(list(keys.columns), sort=False, dropna=False).ngroup().to_numpy()
+        order = np.argsort(codes, kind="stable")
+        sizes = np.bincount(codes, minlength=codes.max() + 1 if len(codes) else 0)
+        starts = np.concatenate([[0], np.cumsum(sizes)])
+        return cls(codes=codes, order=order, starts=starts)
+
+    def __len__(self) -> int:
+        return len(self.starts) - 1
+
+    @property
+    def sizes(self) -> np.ndarray:
+        """returns the number of rows in each group."""
+        return np.diff(self.starts)
+
+    def slices(self) -> Iterator[tuple[int, int]]:
+        """yields the (start, stop) range of each group in `order`."""
+        return zip(self.starts[:-1].tolist(), self.starts[1:].tolist())
+
+    def sort(self, values: np.ndarray) -> np.ndarray:
+        """returns the row values in group order."""
+        return values[self.order]
+
+    def unsort(self, values: np.ndarray) -> np.ndarray:
+        """returns values in group order back in row order."""
+        out = np.empty(values.shape, dtype=values.dtype)
+        out[self.order] = values
+        return out
+
+    def first(self, values: np.ndarray) -> np.ndarray:
+        """returns the value of the first row of each group."""
+        return values[self.order[self.starts[:-1]]]
+
+    def broadcast(self, per_group: np.ndarray) -> np.ndarray:
+        """returns the value of each row's group, from one value per group."""
+        return np.asarray(per_group)[self.codes]
+
+
+class GroupCache(FrameCache):
+    """the groups of a pipeline's DataSources, shared by every check grouping on the same key."""
+
+    def groups(self, data: DataSource, columns: tuple[str, ...]) -> Groups:
+        """returns the groups of `data` on the key `columns`."""
+        return self.get(data.data, columns, lambda df: Groups.from_keys(df[list(columns)]))
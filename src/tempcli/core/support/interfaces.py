@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from uuid import UUID, uuid5
 
+import numpy as np
 import pandas as pd
 
 from tempcli.config import TEMPCLI_NAMESPACE
@@ -20,12 +21,26 @@ class FnResult:
         `args`: [optional] the arguments passed to the function. We want this to be a tuple.
 
         `kwargs`: [optional] the keyword arguments passed to the function. We want this to be a dict.
+
+        `call_key`: [optional] the UUID of the `Fn.__call__` that produced the result.
+
+        `rows`: [optional] the source row positions `result` covers, when the check only ran on some rows.
+
+        `stopped`: [optional] whether the check stopped early on its failure budget, so `result`
+        only covers the first rows.
+
+        `output`: [optional] the name of the output `result` is, for checks returning several verdict
+        columns at once. Named `<check>.<output>` in the run summary.
     """
     result: pd.Series
     fn_used: str
     data_name: str = None
     args: tuple = None
     kwargs: dict = None
+    call_key: UUID = None
+    stopped: bool = False
+    rows: np.ndarray = None
+    output: str = None
 
     _FN_RESULT_NAMESPACE: UUID = field(init=False)
 
@@ -55,6 +70,8 @@ class FnResult:
             combined_s.append(k_s)
         if self.data_name:
             combined_s.append(self.data_name)
+        if self.output:
+            combined_s.append(self.output)
 
         string_key = "|".join(str(c) for c in combined_s)
         return uuid5(class_namespace, string_key)
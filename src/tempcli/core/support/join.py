@@ -0,0 +1,140 @@
+"""module for binding check parameters to the columns of another DataSource, through a join key"""
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from tempcli.core.components.data import DataSource
+
+
+@dataclass(frozen=True, eq=False)
+class Join:
+    """binds a check parameter to a column of another DataSource, looked up on a shared key.
+
+    For each row of the DataSource the check runs on, the value comes from the first row of
+    `source` with the same key, or is missing when there is none::
+
+        Fn(price_near_reference, joins={"ref_price": Join(reference_prices, column="price", on="iid")})
+
+    `source`: DataSource, the other source, e.g. a reference price table.
+
+    `column`: str, the alias map parameter of the column to take from `source`.
+
+    `on`: str, the alias map parameter of the key, resolved in both sources.
+
+    Every copy of a Join unpickled in a process is the same Join, by `token`, so the tasks a worker
+    process runs share its source, and the join indexes built on it, see `WORKER_JOINS`.
+    """
+    source: DataSource
+    column: str
+    on: str
+    token: uuid.UUID = field(init=False, default_factory=uuid.uuid4, repr=False)
+    """identifies the Join across processes."""
+
+    def __reduce__(self):
+        return _unpickled_join, (self.source, self.column, self.on, self.token)
+
+
+UNPICKLED_JOINS = 16
+"""the most Joins a worker process keeps between tasks, with the indexes built on their sources."""
+
+_UNPICKLED: OrderedDict[uuid.UUID, Join] = OrderedDict()
+"""the Joins unpickled in this process, by token, most recently used last."""
+_UNPICKLED_LOCK = threading.Lock()
+
+
+def _unpickled_join(source: DataSource, column: str, on: str, token: uuid.UUID) -> Join:
+    """returns the Join of `token` in this process, unpickled once."""
+    with _UNPICKLED_LOCK:
+        join = _UNPICKLED.get(token)
+        if join is None:
+            join = Join(source, column, on)
+            object.__setattr__(join, "token", token)
+            _UNPICKLED[token] = join
+        _UNPICKLED.move_to_end(token)
+        while len(_UNPICKLED) > UNPICKLED_JOINS:
+            _UNPICKLED.popitem(last=False)
+        return join
+
+
+class JoinCache:
+    """the join indexes of a pipeline, shared by every check and task that uses them.
+
+    The index of a (DataSource, key column) pair maps each key to its first row, and is only built
+    once. So are the row positions that line one source up with another on a key. Sources are told
+    apart by their DataFrame, not their name, and entries go once the DataFrame is freed.
+    """
+
+    def __init__(self):
+        self._indexes: dict[tuple, tuple[weakref.ref, pd.Index, np.ndarray]] = {}
+        self._positions: dict[tuple, tuple[weakref.ref, weakref.ref, np.ndarray]] = {}
+        # reentrant, since a DataFrame can be freed (and forgotten) while the lock is held
+        self._lock = threading.RLock()
+        self.builds = 0
+        """the number of indexes built, for telling whether the cache was used."""
+
+    def index(self, data: DataSource, column: str) -> tuple[pd.Index, np.ndarray]:
+        """returns (the unique keys of `column`, the row each key first appears on)."""
+        df = data.data
+        cache_key = (id(df), column)
+        with self._lock:
+            cached = self._indexes.get(cache_key)
+            if cached is not None and cached[0]() is df:
+                return cached[1], cached[2]
+
+            keys = pd.Index(df[column].to_numpy())
+            first = ~keys.duplicated(keep="first")
+            index, rows = keys[first], np.flatnonzero(first)
+            self._indexes[cache_key] = (weakref.ref(df, self._forget), index, rows)
+            self.builds += 1
+            return index, rows
+
+    def positions(self, data: DataSource, key: str, other: DataSource, other_key: str) -> np.ndarray:
+        """returns, for each row of `data`, the row of `other` with the same key, or -1 when there is none."""
+        df, other_df = data.data, other.data
+        cache_key = (id(df), key, id(other_df), other_key)
+        with self._lock:
+            cached = self._positions.get(cache_key)
+            if cached is not None and cached[0]() is df and cached[1]() is other_df:
+                return cached[2]
+
+        index, rows = self.index(other, other_key)
+        hits = index.get_indexer(df[key].to_numpy())
+        positions = np.where(hits >= 0, rows[hits], -1)
+        with self._lock:
+            self._positions[cache_key] = (weakref.ref(df, self._forget), weakref.ref(other_df, self._forget), positions)
+        return positions
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+            self._positions.clear()
+
+    def _forget(self, ref: weakref.ref) -> None:
+        """drops the entries of a freed DataFrame."""
+        with self._lock:
+            for cache_key in [k for k, v in self._indexes.items() if v[0] is ref]:
+                del self._indexes[cache_key]
+            for cache_key in [k for k, v in self._positions.items() if v[0] is ref or v[1] is ref]:
+                del self._positions[cache_key]
+
+
+WORKER_JOINS = JoinCache()
+"""the join indexes of every AliasMap unpickled in this process, so the tasks a worker process runs
+build them once rather than once per task. Entries go with their DataFrames, as in any JoinCache,
+so with the unpickled Joins holding them."""
+
+
+def take(column: pd.Series, positions: np.ndarray, index: pd.Index) -> pd.Series:
+    """returns the values of `column` at `positions`, missing where the position is -1, on `index`."""
+    found = positions >= 0
+    if found.all():
+        values = column.iloc[positions]
+    else:
+        # reindexing with -1 labels gives a missing value in the column's own missing type
+        values = column.reset_index(drop=True).reindex(positions)
+    return pd.Series(values.to_numpy(), index=index, name=column.name)
@@ -1,5 +1,6 @@
 """module for the manager object handling the orchestration of the 3 main components"""
 from collections.abc import Collection
+from concurrent.futures import Executor as PoolExecutor
 
 from tempcli.core.components.alias_map import AliasMap
 from tempcli.core.components.data import DataSource
@@ -16,7 +17,10 @@ class PipeMixin:
             alias_map: AliasMap,
             data: DataSource,
             fn: Fn,
-            raise_missing: bool = False
+            raise_missing: bool = False,
+            partitions: int = 1,
+            pool: PoolExecutor | None = None,
+            chunk_rows: int | None = None,
     ) -> Result:
         """
 
@@ -24,9 +28,19 @@ class PipeMixin:
         :param data:
         :param fn:
         :param raise_missing:
+        :param partitions: the number of row partitions for `row_local` functions.
+        :param pool: the pool running the row partitions.
+        :param chunk_rows: the most rows a `row_local` function sees at once.
         :return:
         """
-        result = alias_map.generate_results(data=data, fn=fn, raise_missing=raise_missing)
+        result = alias_map.generate_results(
+            data=data,
+            fn=fn,
+            raise_missing=raise_missing,
+            partitions=partitions,
+            pool=pool,
+            chunk_rows=chunk_rows
+        )
         if result.is_err():
             if raise_missing:
                 raise result.unwrap_err()
@@ -0,0 +1,220 @@
+"""module for keeping the checks of a run within a memory budget"""
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import pandas as pd
+
+from tempcli.core.components.alias_map import AliasMap
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.types.alias import Many, One
+
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
+
+OBJECT_BYTES = 64
+"""the assumed size of one python object value (a short str, a boxed number) in an object column."""
+
+RECORD_BYTES = 232
+"""the assumed size of one row record dict handed to a scalar function, before its values."""
+
+
+def bound_columns(alias_map: AliasMap, fn: Fn, data: DataSource) -> list[str]:
+    """returns the columns of `data` that the parameters of `fn` are bound to."""
+    columns = []
+    for param in fn.signature.parameters:
+        alias = alias_map.p.get(param)
+        if isinstance(alias, One):
+            columns.append(alias.alias)
+        elif isinstance(alias, Many):
+            columns.extend(alias.aliases)
+    present = set(data.columns)
+    return [c for c in dict.fromkeys(columns) if c in present]
+
+
+def column_bytes(column: pd.Series) -> int:
+    """estimates the bytes of a column from its dtype, without reading object values."""
+    if column.dtype == object or isinstance(column.dtype, pd.StringDtype):
+        return len(column) * (OBJECT_BYTES + 8)
+    return int(column.memory_usage(index=False, deep=False))
+
+
+def estimate_task_bytes(alias_map: AliasMap, fn: Fn, data: DataSource) -> int:
+    """estimates the extra memory a check takes while it runs on a data source.
+
+    A rough model from the dtypes and the row count, never from the values:
+
+    - pd.Series checks get views of the columns, so the inputs are free. Each bound column is
+      taken to make one 8 byte temporary per row, plus the result.
+    - Scalar checks copy their columns into a frame and turn it into one record dict per row,
+      plus a python object per result value.
+    - Grid checks hold a result per grid point.
+    - Grouped checks also hold their columns in group order, and the group number and order of each row.
+    - Windowed checks also hold the date order, and a statistic per bound column.
+
+    :return: the estimated bytes. At least 1.
+    """
+    if data.value is None:
+        return 1
+    n_rows = len(data.value)
+    columns = bound_columns(alias_map, fn, data)
+    points = max(1, len(fn.grid_points))
+    if fn.has_scalar_params:
+        inputs = sum(column_bytes(data.value[c]) for c in columns)
+        records = n_rows * (RECORD_BYTES + (OBJECT_BYTES + 8) * len(columns))
+        return max(1, inputs + records + points * n_rows * (OBJECT_BYTES + 8))
+    grouped = n_rows * 8 * (len(columns) + 2) if fn.group_by is not None or fn.window is not None else 0
+    return max(1, n_rows * 8 * points * (len(columns) + 1) + grouped)
+
+
+class MemoryGovernor:
+    """admits the tasks of a run so that their estimated working sets stay within `limit` bytes.
+
+    Each task reserves its estimate (see `estimate_task_bytes`) while it runs, and waits while
+    the reservations of the running tasks leave no room for it. Every worker gets a fair share of
+    the limit: a `row_local` check whose estimate is over the share is cut into row chunks that fit
+    in it, and any other check over it is admitted alone once enough of the limit is free. A check
+    over the whole limit runs with nothing else next to it.
+
+    `track` reports what was reserved and the resident memory actually used, see `report`.
+    """
+
+    def __init__(self, limit: int, workers: int = 1):
+        """
+        :param limit: the memory budget in bytes.
+        :param workers: the tasks that can run at once, used for each worker's share of the limit.
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be at least 1 byte, got {limit}")
+        self.limit = limit
+        self.workers = max(1, workers)
+        self.in_use = 0
+        self.peak_reserved = 0
+        self.peak_rss = 0
+        self.chunked: set[str] = set()
+        self._condition = threading.Condition()
+
+    def plan(self, alias_map: AliasMap, fn: Fn, data: DataSource) -> tuple[int, int | None]:
+        """returns (bytes to reserve, chunk_rows) for running `fn` on `data`.
+
+        Row-local and windowed checks that don't fit in a worker's share of the limit run in chunks.
+
+        :return: chunk_rows is None when the check runs on every row at once.
+        """
+        estimate = estimate_task_bytes(alias_map, fn, data)
+        share = self.limit // self.workers
+        if estimate <= share:
+            return estimate, None
+        n_rows = 0 if data.value is None else len(data.value)
+        if (fn.row_local and fn.grid is None and fn.group_by is None or fn.window is not None) and n_rows > 1:
+            chunk_rows = max(1, int(n_rows * share / estimate))
+            self.chunked.add(fn.name)
+            return max(1, estimate * chunk_rows // n_rows), chunk_rows
+        return min(estimate, self.limit), None
+
+    def try_acquire(self, n_bytes: int) -> bool:
+        """reserves `n_bytes` if they fit, or if nothing else is reserved. Never waits."""
+        with self._condition:
+            if self.in_use and self.in_use + n_bytes > self.limit:
+                return False
+            self.in_use += n_bytes
+            self.peak_reserved = max(self.peak_reserved, self.in_use)
+            return True
+
+    def release(self, n_bytes: int) -> None:
+        with self._condition:
+            self.in_use -= n_bytes
+            self._condition.notify_all()
+
+    @contextmanager
+    def reserve(self, n_bytes: int) -> Iterator[None]:
+        """waits until `n_bytes` fit within the limit, and holds them until the block ends."""
+        with self._condition:
+            self._condition.wait_for(lambda: not self.in_use or self.in_use + n_bytes <= self.limit)
+            self.in_use += n_bytes
+            self.peak_reserved = max(self.peak_reserved, self.in_use)
+        try:
+            yield
+        finally:
+            self.release(n_bytes)
+
+    @contextmanager
+    def track(self, interval: float = 0.01) -> Iterator["MemoryGovernor"]:
+        """resets the peaks, then samples the resident memory of this process and its children
+        every `interval` seconds until the block ends."""
+        self.peak_reserved = 0
+        self.peak_rss = current_rss()
+        self.chunked = set()
+        stop = threading.Event()
+
+        def sample():
+            while not stop.wait(interval):
+                self.peak_rss = max(self.peak_rss, current_rss())
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        try:
+            yield self
+        finally:
+            stop.set()
+            sampler.join()
+            self.peak_rss = max(self.peak_rss, current_rss())
+
+    def report(self) -> dict:
+        """returns the budget, the peak bytes reserved at once, the peak resident memory of the run
+        and the checks that were cut into chunks to fit."""
+        return {
+            "limit": self.limit,
+            "peak_reserved": self.peak_reserved,
+            "peak_rss": self.peak_rss,
+            "chunked": sorted(self.chunked),
+        }
+
+
+def current_rss() -> int:
+    """returns the resident bytes of this process and its child processes (the ProcessExecutor workers).
+
+    Read from /proc where there is one. Elsewhere, falls back to the peak resident size of this
+    process, which is the best the standard library offers.
+    """
+    pid = os.getpid()
+    children = _children(pid)
+
+    page = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+    total = 0
+    for p in [pid] + children:
+        try:
+            with open(f"/proc/{p}/statm") as f:
+                total += int(f.read().split()[1]) * page
+        except (OSError, IndexError, ValueError):  # a child that just exited, or no /proc
+            if p == pid and resource is not None:
+                total += resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return total
+
+
+def _children(pid: int) -> list[int]:
+    """the pids of the child processes of `pid`, from /proc. Empty where there is no /proc."""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(c) for c in f.read().split()]
+    except OSError:
+        pass
+    # kernels without the children file: find them by their parent pid
+    children = []
+    try:
+        entries = [e.name for e in os.scandir("/proc") if e.name.isdigit()]
+    except OSError:
+        return children
+    for name in entries:
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                # the parent pid is the 2nd field after the `(command name)`, which can hold spaces
+                if int(f.read().rsplit(")", 1)[1].split()[1]) == pid:
+                    children.append(int(name))
+        except (OSError, IndexError, ValueError):
+            continue
+    return children
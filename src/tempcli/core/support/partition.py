@@ -0,0 +1,59 @@
+"""module for splitting bound function arguments into row partitions"""
+import numpy as np
+import pandas as pd
+
+
+def row_partitions(n_rows: int, partitions: int) -> list[tuple[int, int]]:
+    """splits `n_rows` into contiguous (start, stop) row ranges of near equal size.
+
+    :param n_rows: the number of rows to split.
+    :param partitions: the number of ranges wanted. Capped at `n_rows`.
+    :return: list of (start, stop) tuples, in row order.
+    """
+    partitions = max(1, min(partitions, n_rows))
+    bounds = np.linspace(0, n_rows, partitions + 1, dtype=np.int64)
+    return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def group_length(arg: pd.DataFrame | list | dict) -> int:
+    """returns the number of rows in a group of bound arguments.
+
+    A group is either a DataFrame with a column per parameter or a list of row records
+    (scalar functions), or a `parameter: pd.Series` dict (pd.Series functions).
+    """
+    if isinstance(arg, (pd.DataFrame, list)):
+        return len(arg)
+    return len(next(iter(arg.values()))) if arg else 0
+
+
+def slice_group(arg: pd.DataFrame | list | dict, start: int, stop: int) -> pd.DataFrame | list | dict:
+    """returns rows [start, stop) of a group of bound arguments. Frames and Series are sliced as views,
+    and other arguments, like a `Profile` of the whole columns, are passed as they are."""
+    if isinstance(arg, pd.DataFrame):
+        return arg.iloc[start:stop]
+    if isinstance(arg, list):
+        return arg[start:stop]
+    return {p: s.iloc[start:stop] if isinstance(s, pd.Series) else s for p, s in arg.items()}
+
+
+def concat_parts(parts: list, scalar: bool):
+    """joins the partial results of a partitioned function back together, in order.
+
+    :param parts: the partial results, in row order.
+    :param scalar: whether the parts came from a scalar function, where each part has its own 0..n index.
+    """
+    if all(isinstance(p, (pd.Series, pd.DataFrame)) for p in parts):
+        return pd.concat(parts, ignore_index=scalar)
+    return np.concatenate([np.atleast_1d(np.asarray(p)) for p in parts])
+
+
+def row_chunks(n_rows: int, chunk_rows: int) -> list[tuple[int, int]]:
+    """splits `n_rows` into contiguous (start, stop) row ranges of at most `chunk_rows` rows.
+
+    :param n_rows: the number of rows to split.
+    :param chunk_rows: the most rows in a single range.
+    :return: list of (start, stop) tuples, in row order. Always has at least one range.
+    """
+    if chunk_rows < 1:
+        raise ValueError(f"chunk_rows must be at least 1, got {chunk_rows}")
+    return [(start, min(start + chunk_rows, n_rows)) for start in range(0, max(n_rows, 1), chunk_rows)]
@@ -0,0 +1,108 @@
+"""module for profiling the columns of a DataSource, for checks on column statistics"""
+import math
+import warnings
+from collections.abc import Collection
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+TOP_VALUES = 5
+"""the number of most common values kept in a ColumnProfile."""
+
+PROFILE_COLUMNS = (
+    "data_source", "parameter", "column", "rows", "nulls", "null_rate", "distinct", "min", "max", "mean", "std", "top"
+)
+"""the columns of `Pipeline.profile`."""
+
+
+@dataclass(frozen=True)
+class ColumnProfile:
+    """the statistics of one column.
+
+    `column`: str, the name of the column.
+
+    `rows`: int, the number of rows.
+
+    `nulls`: int, the number of missing values.
+
+    `distinct`: int, the number of distinct values, leaving out missing ones.
+
+    `min`, `max`: the smallest and largest value, for numbers and dates. None otherwise, or when every value is missing.
+
+    `mean`, `std`: float, the mean and sample standard deviation, for numbers. NaN otherwise.
+
+    `top`: tuple, the most common values as (value, count) pairs, most common first.
+    """
+    column: str
+    rows: int
+    nulls: int
+    distinct: int
+    min: object = None
+    max: object = None
+    mean: float = math.nan
+    std: float = math.nan
+    top: tuple = ()
+
+    @property
+    def null_rate(self) -> float:
+        """returns the share of missing values, 0 for an empty column."""
+        return self.nulls / self.rows if self.rows else 0.0
+
+
+class Profile(dict):
+    """the ColumnProfiles of the columns a check is bound to, by alias map parameter.
+
+    A check with a parameter annotated `Profile` gets one, next to its columns::
+
+        def price_outliers(price: pd.Series, profile: Profile) -> pd.Series:
+            stats = profile["price"]
+            return (price - stats.mean).abs() <= 3 * stats.std
+
+    The profiles come from `DataSource.profile`, so they are computed once per source and shared by
+    every check, rather than each check scanning the column again.
+    """
+
+
+def profile_columns(df: pd.DataFrame, columns: Collection[str], top: int = TOP_VALUES) -> dict[str, ColumnProfile]:
+    """profiles `columns` of `df` together.
+
+    The numeric statistics come from one 2-D block of every numeric column, reduced along the rows
+    for all of them at once. The null, distinct and top value counts come from one hash count per column.
+
+    :param df: the data.
+    :param columns: the columns to profile.
+    :param top: the number of most common values to keep.
+    :return: `column: ColumnProfile`, in the order of `columns`.
+    """
+    columns = list(dict.fromkeys(columns))
+    numeric = [
+        c for c in columns
+        if pd.api.types.is_numeric_dtype(df[c].dtype) and not pd.api.types.is_bool_dtype(df[c].dtype)
+    ]
+    stats = {}
+    if numeric:
+        block = df[numeric].to_numpy(dtype=float, na_value=np.nan)
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-missing columns give NaN, not a warning
+            lows, highs = np.nanmin(block, axis=0), np.nanmax(block, axis=0)
+            means, stds = np.nanmean(block, axis=0), np.nanstd(block, axis=0, ddof=1)
+        for i, c in enumerate(numeric):
+            low, high = (None, None) if np.isnan(lows[i]) else (lows[i].item(), highs[i].item())
+            stats[c] = {"min": low, "max": high, "mean": float(means[i]), "std": float(stds[i])}
+
+    profiles = {}
+    for c in columns:
+        values = df[c]
+        counts = values.value_counts(dropna=True, sort=True)
+        if c not in stats and pd.api.types.is_datetime64_any_dtype(values.dtype) and len(counts):
+            stats[c] = {"min": values.min(), "max": values.max()}
+        profiles[c] = ColumnProfile(
+            column=c,
+            rows=len(values),
+            nulls=len(values) - int(counts.sum()),
+            distinct=len(counts),
+            top=tuple(counts.head(top).items()),
+            **stats.get(c, {}),
+        )
+    return profiles
@@ -0,0 +1,93 @@
+"""module for drawing deterministic row samples and estimating failure rates from them"""
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+ESTIMATE_COLUMNS = ("population_rows", "ci_low", "ci_high")
+"""the columns `Pipeline.sample_summary` adds to `SUMMARY_COLUMNS`."""
+
+
+@dataclass(frozen=True)
+class Sample:
+    """how to sample each DataSource before a full run.
+
+    `rows`: int, the sample size per DataSource. Sources with fewer rows are used whole.
+
+    `by`: str, the column (or alias map parameter) to stratify on, so every value of it is
+    represented in proportion to its share of the rows. Defaults to a uniform sample.
+    Sources without the column are sampled uniformly.
+
+    `seed`: int, the seed of the sample. The same seed draws the same rows.
+
+    `confidence`: float, the confidence level of the failure rate intervals.
+    """
+    rows: int = 1_000
+    by: str | None = None
+    seed: int = 0
+    confidence: float = 0.95
+
+    def __post_init__(self):
+        if self.rows < 1:
+            raise ValueError(f"rows must be at least 1, got {self.rows}")
+        if not 0 < self.confidence < 1:
+            raise ValueError(f"confidence must be between 0 and 1, got {self.confidence}")
+
+
+def sample_positions(
+        n_rows: int,
+        size: int,
+        strata: pd.Series | None = None,
+        seed: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """draws `size` row positions out of `n_rows`, without replacement and in row order.
+
+    With `strata`, each stratum gets a share of the sample proportional to its rows, and at least
+    one row. Everything is done with array operations on the positions, never on the frame.
+
+    :param n_rows: the rows to sample from.
+    :param size: the rows wanted. Stratified samples can be off by a few rows from rounding.
+    :param strata: the value of the stratifying column for each row.
+    :param seed: the seed of the random generator.
+    :return: (positions, weights), where weights is how many source rows each sampled row stands for.
+    """
+    if size >= n_rows:
+        return np.arange(n_rows), np.ones(n_rows)
+
+    rng = np.random.default_rng(seed)
+    if strata is None:
+        positions = np.sort(rng.choice(n_rows, size=size, replace=False))
+        return positions, np.full(size, n_rows / size)
+
+    codes, _ = pd.factorize(strata, use_na_sentinel=False)
+    counts = np.bincount(codes)
+    take = np.minimum(counts, np.maximum(1, np.rint(size * counts / n_rows).astype(np.int64)))
+
+    # shuffle, then group by stratum, and keep the first `take` rows of each group
+    order = np.lexsort((rng.random(n_rows), codes))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.arange(n_rows) - starts[codes[order]]
+    chosen = order[rank < take[codes[order]]]
+
+    positions = np.sort(chosen)
+    weights = counts[codes[positions]] / take[codes[positions]]
+    return positions, weights
+
+
+def wilson_interval(failed: np.ndarray, rows: np.ndarray, confidence: float = 0.95) -> tuple[np.ndarray, np.ndarray]:
+    """the Wilson score interval of a failure rate, which stays sensible at 0 and 100% failures.
+
+    :param failed: the (possibly weighted) failing rows of each sample.
+    :param rows: the rows of each sample.
+    :param confidence: the confidence level.
+    :return: (low, high) arrays. NaN where a sample has no rows.
+    """
+    failed = np.asarray(failed, dtype=float)
+    rows = np.asarray(rows, dtype=float)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = failed / rows
+        center = (p + z ** 2 / (2 * rows)) / (1 + z ** 2 / rows)
+        half = z * np.sqrt(p * (1 - p) / rows + z ** 2 / (4 * rows ** 2)) / (1 + z ** 2 / rows)
+    return np.clip(center - half, 0, 1), np.clip(center + half, 0, 1)
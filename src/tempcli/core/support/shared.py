@@ -0,0 +1,138 @@
+"""module for sharing DataSource columns with worker processes through shared memory"""
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+_SHAREABLE_KINDS = "biufcmM"
+"""numpy dtype kinds that are a flat buffer (bool, ints, floats, complex, timedelta, datetime)."""
+
+
+@dataclass(frozen=True)
+class SharedColumn:
+    """points to a single column buffer that lives in a shared memory segment.
+
+    `name`: the column name in the original DataFrame.
+
+    `shm_name`: the name of the shared memory segment holding the column.
+
+    `dtype`: the numpy dtype string of the column, e.g. `<f8`.
+
+    `length`: the number of rows in the column.
+    """
+    name: str
+    shm_name: str
+    dtype: str
+    length: int
+
+
+@dataclass
+class SharedFrame:
+    """a picklable handle to a DataFrame whose column buffers are copied into
+    `multiprocessing.shared_memory` once, so worker processes can attach to them
+    without the DataFrame being pickled for every task.
+
+    Only numpy-backed numeric, bool and datetime columns are shared. Everything else
+    (object, string and extension dtypes) travels in `pickled` as a regular DataFrame.
+
+    The process that calls `create` owns the segments and must call `unlink` (or use the
+    object as a context manager) once the workers are done with them.
+    """
+    columns: tuple
+    """the original column order."""
+
+    shared: tuple[SharedColumn, ...]
+    """the columns that live in shared memory."""
+
+    pickled: pd.DataFrame | None
+    """the columns that could not be shared. None when every column was shared."""
+
+    index: pd.Index
+    """the row index of the original DataFrame."""
+
+    _handles: list[SharedMemory] = field(default_factory=list, repr=False, compare=False)
+    """open segments for this process. Never pickled."""
+
+    @classmethod
+    def create(cls, frame: pd.DataFrame) -> "SharedFrame":
+        """copies the shareable columns of `frame` into new shared memory segments.
+
+        If anything fails part way, the segments created so far are freed before re-raising.
+
+        :param frame: the DataFrame to share.
+        :return: SharedFrame, the owner's handle.
+        """
+        handles = []
+        shared = []
+        pickled_columns = []
+        try:
+            for col in frame.columns:
+                series = frame[col]
+                if not isinstance(series.dtype, np.dtype) or series.dtype.kind not in _SHAREABLE_KINDS:
+                    pickled_columns.append(col)
+                    continue
+
+                values = series.to_numpy()
+                shm = SharedMemory(create=True, size=max(values.nbytes, 1))
+                handles.append(shm)
+                np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+                shared.append(SharedColumn(col, shm.name, values.dtype.str, len(values)))
+        except BaseException:
+            for shm in handles:
+                shm.close()
+                shm.unlink()
+            raise
+
+        pickled = frame[pickled_columns] if pickled_columns else None
+        return cls(tuple(frame.columns), tuple(shared), pickled, frame.index, handles)
+
+    @property
+    def segment_names(self) -> tuple[str, ...]:
+        """returns the names of the shared memory segments backing this frame."""
+        return tuple(c.shm_name for c in self.shared)
+
+    def attach(self) -> pd.DataFrame:
+        """rebuilds the DataFrame on top of the shared buffers, without copying them.
+
+        The shared columns are read-only, so a check can't change the data other workers see.
+        The frame is only valid while this SharedFrame object is alive, since it keeps the
+        segments mapped.
+
+        :return: pd.DataFrame, a view over the shared memory.
+        """
+        data = {}
+        for c in self.shared:
+            shm = SharedMemory(name=c.shm_name, track=False)
+            self._handles.append(shm)
+            values = np.ndarray((c.length,), dtype=np.dtype(c.dtype), buffer=shm.buf)
+            values.flags.writeable = False
+            data[c.name] = values
+
+        if self.pickled is not None:
+            for col in self.pickled.columns:
+                data[col] = self.pickled[col]
+
+        ordered = {col: data[col] for col in self.columns}
+        return pd.DataFrame(ordered, index=self.index, copy=False)
+
+    def unlink(self) -> None:
+        """closes and frees the shared memory segments. Only the owner should call this."""
+        while self._handles:
+            shm = self._handles.pop()
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:  # already freed
+                pass
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_handles"] = []
+        return state
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.unlink()
@@ -0,0 +1,37 @@
+"""module for the objects that receive check results while a pipeline runs"""
+from abc import ABC, abstractmethod
+from collections.abc import Collection
+from uuid import UUID
+
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.support.interfaces import FnResult
+from tempcli.core.types.result import Result
+
+
+class ResultSink(ABC):
+    """receives the result of each (DataSource, Fn) pair as soon as it has run.
+
+    Sinks let results be written out one check at a time, instead of collecting a
+    whole run in memory first. Pass them to `Pipeline.run_summary(sinks=...)`.
+    """
+
+    @abstractmethod
+    def write(
+            self,
+            run_id: UUID,
+            data: DataSource,
+            fn: Fn,
+            result: Result[Collection[FnResult], str],
+    ) -> None:
+        """handles the result of one check on one data source.
+
+        :param run_id: the UUID of the pipeline run.
+        :param data: the DataSource the check ran against.
+        :param fn: the check that ran.
+        :param result: the result of `AliasMap.generate_results`.
+        """
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        """called once the run is over. Does nothing by default."""
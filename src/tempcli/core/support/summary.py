@@ -0,0 +1,225 @@
+"""module for reducing check results into the rows of the `run_summary` report"""
+from collections.abc import Collection
+from uuid import UUID
+
+import numpy as np
+
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.support.interfaces import FnResult
+from tempcli.core.types.result import Result
+
+SUMMARY_COLUMNS = (
+    "run_id",
+    "data_source",
+    "data_key",
+    "check",
+    "fn_key",
+    "columns",
+    "rows",
+    "failed",
+    "failure_rate",
+    "status",
+    "message",
+    "failed_rows",
+)
+"""the columns of the DataFrame returned by `Pipeline.run_summary`, in order."""
+
+BOUNDS_COLUMNS = ("offending_min", "offending_max")
+"""extra columns with `value_bounds=True`: the min and max input value on the failing rows, per column."""
+
+
+class Skipped(str):
+    """the error of a check that didn't run because a check upstream of it failed.
+
+    A str, so consumers reading `Result.unwrap_err()` as a message keep working.
+    """
+
+
+class TimedOut(str):
+    """the error of a check that ran over its `Fn.timeout`, and was killed or abandoned."""
+
+
+def failed_mask(fn: Fn, result) -> np.ndarray:
+    """returns a boolean array flagging the rows that did not pass the check.
+
+    Respects `Fn.false_as_error`. Rows without a boolean verdict (None or NaN, usually
+    from a row that raised) are never counted as a pass. The result of a check with several
+    outputs, still a DataFrame, gives a mask per output column.
+
+    :param fn: the function that produced the result.
+    :param result: the result of the function, ideally a boolean pd.Series.
+    :return: np.ndarray[bool], True where the row failed.
+    """
+    values = np.atleast_1d(np.asarray(result))
+    if values.dtype != bool:
+        values = values == True  # noqa: E712 -- elementwise, so None and NaN become False
+    return values if fn.false_as_error else ~values
+
+
+def summarize(
+        run_id: UUID,
+        data: DataSource,
+        fn: Fn,
+        result: Result[Collection[FnResult], str],
+        max_failed_rows: int | None = None,
+        value_bounds: bool = False,
+) -> list[dict]:
+    """reduces the result of one (DataSource, Fn) pair into summary rows, one row per FnResult.
+
+    The rows only hold counts and row positions, so the FnResults can be dropped afterwards.
+
+    :param run_id: the UUID of the pipeline run.
+    :param data: the DataSource the check ran against.
+    :param fn: the check that ran.
+    :param result: the result of `AliasMap.generate_results`.
+    :param max_failed_rows: keep only the first N failing row positions. Defaults to keeping all of them.
+    :param value_bounds: whether to add the `BOUNDS_COLUMNS`.
+    :return: a list of dict rows, keyed by `SUMMARY_COLUMNS`.
+    """
+    base = {
+        "run_id": run_id,
+        "data_source": data.name,
+        "data_key": data.key,
+        "check": fn.name,
+        "fn_key": fn.key,
+    }
+    bounds = dict.fromkeys(BOUNDS_COLUMNS) if value_bounds else {}
+    if result.is_err():
+        error = result.unwrap_err()
+        row = _error_row(error)
+        if isinstance(error, Skipped):
+            row["status"] = "skipped"
+        elif isinstance(error, TimedOut):
+            row["status"] = "timeout"
+        return [base | row | bounds]
+
+    rows = []
+    for fn_result in result.unwrap():
+        if fn_result is None:
+            rows.append(base | _error_row(f"`{fn.name}` raised while running on {data.name}.") | bounds)
+            continue
+        mask = failed_mask(fn, fn_result.result)
+        row = base | {"check": check_label(fn, fn_result)}
+        row |= summary_row(fn, fn_result, max_failed_rows=max_failed_rows, mask=mask)
+        if value_bounds:
+            row |= offending_bounds(data, fn_result, mask)
+        rows.append(row)
+    return rows
+
+
+def summary_row(
+        fn: Fn,
+        fn_result: FnResult,
+        max_failed_rows: int | None = None,
+        mask: np.ndarray | None = None,
+) -> dict:
+    """the counting part of a summary row, for a single FnResult.
+
+    :param fn: the function that produced the result.
+    :param fn_result: the result to count.
+    :param max_failed_rows: keep only the first N failing row positions.
+    :param mask: the `failed_mask` of the result, if it was already computed.
+    """
+    if mask is None:
+        mask = failed_mask(fn, fn_result.result)
+    failed_rows = np.flatnonzero(mask)
+    message = None
+    if fn_result.rows is not None:  # ran on some of the rows, point back at the source rows
+        failed_rows = fn_result.rows[failed_rows]
+        message = f"Ran on the {len(mask)} rows that passed the checks upstream."
+    n_failed = len(failed_rows)
+    if max_failed_rows is not None:
+        failed_rows = failed_rows[:max_failed_rows].copy()  # a copy, so the full array can be freed
+    n_rows = len(mask)
+    return {
+        "columns": columns_label(fn, fn_result),
+        "rows": n_rows,
+        "failed": n_failed,
+        "failure_rate": n_failed / n_rows if n_rows else 0.0,
+        "status": "fail" if n_failed else "pass",
+        "message": f"Stopped after {n_rows} rows, over the failure budget." if fn_result.stopped else message,
+        "failed_rows": failed_rows,
+    }
+
+
+def check_label(fn: Fn, fn_result: FnResult) -> str:
+    """the check a FnResult is from, e.g. `date_sanity`, or `date_sanity.in_future` for one of its outputs."""
+    return f"{fn.name}.{fn_result.output}" if fn_result.output is not None else fn.name
+
+
+def columns_label(fn: Fn, fn_result: FnResult) -> str | None:
+    """the columns a FnResult checked, e.g. `price, cool_price`, followed by its grid point for grid checks."""
+    if not fn_result.kwargs:
+        return None
+    grid = fn.grid or {}
+    label = ", ".join(str(c) for p, c in fn_result.kwargs.items() if p not in grid)
+    point = ", ".join(f"{p}={fn_result.kwargs[p]}" for p in grid if p in fn_result.kwargs)
+    return f"{label} ({point})" if point else label
+
+
+def cancelled_rows(run_id: UUID, data: DataSource, fn: Fn, message: str) -> list[dict]:
+    """the summary row of a (DataSource, Fn) pair that never ran, because the run was cancelled."""
+    return [{
+        "run_id": run_id,
+        "data_source": data.name,
+        "data_key": data.key,
+        "check": fn.name,
+        "fn_key": fn.key,
+        "columns": None,
+        "rows": 0,
+        "failed": 0,
+        "failure_rate": np.nan,
+        "status": "cancelled",
+        "message": message,
+        "failed_rows": np.empty(0, dtype=np.int64),
+    }]
+
+
+def offending_bounds(data: DataSource, fn_result: FnResult, mask: np.ndarray) -> dict:
+    """the min and max value of each input column, over the rows that failed.
+
+    Columns that can't be ordered (or have no failing rows) are left out.
+    """
+    low, high = {}, {}
+    if fn_result.kwargs and mask.any() and len(mask) == len(data.data):
+        for column in dict.fromkeys(fn_result.kwargs.values()):
+            if not isinstance(column, str) or column not in data.data.columns:  # a grid value
+                continue
+            values = data.data[column].to_numpy()[mask]
+            try:
+                low[column], high[column] = np.min(values), np.max(values)
+            except TypeError:
+                continue
+    return {"offending_min": low, "offending_max": high}
+
+
+def _error_row(message) -> dict:
+    return {
+        "columns": None,
+        "rows": 0,
+        "failed": 0,
+        "failure_rate": np.nan,
+        "status": "error",
+        "message": str(message),
+        "failed_rows": np.empty(0, dtype=np.int64),
+    }
+
+
+def schedule_stats(makespan: float, timings: Collection[float], workers: int) -> dict:
+    """how well a run kept its workers busy.
+
+    :param makespan: the wall clock seconds of the run.
+    :param timings: the seconds each task took.
+    :param workers: the tasks the executor can run at the same time.
+    :return: dict with `makespan`, `total_work` (the summed task seconds), `workers` (capped at the
+    number of tasks) and `efficiency`: total_work / (makespan x workers), 1.0 when no worker ever idled.
+    """
+    total_work = float(sum(timings))
+    workers = max(1, min(workers, len(timings)))
+    return {
+        "makespan": makespan,
+        "total_work": total_work,
+        "workers": workers,
+        "efficiency": total_work / (makespan * workers) if makespan > 0 else np.nan,
+    }
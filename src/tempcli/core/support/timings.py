@@ -0,0 +1,65 @@
+"""module for keeping the runtimes of past checks, so the executors can plan the next run"""
+import json
+import os
+from pathlib import Path
+from uuid import UUID
+
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+
+
+class TimingHistory:
+    """the runtime of each (Fn, DataSource) pair over past runs, in memory or in a JSON file.
+
+    Runtimes are kept as seconds per row, smoothed over runs, so a source that grew since the last
+    run (or a sample of it) still gets a sensible estimate. Pass it to an Executor
+    (`ThreadExecutor(history=...)`) to have the tasks ordered by how long they are expected to take.
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None, smoothing: float = 0.5):
+        """
+        :param path: the JSON file to load from and `save` to. Defaults to keeping the history in memory.
+        :param smoothing: the weight of the newest runtime against the history, between 0 and 1.
+        """
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"smoothing must be between 0 and 1, got {smoothing}")
+        self.path = None if path is None else Path(path)
+        self.smoothing = smoothing
+        self._per_row: dict[str, float] = {}
+        if self.path is not None and self.path.exists():
+            self._per_row = json.loads(self.path.read_text())
+
+    def __len__(self) -> int:
+        return len(self._per_row)
+
+    def estimate(self, fn: Fn, data: DataSource) -> float | None:
+        """returns the expected seconds of `fn` on `data`, or None if the pair never ran."""
+        per_row = self._per_row.get(self._key(fn.key, data.key))
+        if per_row is None:
+            return None
+        return per_row * max(_rows(data), 1)
+
+    def record(self, fn: Fn, data: DataSource, seconds: float) -> None:
+        """adds the runtime of one run of `fn` on `data` to the history."""
+        key = self._key(fn.key, data.key)
+        per_row = seconds / max(_rows(data), 1)
+        if key in self._per_row:
+            per_row = self.smoothing * per_row + (1 - self.smoothing) * self._per_row[key]
+        self._per_row[key] = per_row
+
+    def save(self) -> None:
+        """writes the history to `path`, replacing the old file in one step."""
+        if self.path is None:
+            raise ValueError("This TimingHistory has no path to save to.")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self._per_row))
+        os.replace(tmp, self.path)
+
+    @staticmethod
+    def _key(fn_key: UUID, data_key: UUID) -> str:
+        return f"{fn_key}|{data_key}"
+
+
+def _rows(data: DataSource) -> int:
+    return 0 if data.value is None else len(data.value)
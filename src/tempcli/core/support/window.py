@@ -0,0 +1,197 @@
+"""module for windowed checks, on rolling statistics over a date column"""
+import copy
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from tempcli.core.components.data import DataSource
+from tempcli.core.support.cache import FrameCache
+
+@dataclass(frozen=True)
+class Window:
+    """a rolling window over the rows of a DataSource, in the order of a date column.
+
+        Fn(mean_within_bounds, window=Window("date", "7D"))
+
+    `on`: str, the alias map parameter of the date (or any ordered) column.
+
+    `size`: int | str | pd.Timedelta, the window, as a number of rows or a span of time like `"7D"`.
+    A time window holds the rows from `size` before a row's date up to it.
+
+    `min_periods`: int, the fewest rows a window needs for its statistics, or they are missing.
+    Defaults to `size` for row windows and 1 for time windows.
+    """
+    on: str
+    size: int | str | pd.Timedelta
+    min_periods: int | None = None
+
+    def __post_init__(self):
+        if not isinstance(self.on, str):
+            raise TypeError(f"on must be an alias map parameter, got {type(self.on)}")
+        if isinstance(self.size, (int, np.integer)) and not isinstance(self.size, bool):
+            if self.size < 1:
+                raise ValueError(f"a row window needs at least 1 row, got {self.size}")
+            object.__setattr__(self, 'size', int(self.size))
+        else:
+            size = pd.Timedelta(self.size)  # raises on anything that isn't a span of time
+            if size <= pd.Timedelta(0):
+                raise ValueError(f"a time window must be positive, got {self.size}")
+            object.__setattr__(self, 'size', size)
+        if self.min_periods is not None and self.min_periods < 0:
+            raise ValueError(f"min_periods can't be negative, got {self.min_periods}")
+
+    @property
+    def is_time(self) -> bool:
+        """whether the window is a span of time, rather than a number of rows."""
+        return isinstance(self.size, pd.Timedelta)
+
+
+class Rolling:
+    """the rolling statistics of a `Window` over the rows of one DataSource.
+
+    A check with a parameter annotated `Rolling` gets one, next to its columns::
+
+        def mean_within_bounds(price: pd.Series, rolling: Rolling) -> pd.Series:
+            return rolling.mean("price").between(0, 100)
+
+    The statistics come back in row order, computed in date order with pandas' sliding window
+    aggregates, one O(n) pass each. Given an alias map parameter of the check, a statistic is
+    computed once and shared by every check with the same window on the same DataSource. Given a
+    pd.Series, e.g. a derived one, it is computed on the spot. Rows with a missing date get
+    missing statistics.
+
+    Only the dates and the columns of the bound check are held, never the DataFrame itself, so a
+    cached Rolling doesn't keep its DataFrame alive.
+    """
+
+    def __init__(self, window: Window, dates: pd.Series):
+        """
+        :param window: the window.
+        :param dates: the date of each row, with the rows in any order.
+        """
+        self.window = window
+        self.on = dates
+        """the date of each row."""
+        self.columns: dict[str, pd.Series] = {}
+        """the `parameter: column` bindings of the check, for looking statistics up by parameter."""
+
+        valid = np.flatnonzero(dates.notna().to_numpy())
+        in_order = np.argsort(dates.to_numpy()[valid], kind="stable")
+        self.order: np.ndarray = valid[in_order]
+        """the rows with a date, in date order."""
+        self.dates: np.ndarray = dates.to_numpy()[self.order]
+        """the dates of the rows in `order`."""
+        self.order_all: np.ndarray = np.concatenate([self.order, np.flatnonzero(dates.isna().to_numpy())])
+        """every row, in date order, with the rows without a date last."""
+
+        self._memo: dict[tuple, pd.Series] = {}
+        self._lock = threading.Lock()
+
+    def bound(self, columns: dict[str, pd.Series] | None) -> "Rolling":
+        """returns a view of these statistics for a check with the `parameter: column` bindings.
+
+        Statistics are shared by column name, so every check reading a column computes them once.
+        """
+        view = copy.copy(self)  # shares the order and the computed statistics
+        view.columns = dict(columns or {})
+        return view
+
+    def take(self, rows: np.ndarray) -> "Rolling":
+        """returns the statistics of only `rows` of the frame, with the same window and bindings."""
+        columns = {p: s.iloc[rows] for p, s in self.columns.items()}
+        return Rolling(self.window, self.on.iloc[rows]).bound(columns)
+
+    def lookback(self, start: int) -> int:
+        """returns the first position in `order_all` that the window of the row at position `start` reaches."""
+        if start >= len(self.order):  # no date, no window
+            return start
+        if self.window.is_time:
+            first = int(np.searchsorted(self.dates, self.dates[start] - self.window.size, side="right"))
+        else:
+            first = start - self.window.size + 1
+        # at least the row before, for `diff` and `change`
+        return max(0, min(first, start - 1))
+
+    def mean(self, values: str | pd.Series) -> pd.Series:
+        """returns the mean of the window ending at each row."""
+        return self._statistic(values, "mean")
+
+    def sum(self, values: str | pd.Series) -> pd.Series:
+        """returns the sum of the window ending at each row."""
+        return self._statistic(values, "sum")
+
+    def std(self, values: str | pd.Series) -> pd.Series:
+        """returns the sample standard deviation of the window ending at each row."""
+        return self._statistic(values, "std")
+
+    def min(self, values: str | pd.Series) -> pd.Series:
+        """returns the smallest value of the window ending at each row."""
+        return self._statistic(values, "min")
+
+    def max(self, values: str | pd.Series) -> pd.Series:
+        """returns the largest value of the window ending at each row."""
+        return self._statistic(values, "max")
+
+    def count(self, values: str | pd.Series) -> pd.Series:
+        """returns the number of non-missing values in the window ending at each row."""
+        return self._statistic(values, "count")
+
+    def diff(self, values: str | pd.Series) -> pd.Series:
+        """returns the difference of each value from the value of the row before it in date order."""
+        return self._computed(values, "diff", lambda v: v - _previous(v))
+
+    def change(self, values: str | pd.Series) -> pd.Series:
+        """returns the relative change of each value from the row before it in date order, e.g. 0.2 for +20%."""
+        def change(v: np.ndarray) -> np.ndarray:
+            before = _previous(v)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return (v - before) / np.abs(before)
+        return self._computed(values, "change", change)
+
+    def _statistic(self, values: str | pd.Series, statistic: str) -> pd.Series:
+        def rolled(v: np.ndarray) -> np.ndarray:
+            index = pd.DatetimeIndex(self.dates) if self.window.is_time else None
+            rolling = pd.Series(v, index=index).rolling(self.window.size, min_periods=self.window.min_periods)
+            return getattr(rolling, statistic)().to_numpy()
+        return self._computed(values, statistic, rolled)
+
+    def _computed(self, values: str | pd.Series, statistic: str, compute: Callable) -> pd.Series:
+        """computes `statistic` on the values in date order, and returns it in row order.
+
+        :raises KeyError: when `values` is a parameter the check isn't bound to.
+        """
+        if isinstance(values, str):
+            if values not in self.columns:
+                raise KeyError(f"`{values}` isn't a column parameter of the check, pass the pd.Series instead.")
+            series = self.columns[values]
+            memo_key = (series.name, statistic)
+            with self._lock:
+                cached = self._memo.get(memo_key)
+            if cached is not None:
+                return cached
+        else:
+            memo_key, series = None, values
+
+        out = np.full(len(series), np.nan)
+        out[self.order] = compute(series.to_numpy(dtype=float, na_value=np.nan)[self.order])
+        result = pd.Series(out, index=series.index)
+        if memo_key is not None:
+            with self._lock:
+                result = self._memo.setdefault(memo_key, result)
+        return result
+
+
+def _previous(values: np.ndarray) -> np.ndarray:
+    """returns the value of the row before each one, missing for the first row."""
+    return np.concatenate([[np.nan], values[:-1]]) if len(values) else values
+
+
+class WindowCache(FrameCache):
+    """the rolling statistics of a pipeline's DataSources, shared by every check with the same window."""
+
+    def rolling(self, data: DataSource, on: str, window: Window) -> Rolling:
+        """returns the rolling statistics of `window` over `data`, ordered by its column `on`."""
+        return self.get(data.data, (on, window), lambda df: Rolling(window, df[on]))
@@ -120,7 +120,8 @@ class Many(Alias[S, C]):
         return [self]
 
     def convert_to_one(self) -> Iterator[One]:
-        for c in set(self.aliases):
+        # dict keeps the user's column order, so Many groups zip up deterministically
+        for c in dict.fromkeys(self.aliases):
             yield One(parameter=self.parameter, alias=c)
 
     def map(self, c: Collection) -> Result:
@@ -131,7 +132,7 @@ class Many(Alias[S, C]):
                 if o.alias in c:
                     temp.append(o)
             if len(temp) > 1:
-                many = Many(self.parameter, temp)
+                many = Many(self.parameter, [o.alias for o in temp])
                 return Ok(many)
             elif len(temp) == 1:
                 first = temp[0]
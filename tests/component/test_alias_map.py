@@ -1,7 +1,10 @@
+import pandas as pd
 import pytest
 from _pytest.fixtures import TopRequest
 
 from tempcli.core.components.alias_map import AliasMap
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
 from tempcli.core.types.result import Err, Ok
 
 
@@ -114,3 +117,43 @@ def test_check_params(request: TopRequest, p, raise_error, expected):
             assert isinstance(r, expected[0])
         else:
             assert r.is_err()
+
+
+####################
+# Row Partitions
+####################
+@pytest.mark.parametrize("row_local,partitions,expected_calls", [
+    pytest.param(True, 4, 4, id="row_local_split"),
+    pytest.param(True, 1, 1, id="row_local_single_partition"),
+    pytest.param(False, 4, 1, id="whole_column_not_split"),
+])
+def test_generate_results_partitions(request: TopRequest, row_local, partitions, expected_calls):
+    """row_local functions are split into ordered partitions, other functions see the whole column"""
+    df = request.getfixturevalue("basic_dataframe")
+    calls = []
+
+    def price_check(price: pd.Series, cool_price: pd.Series) -> pd.Series:
+        calls.append(len(price))
+        return price <= cool_price
+
+    alias_map = AliasMap({"price": "price", "cool_price": "cool_price"})
+    fn = Fn(price_check, row_local=row_local)
+    results = alias_map.generate_results(DataSource("basic", df), fn, partitions=partitions).unwrap()
+
+    assert len(calls) == expected_calls
+    assert sum(calls) == len(df)
+    pd.testing.assert_series_equal(results[0].result, df["price"] <= df["cool_price"])
+
+
+def test_generate_results_partitions_scalar(request: TopRequest):
+    """scalar row_local functions are partitioned by records and keep the row order"""
+    df = request.getfixturevalue("basic_dataframe")
+
+    def below(price: float, cool_price: float) -> bool:
+        return price <= cool_price
+
+    alias_map = AliasMap({"price": "price", "cool_price": "cool_price"})
+    whole = alias_map.generate_results(DataSource("basic", df), Fn(below)).unwrap()
+    split = alias_map.generate_results(DataSource("basic", df), Fn(below, row_local=True), partitions=4).unwrap()
+
+    pd.testing.assert_series_equal(whole[0].result, split[0].result)
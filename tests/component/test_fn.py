@@ -1,4 +1,6 @@
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
 
 import pytest
 from _pytest.fixtures import TopRequest
@@ -49,3 +51,22 @@ def test_fn_calls(request: TopRequest, c, arg, expected):
             with pytest.raises(expected):
                 f = Fn(callable=c)
                 f(arg)
+
+
+def test_fn_is_immutable():
+    f = Fn(callable=fn_scalar_arg_return_bool)
+    with pytest.raises(FrozenInstanceError):
+        f.raise_on_error = False
+
+
+def test_fn_shared_across_threads():
+    """each call returns its own call_key, even when one Fn is called from many threads at once"""
+    f = Fn(callable=fn_scalar_arg_return_bool)
+    args = [f"value_{i}" for i in range(200)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda a: f(a).unwrap(), args))
+
+    for arg, r in zip(args, results):
+        assert r.args == (arg,)
+        assert r.call_key == f._create_call_key((arg,), {})
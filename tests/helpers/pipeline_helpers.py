@@ -0,0 +1,140 @@
+"""module level pipelines and checks, so they can be pickled into worker processes"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from helpers.component_helpers import basic_dataframe
+from tempcli.core import checks
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.pipeline import Pipeline
+from tempcli.core.support.group import Groups
+from tempcli.core.support.profile import Profile
+from tempcli.core.support.window import Rolling
+
+
+def price_below_cool_price(price: pd.Series, cool_price: pd.Series) -> pd.Series:
+    """fails the rows where price is above cool_price"""
+    return price <= cool_price
+
+
+def price_is_positive(price: pd.Series) -> pd.Series:
+    """fails the rows with a price of 0 or less"""
+    return price > 0
+
+
+def price_present(price: pd.Series) -> pd.Series:
+    """fails the rows without a price"""
+    return price.notna()
+
+
+def price_under_ten(price: pd.Series) -> pd.Series:
+    """fails the rows with a price of 10 or more"""
+    return price < 10
+
+
+def start_before_end(start: str, end: str) -> bool:
+    """scalar check, fails the rows where the start date is after the end date"""
+    return start < end
+
+
+def always_raises(price: pd.Series) -> pd.Series:
+    """check that blows up, to test cleanup on failure"""
+    raise ZeroDivisionError("bad check")
+
+
+def hangs(price: pd.Series) -> pd.Series:
+    """a check that never finishes in time, to test timeouts"""
+    time.sleep(60)
+    return price > 0
+
+
+def prices_rise(start: pd.Series, price: pd.Series) -> pd.Series:
+    """grouped check, fails the rows of a group where the price fell since the previous start date"""
+    by_date = price.iloc[np.argsort(start.to_numpy(), kind="stable")]
+    fell = by_date.diff() < 0
+    return ~fell.reindex(price.index)
+
+
+def category_totals_match(price: pd.Series, total: pd.Series, groups: Groups) -> np.ndarray:
+    """grouped kernel, fails every row of a group whose prices don't add up to its total"""
+    sums = np.bincount(groups.codes, weights=price.to_numpy(), minlength=len(groups))
+    return groups.broadcast(np.isclose(sums, groups.first(total.to_numpy())))
+
+
+def no_big_jumps(price: pd.Series, rolling: Rolling) -> pd.Series:
+    """windowed check, fails the rows where the price moved more than 20% since the previous date"""
+    return ~(rolling.change("price").abs() > 0.2)
+
+
+def price_sanity(price: pd.Series, cool_price: pd.Series) -> pd.DataFrame:
+    """multi-output check, one verdict column per problem, from a single pass over the prices"""
+    return pd.DataFrame({
+        "present": price.notna(),
+        "positive": price > 0,
+        "below_cool_price": price <= cool_price,
+    })
+
+
+def price_outliers(price: pd.Series, profile: Profile) -> pd.Series:
+    """fails the prices more than 2 standard deviations from the mean, from the shared column profile"""
+    stats = profile["price"]
+    return (price - stats.mean).abs() <= 2 * stats.std
+
+
+def large_dataframe(n_rows: int = 10_000) -> pd.DataFrame:
+    rng = np.random.default_rng(seed=7)
+    return pd.DataFrame({
+        "iid": np.arange(n_rows),
+        "price": rng.uniform(0, 100, size=n_rows),
+        "cool_price": rng.uniform(0, 100, size=n_rows),
+        "category": rng.choice(["A", "B", "C"], size=n_rows),
+    })
+
+
+class BasicPipeline(Pipeline):
+    alias_map = {
+        "start": "start date",
+        "end": "end date",
+        "price": "price",
+        "cool_price": "cool_price",
+    }
+
+    basic_report = DataSource("basic_report", basic_dataframe())
+
+    def large_report() -> pd.DataFrame:
+        return large_dataframe()
+
+    price_check = price_below_cool_price
+    date_check = start_before_end
+
+
+def crash_once(price: pd.Series) -> pd.Series:
+    """kills its process the first time it runs, when TEMPCLI_CRASH_MARKER is set"""
+    marker = os.environ.get("TEMPCLI_CRASH_MARKER")
+    if marker and not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return price >= 0
+
+
+class RowLocalPipeline(BasicPipeline):
+    price_check = Fn(price_below_cool_price, row_local=True)
+    crash_check = Fn(crash_once, row_local=True)
+
+
+def bimodal_prices(n_rows: int = 2_000) -> pd.DataFrame:
+    """prices around 10 then around 100, so a row range only sees one of the two modes"""
+    rng = np.random.default_rng(seed=11)
+    low, high = rng.normal(10, 1, size=n_rows // 2), rng.normal(100, 1, size=n_rows - n_rows // 2)
+    return pd.DataFrame({"price": np.concatenate([low, high])})
+
+
+class BimodalPipeline(Pipeline):
+    alias_map = {"price": "price"}
+
+    prices = DataSource("prices", bimodal_prices())
+
+    zscore = checks.zscore_within("price", 1.5)
@@ -0,0 +1,39 @@
+import pytest
+
+from helpers.pipeline_helpers import BasicPipeline
+from tempcli.core.support.executor import ThreadExecutor
+
+
+def test_aggregate_only_keeps_counts_and_drops_results():
+    full = BasicPipeline().run_summary(raise_errors=False)
+
+    pipeline = BasicPipeline()
+    agg = pipeline.run_summary(raise_errors=False, aggregate_only=True, max_failed_rows=5)
+
+    assert pipeline.results == {}
+    assert agg["failed"].tolist() == full["failed"].tolist()
+    assert agg["failure_rate"].equals(full["failure_rate"])
+    assert all(len(rows) <= 5 for rows in agg["failed_rows"])
+    for short, whole in zip(agg["failed_rows"], full["failed_rows"]):
+        assert short.tolist() == whole[:5].tolist()
+
+
+def test_aggregate_only_with_threads():
+    pipeline = BasicPipeline()
+    agg = pipeline.run_summary(
+        raise_errors=False,
+        executor=ThreadExecutor(max_workers=2),
+        aggregate_only=True,
+        max_failed_rows=1,
+    )
+    assert pipeline.results == {}
+    assert all(len(rows) <= 1 for rows in agg["failed_rows"])
+
+
+def test_value_bounds_of_failing_rows():
+    summary = BasicPipeline().run_summary(raise_errors=False, aggregate_only=True, value_bounds=True)
+    row = summary[(summary["data_source"] == "basic_report") & (summary["check"] == "price_below_cool_price")].iloc[0]
+
+    assert row["failed_rows"].tolist() == [1, 3]
+    assert row["offending_min"] == {"price": pytest.approx(200.01), "cool_price": pytest.approx(2.2)}
+    assert row["offending_max"] == {"price": pytest.approx(304.2), "cool_price": pytest.approx(100.01)}
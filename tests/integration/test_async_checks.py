@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from tempcli.core.components.alias_map import AliasMap
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+
+LOOKUP_DELAY = 0.05
+REFERENCE = {"A", "B"}
+
+
+class ReferenceServer:
+    """local stand-in for a reference service. Answers `1` if a value is in REFERENCE,
+    after LOOKUP_DELAY seconds, and records how many lookups were in flight at once."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.port = None
+        self._ready = threading.Event()
+        self._loop = None
+        self._thread = threading.Thread(target=asyncio.run, args=(self._serve(),), daemon=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        value = (await reader.readline()).decode().strip()
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(LOOKUP_DELAY)
+        self.in_flight -= 1
+        writer.write(b"1\n" if value in REFERENCE else b"0\n")
+        await writer.drain()
+        writer.close()
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with server:
+            await self._stop.wait()
+
+    def __enter__(self):
+        self._thread.start()
+        self._ready.wait(timeout=5)
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(timeout=5)
+
+
+@pytest.fixture
+def reference_server():
+    with ReferenceServer() as server:
+        yield server
+
+
+def _lookup_check(port: int):
+    async def category_exists(category: str) -> bool:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"{category}\n".encode())
+        await writer.drain()
+        answer = await reader.readline()
+        writer.close()
+        await writer.wait_closed()
+        return answer.strip() == b"1"
+    return category_exists
+
+
+@pytest.mark.parametrize("max_concurrency", [5, 40])
+def test_async_scalar_check_overlaps_lookups(reference_server, max_concurrency):
+    n_rows = 40
+    df = pd.DataFrame({"category": ["A", "B", "C", "D"] * (n_rows // 4)})
+    fn = Fn(_lookup_check(reference_server.port), max_concurrency=max_concurrency)
+    alias_map = AliasMap({"category": "category"})
+
+    start = time.perf_counter()
+    results = alias_map.generate_results(DataSource("lookups", df), fn).unwrap()
+    elapsed = time.perf_counter() - start
+
+    expected = df["category"].isin(REFERENCE)
+    pd.testing.assert_series_equal(results[0].result, expected, check_names=False)
+    assert reference_server.peak <= max_concurrency
+    assert elapsed < n_rows * LOOKUP_DELAY / 2  # far quicker than one lookup after another
+
+
+def test_async_fn_call_returns_result(reference_server):
+    fn = Fn(_lookup_check(reference_server.port))
+    assert fn.is_async
+    assert fn("A").unwrap().result is True
+    assert asyncio.run(fn.acall("Z")).unwrap().result is False
+
+
+def test_async_series_check():
+    async def positive(price: pd.Series) -> pd.Series:
+        await asyncio.sleep(0)
+        return price > 0
+
+    df = pd.DataFrame({"price": [1.0, -2.0, 3.0]})
+    results = AliasMap({"price": "price"}).generate_results(DataSource("prices", df), Fn(positive)).unwrap()
+    assert results[0].result.tolist() == [True, False, True]
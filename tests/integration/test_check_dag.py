@@ -0,0 +1,154 @@
+import multiprocessing
+
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import (
+    BasicPipeline,
+    always_raises,
+    price_below_cool_price,
+    price_is_positive,
+    price_present,
+    price_under_ten,
+)
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.pipeline import Pipeline
+from tempcli.core.support.executor import ProcessExecutor, ThreadExecutor
+
+SPAWN = multiprocessing.get_context("spawn")
+
+
+def dates_parse(start: pd.Series, end: pd.Series) -> pd.Series:
+    return pd.to_datetime(start, errors="coerce").notna() & pd.to_datetime(end, errors="coerce").notna()
+
+
+def start_before_end(start: pd.Series, end: pd.Series) -> pd.Series:
+    return pd.to_datetime(start) < pd.to_datetime(end)
+
+
+def same_year(start: pd.Series, end: pd.Series) -> pd.Series:
+    return pd.to_datetime(start).dt.year == pd.to_datetime(end).dt.year
+
+
+def price_positive(price: pd.Series) -> pd.Series:
+    return price > 0
+
+
+EVENTS = pd.DataFrame({
+    "start": ["2025-01-01", "2025-02-01", "not a date", "2025-04-01", "2025-06-01"],
+    "end": ["2025-01-31", "2025-02-28", "2025-03-31", "2025-04-30", "2025-05-01"],
+    "price": [1.0, 2.0, 3.0, 4.0, 5.0],
+})
+
+
+class DateChecks(Pipeline):
+    alias_map = {"start": "start", "end": "end", "price": "price"}
+
+    # defined before its upstream check on purpose, the pipeline still runs it after
+    ordering = Fn(start_before_end, depends_on=dates_parse, on_upstream_failure="passing_rows")
+    parsing = dates_parse
+    years = Fn(same_year, depends_on=["dates_parse"])
+    prices = price_positive
+
+
+class DatesPipeline(DateChecks):
+    events = DataSource("events", EVENTS)
+
+
+def _by_check(summary: pd.DataFrame) -> dict:
+    return {row["check"]: row for _, row in summary.iterrows()}
+
+
+def test_functions_keep_definition_order():
+    assert [f.name for f in BasicPipeline().functions] == ["price_below_cool_price", "start_before_end"]
+    assert [f.name for f in DatesPipeline().functions] == ["dates_parse", "start_before_end", "same_year", "price_positive"]
+
+
+@pytest.mark.parametrize("executor", [None, ThreadExecutor(max_workers=4)])
+def test_downstream_checks_are_gated(executor):
+    rows = _by_check(DatesPipeline().run_summary(executor=executor))
+
+    assert rows["dates_parse"]["failed_rows"].tolist() == [2]
+    assert rows["price_positive"]["status"] == "pass"
+
+    # only ran on the rows that parsed, positions still point at the source
+    ordering = rows["start_before_end"]
+    assert ordering["rows"] == 4
+    assert ordering["failed_rows"].tolist() == [4]
+    assert "upstream" in ordering["message"]
+
+    assert rows["same_year"]["status"] == "skipped"
+    assert "dates_parse" in rows["same_year"]["message"]
+
+
+def test_gated_and_ungated_checks_on_one_level_in_processes():
+    class Mixed(Pipeline):
+        alias_map = {"price": "price", "cool_price": "cool_price"}
+        prices = DataSource("prices", pd.DataFrame({"price": [1.0, -2.0, 30.0, 4.0], "cool_price": [5.0] * 4}))
+
+        positive = price_is_positive
+        present = price_present
+        # both on the second level, only the first cut down to the rows upstream passed
+        gated = Fn(price_below_cool_price, depends_on=price_is_positive, on_upstream_failure="passing_rows")
+        ungated = Fn(price_under_ten, depends_on=price_present, on_upstream_failure="passing_rows")
+
+    serial = _by_check(Mixed().run_summary())
+    spawned = _by_check(Mixed().run_summary(executor=ProcessExecutor(max_workers=2, mp_context=SPAWN)))
+    for check in ("price_below_cool_price", "price_under_ten"):
+        assert spawned[check]["rows"] == serial[check]["rows"]
+        assert spawned[check]["failed_rows"].tolist() == serial[check]["failed_rows"].tolist()
+    ungated, gated = serial["price_under_ten"], serial["price_below_cool_price"]
+    assert (ungated["rows"], ungated["failed_rows"].tolist()) == (4, [2])
+    assert (gated["rows"], gated["failed_rows"].tolist()) == (3, [2])
+
+
+def test_iter_results_yields_skipped_as_err():
+    results = {fn.name: r for _, fn, r in DatesPipeline().iter_results()}
+    assert results["same_year"].is_err()
+    assert results["start_before_end"].unwrap()[0].rows.tolist() == [0, 1, 3, 4]
+
+
+def test_downstream_runs_when_upstream_passes():
+    class CleanDates(DateChecks):
+        events = DataSource("events", EVENTS.drop(index=2))
+
+    rows = _by_check(CleanDates().run_summary())
+    assert rows["same_year"]["status"] == "pass"
+    assert rows["start_before_end"]["rows"] == 4
+    assert rows["start_before_end"]["message"] is None
+
+
+def test_errored_upstream_skips_downstream():
+    class Broken(DatesPipeline):
+        parsing = Fn(always_raises, raise_on_error=False)
+        ordering = Fn(start_before_end, depends_on=always_raises, on_upstream_failure="passing_rows")
+        years = Fn(same_year, depends_on=["always_raises"])
+
+    rows = _by_check(Broken().run_summary(raise_errors=False))
+    assert rows["always_raises"]["status"] == "error"
+    assert rows["start_before_end"]["status"] == "skipped"
+
+
+def test_bad_dependencies_raise():
+    class Unknown(DatesPipeline):
+        years = Fn(same_year, depends_on="nope")
+
+    class Loop(Pipeline):
+        alias_map = {"price": "price"}
+        a = Fn(price_positive, depends_on="same_year")
+        b = Fn(same_year, depends_on=price_positive)
+
+    with pytest.raises(ValueError, match="nope"):
+        Unknown()
+    with pytest.raises(ValueError, match="loop"):
+        Loop()
+    with pytest.raises(ValueError):
+        Fn(same_year, on_upstream_failure="sometimes")
+
+
+def test_filtered_functions_drop_missing_upstream():
+    pipeline = DatesPipeline()
+    pipeline.functions = [f for f in pipeline.functions if f.name == "same_year"]
+    with pytest.raises(ValueError):  # `not a date` reaches the check without its gate
+        pipeline.run_summary()
@@ -0,0 +1,136 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tempcli.core import checks
+from tempcli.core.components.data import DataSource
+from tempcli.core.pipeline import Pipeline
+from tempcli.core.support.executor import Executor
+
+
+def orders_dataframe() -> pd.DataFrame:
+    return pd.DataFrame({
+        "order id": ["A-001", "A-002", "b-003", None, "A-005", "A-006"],
+        "status": ["open", "closed", "open", "lost", None, "open"],
+        "price": [10.0, -1.0, np.nan, 250.0, 99.5, 100.0],
+        "quoted": [10.0, 0.0, 5.0, 240.0, 100.0, 100.0001],
+        "placed": pd.to_datetime(["2025-01-01", "2025-02-01", "2025-03-01", None, "2025-05-01", "2025-06-01"]),
+        "shipped": pd.to_datetime(["2025-01-02", "2025-01-15", "2025-03-01", "2025-04-02", "2025-05-03", None]),
+    })
+
+
+class OrderChecks(Pipeline):
+    alias_map = {
+        "order_id": "order id",
+        "status": "status",
+        "price": "price",
+        "quoted": "quoted",
+        "placed": "placed",
+        "shipped": "shipped",
+    }
+
+    orders = DataSource("orders", orders_dataframe())
+
+    id_present = checks.not_null("order_id")
+    id_format = checks.matches("order_id", r"A-\d{3}")
+    known_status = checks.in_set("status", {"open", "closed"})
+    price_range = checks.in_range("price", low=0, high=200)
+    shipped_after_placed = checks.ordered("placed", "shipped")
+    price_as_quoted = checks.within_tolerance("price", "quoted", abs_tol=0.01, rel_tol=0.01)
+
+
+def _failed_rows(summary: pd.DataFrame) -> dict[str, list[int]]:
+    return {row["check"]: row["failed_rows"].tolist() for _, row in summary.iterrows()}
+
+
+def test_library_checks_flag_the_expected_rows():
+    failed = _failed_rows(OrderChecks().run_summary())
+
+    assert failed == {
+        "id_present": [3],
+        "id_format": [2, 3],
+        "known_status": [3, 4],
+        "price_range": [1, 2, 3],
+        "shipped_after_placed": [1, 2, 3, 5],
+        "price_as_quoted": [1, 2, 3],
+    }
+
+
+def test_library_checks_match_row_wise_equivalents():
+    df = orders_dataframe()
+
+    def row_wise(price, quoted):
+        if pd.isna(price) or pd.isna(quoted):
+            return False
+        return abs(price - quoted) <= max(0.01, 0.01 * abs(quoted))
+
+    expected = [row_wise(p, q) for p, q in zip(df["price"], df["quoted"])]
+    check = checks.within_tolerance("price", "quoted", abs_tol=0.01, rel_tol=0.01)
+    assert check.callable(price=df["price"], quoted=df["quoted"]).tolist() == expected
+
+
+def test_library_checks_bind_like_hand_written_ones():
+    check = checks.ordered("placed", "shipped", strict=False, name="ships_on_time", timeout=5)
+
+    assert check.name == "ships_on_time"
+    assert list(check.signature.parameters) == ["placed", "shipped"]
+    assert not check.has_scalar_params
+    assert check.row_local and check.timeout == 5
+
+    # picklable, for the ProcessExecutor
+    copy = pickle.loads(pickle.dumps(check))
+    df = orders_dataframe()
+    assert copy.callable(df["placed"], df["shipped"]).tolist() == [True, False, True, False, True, False]
+
+
+def test_library_checks_are_named_after_their_fields():
+    class Prices(Pipeline):
+        alias_map = OrderChecks.alias_map
+        orders = DataSource("orders", orders_dataframe())
+
+        positive = checks.in_range("price", low=0)
+        cheap = checks.in_range("price", high=100)
+        priced = checks.not_null("price")
+        also_priced = priced
+        quoted = checks.not_null("quoted", depends_on=priced)
+
+    pipeline = Prices()
+    assert [fn.name for fn in pipeline.functions] == ["positive", "cheap", "priced", "quoted"]
+    assert pipeline.functions[-1].depends_on == ("priced",)
+    assert _failed_rows(pipeline.run_summary()) == {"positive": [1, 2], "cheap": [2, 3], "priced": [2], "quoted": []}
+
+
+def test_checks_sharing_a_name_raise():
+    class SameName(Pipeline):
+        alias_map = OrderChecks.alias_map
+        positive = checks.in_range("price", low=0, name="price_check")
+        cheap = checks.in_range("price", high=100, name="price_check")
+
+    class AmbiguousDependency(Pipeline):
+        alias_map = OrderChecks.alias_map
+        positive = checks.in_range("price", low=0)
+        cheap = checks.in_range("price", high=100)
+        quoted = checks.not_null("quoted", depends_on=positive)
+
+    with pytest.raises(ValueError, match="price_check"):
+        SameName()
+    with pytest.raises(ValueError, match="price_in_range"):
+        AmbiguousDependency()
+
+
+def test_library_checks_run_chunked():
+    summary = OrderChecks().run_summary(executor=Executor(partitions=3))
+    assert _failed_rows(summary) == _failed_rows(OrderChecks().run_summary())
+
+
+@pytest.mark.parametrize("factory", [
+    lambda: checks.in_range("price"),
+    lambda: checks.in_range("price", low=0, inclusive="all"),
+    lambda: checks.within_tolerance("price", "quoted", abs_tol=-1),
+    lambda: checks.not_null("order id"),
+])
+def test_library_checks_reject_bad_options(factory):
+    with pytest.raises(ValueError):
+        factory()
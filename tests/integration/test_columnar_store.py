@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import BasicPipeline
+from tempcli.core.components.data import DataSource
+from tempcli.core.pipeline import Pipeline
+
+pytest.importorskip("pyarrow")
+from temp_cli.db.columnar import ColumnarStore  # noqa: E402
+
+
+@pytest.mark.parametrize("fmt", ["feather", "parquet"])
+def test_run_summary_streams_to_partitions(tmp_path, fmt):
+    store = ColumnarStore(tmp_path, format=fmt, batch_rows=1_000)
+    pipeline = BasicPipeline()
+    summary = pipeline.run_summary(raise_errors=False, sinks=[store])
+    run_id = summary["run_id"].iloc[0]
+
+    assert store.runs() == [run_id]
+    for row in summary[summary["status"] != "error"].itertuples():
+        out = store.read(run_id, row.data_source, row.check)
+        assert len(out) == row.rows
+        assert out["failed"].sum() == row.failed
+        assert out.index[out["failed"]].tolist() == row.failed_rows.tolist()
+
+
+def test_read_only_opens_one_partition(tmp_path):
+    store = ColumnarStore(tmp_path)
+    pipeline = BasicPipeline()
+    run_id = pipeline.run_summary(raise_errors=False, sinks=[store])["run_id"].iloc[0]
+
+    path = store.partition(run_id, "large_report", "price_below_cool_price")
+    assert [p.name for p in path.iterdir()] == ["part-0.feather"]
+
+    out = store.read(run_id, "large_report", "price_below_cool_price")
+    df = next(ds.data for ds in pipeline.data_sources if ds.name == "large_report")
+    pd.testing.assert_series_equal(out["result"], df["price"] <= df["cool_price"], check_names=False)
+    assert out["columns"].iloc[0] == "price, cool_price"
+
+
+def positive_array(price: pd.Series) -> np.ndarray:
+    return (price > 0).to_numpy()
+
+
+def test_array_results_are_written_row_by_row(tmp_path):
+    class Arrays(Pipeline):
+        alias_map = {"price": "price"}
+        prices = DataSource("prices", pd.DataFrame({"price": [1.0, -2.0, 3.0]}))
+        positive = positive_array
+
+    store = ColumnarStore(tmp_path)
+    run_id = Arrays().run_summary(sinks=[store])["run_id"].iloc[0]
+
+    out = store.read(run_id, "prices", "positive_array")
+    assert out["result"].tolist() == [True, False, True]
+    assert out["failed"].tolist() == [False, True, False]
+
+
+def test_read_missing_partition(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ColumnarStore(tmp_path).read("no-run", "nothing", "nope")
@@ -0,0 +1,116 @@
+import multiprocessing
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import RowLocalPipeline, price_is_positive
+from tempcli.core.components.func import Fn
+from tempcli.core.support.distributed import Coordinator, RangeResult, RangeTask, _merge, run_worker
+
+SPAWN = multiprocessing.get_context("spawn")
+AUTHKEY = b"tempcli-test"
+SORT_KEYS = ["data_source", "check", "columns"]
+
+
+def _comparable(summary: pd.DataFrame) -> pd.DataFrame:
+    return summary.drop(columns=["run_id"]).sort_values(SORT_KEYS).reset_index(drop=True)
+
+
+def _assert_same_summary(expected: pd.DataFrame, actual: pd.DataFrame):
+    expected, actual = _comparable(expected), _comparable(actual)
+    pd.testing.assert_frame_equal(expected.drop(columns="failed_rows"), actual.drop(columns="failed_rows"))
+    for e, a in zip(expected["failed_rows"], actual["failed_rows"]):
+        np.testing.assert_array_equal(e, a)
+
+
+def _start_workers(address, n: int) -> list:
+    workers = [SPAWN.Process(target=run_worker, args=(address, AUTHKEY, RowLocalPipeline)) for _ in range(n)]
+    for w in workers:
+        w.start()
+    return workers
+
+
+@pytest.fixture
+def coordinator():
+    with Coordinator(RowLocalPipeline(), AUTHKEY, chunk_rows=1_500) as c:
+        yield c
+
+
+def test_coordinator_splits_row_local_checks(coordinator):
+    row_local = {f.key: f.row_local for f in coordinator.pipeline.functions}
+    tasks = coordinator.tasks(run_id=None)
+
+    for t in tasks:
+        if row_local[t.fn_key]:
+            assert t.stop - t.start <= 1_500
+        else:
+            assert t.start == 0
+    assert len(tasks) > len(coordinator.pipeline.functions) * len(coordinator.pipeline.data_sources)
+
+
+def test_distributed_matches_serial(coordinator):
+    workers = _start_workers(coordinator.address, 2)
+    summary = coordinator.run_summary(timeout=60)
+    coordinator.close()
+    for w in workers:
+        w.join(timeout=10)
+
+    _assert_same_summary(RowLocalPipeline().run_summary(raise_errors=False), summary)
+
+
+def test_distributed_retries_when_a_worker_dies(coordinator, monkeypatch, tmp_path):
+    monkeypatch.setenv("TEMPCLI_CRASH_MARKER", str(tmp_path / "crashed"))
+    workers = _start_workers(coordinator.address, 2)
+    summary = coordinator.run_summary(timeout=60)
+    coordinator.close()
+    for w in workers:
+        w.join(timeout=10)
+
+    assert sorted(w.exitcode for w in workers) == [0, 1]
+    # the dead worker's handler was gone, so it wasn't left a stop to take
+    assert not coordinator._handlers and coordinator._pending.empty()
+    _assert_same_summary(RowLocalPipeline().run_summary(raise_errors=False), summary)
+
+
+def test_coordinator_refuses_gated_timed_and_budgeted_checks():
+    class Gated(RowLocalPipeline):
+        gated_check = Fn(price_is_positive, depends_on="price_below_cool_price", on_upstream_failure="passing_rows")
+
+    with pytest.raises(ValueError, match=r"price_is_positive \(depends_on\)"):
+        Coordinator(Gated(), AUTHKEY)
+
+    class Timed(RowLocalPipeline):
+        timed_check = Fn(price_is_positive, timeout=5)
+
+    with pytest.raises(ValueError, match="timeout"):
+        Coordinator(Timed(), AUTHKEY)
+
+
+def test_a_check_with_an_errored_range_is_one_error():
+    data_key, fn_key, run_id = uuid4(), uuid4(), uuid4()
+    tasks = [RangeTask(i, run_id, data_key, fn_key, start, start + 10) for i, start in enumerate((0, 10, 20))]
+
+    def ok(task: RangeTask, failed: list[int]) -> RangeResult:
+        row = {
+            "run_id": run_id, "data_source": "prices", "data_key": data_key, "check": "positive", "fn_key": fn_key,
+            "columns": "price", "rows": 10, "failed": len(failed), "failure_rate": len(failed) / 10,
+            "failed_rows": np.array(failed, dtype=np.int64), "status": "fail" if failed else "pass", "message": None,
+        }
+        return RangeResult(task.task_id, task.start, [row])
+
+    results = {
+        0: ok(tasks[0], [3]),
+        1: RangeResult(1, 10, [{"status": "error", "message": "ValueError: broken"}]),
+        2: ok(tasks[2], [25]),
+    }
+    summary = _merge(tasks, results, {data_key: "prices", fn_key: "positive"})
+    assert summary["status"].tolist() == ["error"]
+    assert summary["message"].tolist() == ["rows 10-20: ValueError: broken"]
+    assert summary["failed_rows"].iloc[0].tolist() == []
+
+    results[1] = ok(tasks[1], [])
+    summary = _merge(tasks, results, {data_key: "prices", fn_key: "positive"})
+    assert summary["status"].tolist() == ["fail"]
+    assert (summary["rows"].iloc[0], summary["failed_rows"].iloc[0].tolist()) == (30, [3, 25])
@@ -0,0 +1,82 @@
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import BasicPipeline, always_raises, large_dataframe
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.support.executor import ProcessExecutor, Task, ThreadExecutor
+from tempcli.core.support.shared import SharedFrame
+
+SPAWN = multiprocessing.get_context("spawn")
+SORT_KEYS = ["data_source", "check", "columns"]
+
+
+def _comparable(summary: pd.DataFrame) -> pd.DataFrame:
+    out = summary.drop(columns=["run_id", "failed_rows"]).sort_values(SORT_KEYS)
+    return out.reset_index(drop=True)
+
+
+def test_shared_frame_round_trip():
+    """numeric columns are shared zero-copy and read-only, everything else is pickled"""
+    df = large_dataframe(100)
+    with SharedFrame.create(df) as frame:
+        assert {c.name for c in frame.shared} == {"iid", "price", "cool_price"}
+        assert list(frame.pickled.columns) == ["category"]
+
+        attached = frame.attach()
+        pd.testing.assert_frame_equal(attached, df, check_dtype=False)
+        assert not attached["price"].to_numpy().flags.writeable
+        names = frame.segment_names
+        del attached
+
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name, track=False)
+
+
+def test_process_executor_matches_serial():
+    pipeline = BasicPipeline()
+    serial = pipeline.run_summary(raise_errors=False)
+
+    executor = ProcessExecutor(max_workers=2, mp_context=SPAWN)
+    parallel = pipeline.run_summary(raise_errors=False, executor=executor)
+
+    pd.testing.assert_frame_equal(_comparable(serial), _comparable(parallel))
+    for s, p in zip(serial["failed_rows"], parallel["failed_rows"]):
+        np.testing.assert_array_equal(s, p)
+
+
+@pytest.mark.parametrize("partitions", [1, 3])
+def test_thread_executor_matches_serial(partitions):
+    pipeline = BasicPipeline()
+    serial = pipeline.run_summary(raise_errors=False)
+    threaded = pipeline.run_summary(raise_errors=False, executor=ThreadExecutor(max_workers=4, partitions=partitions))
+
+    pd.testing.assert_frame_equal(_comparable(serial), _comparable(threaded))
+
+
+def test_process_executor_cleans_up_on_failure(monkeypatch):
+    created = []
+    original = SharedFrame.create.__func__
+
+    def tracking_create(cls, frame):
+        shared = original(cls, frame)
+        created.extend(shared.segment_names)
+        return shared
+
+    monkeypatch.setattr(SharedFrame, "create", classmethod(tracking_create))
+
+    ds = DataSource("large", large_dataframe(1_000))
+    pipeline = BasicPipeline()
+    tasks = [Task(ds, Fn(always_raises))]
+    with pytest.raises(ZeroDivisionError):
+        list(ProcessExecutor(max_workers=1, mp_context=SPAWN).map(pipeline.alias_map, tasks))
+
+    assert created
+    for name in created:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name, track=False)
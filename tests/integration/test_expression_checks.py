@@ -0,0 +1,83 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import BasicPipeline
+from tempcli.core import checks
+from tempcli.core.components.data import DataSource
+from tempcli.core.pipeline import Pipeline
+from tempcli.core.support.executor import ThreadExecutor
+from tempcli.core.support.expression import CompiledExpression
+
+
+class ExpressionPipeline(BasicPipeline):
+    price_check = None  # replaced by the expression below
+    date_check = None
+
+    price_cap = "price <= cool_price * 1.5"
+    dates_in_2025 = "'2025-01-01' <= start < '2026-01-01' and end > start"
+    sane_price = "not isna(price) and abs(price - cool_price) < 2000"
+
+
+def test_expressions_run_like_functions():
+    summary = ExpressionPipeline().run_summary(raise_errors=False)
+    rows = summary[summary["data_source"] == "basic_report"].set_index("check")
+
+    assert list(rows.index) == ["price_cap", "dates_in_2025", "sane_price"]
+    # price 200.01 > 150.015 and 304.2 > 3.3
+    assert rows.loc["price_cap", "failed_rows"].tolist() == [1, 3]
+    assert rows.loc["dates_in_2025", "failed"] == 0
+    assert rows.loc["sane_price", "failed_rows"].tolist() == [2]
+
+    threaded = ExpressionPipeline().run_summary(raise_errors=False, executor=ThreadExecutor(max_workers=2))
+    assert threaded["failed"].tolist() == summary["failed"].tolist()
+
+
+def test_expression_matches_the_python_version():
+    df = pd.DataFrame({"price": [1.0, 5.0, np.nan, 3.0], "cool_price": [2.0, 2.0, 1.0, np.nan]})
+    compiled = CompiledExpression("price <= cool_price * 1.5 or price in (3, 4)")
+
+    assert compiled.params == ("price", "cool_price")
+    expected = [(p <= c * 1.5) or (p in (3, 4)) for p, c in zip(df["price"], df["cool_price"])]
+    assert compiled.evaluate(df["price"], df["cool_price"]).tolist() == expected
+
+    # compiled again after pickling, for the ProcessExecutor
+    copy = pickle.loads(pickle.dumps(checks.expression("price > 2")))
+    assert copy.name == "price > 2"
+    assert copy.callable(df["price"]).tolist() == [False, True, False, True]
+
+
+def test_missing_strings_fail_ordering_comparisons():
+    starts = pd.Series(["2025-03-01", None, "2024-12-31", np.nan])
+    typed = starts.astype("string")
+    compiled = CompiledExpression("'2025-01-01' <= start < '2026-01-01'")
+
+    assert compiled.evaluate(starts).tolist() == [True, False, False, False]
+    assert compiled.evaluate(typed).tolist() == [True, False, False, False]
+    assert CompiledExpression("start >= end").evaluate(starts, typed).tolist() == [True, False, True, False]
+
+
+@pytest.mark.parametrize("source", [
+    "price.real > 0",
+    "price[0] > 0",
+    "__import__('os')",
+    "max(price) > 0",
+    "price in cool_price",
+    "1 < 2",
+    "lambda: price",
+])
+def test_expression_rejects_unsupported_syntax(source):
+    with pytest.raises(ValueError):
+        CompiledExpression(source)
+
+
+def test_expression_must_read_alias_map_parameters():
+    class Typo(Pipeline):
+        alias_map = {"price": "price"}
+        prices = DataSource("prices", pd.DataFrame({"price": [1.0]}))
+        positive = "pirce > 0"
+
+    with pytest.raises(ValueError, match="pirce"):
+        Typo()
@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import large_dataframe
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.pipeline import Pipeline
+from tempcli.core.support.budget import FailureBudget
+from tempcli.core.support.executor import Executor, ThreadExecutor
+
+calls = []
+
+
+def never_passes(price: pd.Series) -> pd.Series:
+    calls.append(len(price))
+    return price < 0
+
+
+def also_never_passes(cool_price: pd.Series) -> pd.Series:
+    return cool_price < 0
+
+
+def cheap_enough(price: pd.Series, cool_price: pd.Series) -> pd.Series:
+    return price < 0
+
+
+class BrokenFeedPipeline(Pipeline):
+    alias_map = {"price": "price", "cool_price": "cool_price"}
+
+    feed = DataSource("feed", large_dataframe(10_000))
+
+    first = Fn(never_passes, row_local=True, budget=FailureBudget(max_failures=100, chunk_rows=1_000))
+    second = also_never_passes
+    third = cheap_enough
+
+
+def test_failure_budget_limits():
+    budget = FailureBudget(max_failure_rate=0.5, min_rows=10)
+    assert not budget.exceeded(9, 9)
+    assert budget.exceeded(6, 10)
+    assert FailureBudget(max_failures=3).exceeded(4, 1_000_000)
+    with pytest.raises(ValueError):
+        FailureBudget()
+
+
+@pytest.mark.parametrize("partitions, expected_rows", [(1, 1_000), (4, 4_000)])
+def test_check_stops_after_its_budget(partitions, expected_rows):
+    calls.clear()
+    pipeline = BrokenFeedPipeline()
+    pipeline.functions = [f for f in pipeline.functions if f.name == "never_passes"]
+
+    summary = pipeline.run_summary(executor=Executor(partitions=partitions))
+    row = summary.iloc[0]
+    assert row["rows"] == expected_rows
+    assert row["failed"] == expected_rows
+    assert row["status"] == "fail"
+    assert "failure budget" in row["message"]
+    assert sum(calls) == expected_rows  # the rest of the column never ran
+
+
+@pytest.mark.parametrize("executor", [Executor(), ThreadExecutor(max_workers=1)])
+def test_run_budget_cancels_remaining_checks(executor):
+    summary = BrokenFeedPipeline().run_summary(executor=executor, budget=FailureBudget(max_failure_rate=0.5))
+
+    assert len(summary) == 3
+    assert (summary["status"] == "fail").sum() == 1
+    assert (summary["status"] == "cancelled").sum() == 2
+    assert summary.loc[summary["status"] == "cancelled", "rows"].eq(0).all()
+
+
+def test_run_without_budget_runs_everything():
+    summary = BrokenFeedPipeline().run_summary()
+    assert summary["status"].eq("fail").all()
+    assert summary.loc[summary["check"] == "also_never_passes", "rows"].item() == 10_000
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.pipeline import Pipeline
+
+TOLERANCES = [0.01, 0.5, 2.0]
+CALLS = []
+
+
+def near(price: pd.Series, cool_price: pd.Series, tolerance: float = 0.1) -> pd.Series:
+    """works on arrays too, so the whole grid runs in one broadcasted call"""
+    CALLS.append(np.shape(tolerance))
+    return abs(price - cool_price) <= tolerance * abs(cool_price)
+
+
+def near_series_only(price: pd.Series, cool_price: pd.Series, tolerance: float = 0.1) -> pd.Series:
+    """uses pd.Series methods, so each grid point runs on its own"""
+    return (price - cool_price).abs() <= tolerance * cool_price.abs()
+
+
+def within_deviations(price: pd.Series, tol: float = 1.0) -> pd.Series:
+    """works on arrays too, but np.mean and np.std don't skip the missing price like pd.Series.mean and std"""
+    return abs(price - price.mean()) <= tol * price.std()
+
+
+def near_scalar(price: float, cool_price: float, tolerance: float = 0.1) -> bool:
+    return abs(price - cool_price) <= tolerance * abs(cool_price)
+
+
+class GridPipeline(Pipeline):
+    alias_map = {"price": "price", "cool_price": "cool_price"}
+
+    prices = DataSource("prices", pd.DataFrame({
+        "price": [100.0, 200.01, 30.03, 304.20, 23.99, 89.11],
+        "cool_price": [100.5, 100.01, 2039.03, 2.20, 40.99, 289.11],
+    }))
+
+    broadcast = Fn(near, grid={"tolerance": TOLERANCES}, broadcast=True)
+    one_at_a_time = Fn(near_series_only, grid={"tolerance": TOLERANCES})
+    scalar = Fn(near_scalar, grid={"tolerance": TOLERANCES})
+
+
+def _expected(tolerance: float) -> list[bool]:
+    df = GridPipeline.prices.data
+    return [abs(p - c) <= tolerance * abs(c) for p, c in zip(df["price"], df["cool_price"])]
+
+
+def test_one_result_per_grid_point():
+    CALLS.clear()
+    pipeline = GridPipeline()
+    pipeline.run_summary()
+
+    assert CALLS == [(len(TOLERANCES), 1)]  # every point in one call
+    for fn in pipeline.functions:
+        results = pipeline.results[(GridPipeline.prices.key, fn.key)].unwrap()
+        assert [r.kwargs for r in results] == [
+            {"price": "price", "cool_price": "cool_price", "tolerance": t} for t in TOLERANCES
+        ]
+        for r, t in zip(results, TOLERANCES):
+            assert r.result.tolist() == _expected(t), (fn.name, t)
+        assert len({r.uuid for r in results}) == len(TOLERANCES)
+
+
+def test_grid_points_in_the_summary():
+    summary = GridPipeline().run_summary(value_bounds=True)
+    rows = summary[summary["check"] == "near"]
+
+    assert rows["columns"].tolist() == [f"price, cool_price (tolerance={t})" for t in TOLERANCES]
+    assert rows["failed"].tolist() == [6 - sum(_expected(t)) for t in TOLERANCES]
+    assert all(set(bounds) <= {"price", "cool_price"} for bounds in rows["offending_min"])
+
+
+def test_grid_points_are_called_with_series_unless_broadcast():
+    prices = pd.DataFrame({"price": [1.0, 2.0, 3.0, 10.0, np.nan]})
+
+    class Deviations(Pipeline):
+        alias_map = {"price": "price"}
+        source = DataSource("prices", prices)
+        deviations = Fn(within_deviations, grid={"tol": [1.0]})
+
+    # mean 4 and std 4.1 of the prices there are: 10 is too far out, and the missing price fails
+    assert (~within_deviations(prices["price"])).to_numpy().nonzero()[0].tolist() == [3, 4]
+    assert Deviations().run_summary()["failed_rows"].map(list).tolist() == [[3, 4]]
+
+
+def test_grid_of_several_parameters():
+    def between(price: pd.Series, low: float = 0, high: float = 1) -> pd.Series:
+        return (low <= price) & (price <= high)
+
+    fn = Fn(between, grid={"low": [0, 50], "high": [100, 300]})
+    assert fn.param_names == {"price"}
+    assert not fn.has_scalar_params
+    assert fn.grid_points == [
+        {"low": 0, "high": 100}, {"low": 0, "high": 300}, {"low": 50, "high": 100}, {"low": 50, "high": 300},
+    ]
+
+
+@pytest.mark.parametrize("grid", [{"threshold": [1]}, {"tolerance": []}, {}])
+def test_bad_grids(grid):
+    with pytest.raises(ValueError):
+        Fn(near, grid=grid)
+
+
+def test_broadcast_needs_a_grid_of_series_checks():
+    with pytest.raises(ValueError):
+        Fn(near, broadcast=True)
+    with pytest.raises(ValueError):
+        Fn(near_scalar, grid={"tolerance": TOLERANCES}, broadcast=True)
@@ -0,0 +1,115 @@
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import category_totals_match, prices_rise
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.pipeline import Pipeline
+from tempcli.core.support.executor import ProcessExecutor, ThreadExecutor
+from tempcli.core.support.group import Groups
+
+SPAWN = multiprocessing.get_context("spawn")
+
+
+def ledger() -> pd.DataFrame:
+    return pd.DataFrame({
+        "category": ["A", "B", "A", "B", "A", None, "C"],
+        "start date": pd.to_datetime([
+            "2025-01-03", "2025-01-01", "2025-01-01", "2025-01-02", "2025-01-02", "2025-01-01", "2025-01-01",
+        ]),
+        "price": [3.0, 5.0, 1.0, 4.0, 2.0, 9.0, 7.0],
+        "total": [6.0, 9.0, 6.0, 9.0, 6.0, 9.0, 8.0],
+    })
+
+
+def group_is_small(price: pd.Series) -> bool:
+    return len(price) < 3
+
+
+class LedgerChecks(Pipeline):
+    alias_map = {"category": "category", "start": "start date", "price": "price", "total": "total"}
+
+    ledger = DataSource("ledger", ledger())
+
+    rising = Fn(prices_rise, group_by="category")
+    totals = Fn(category_totals_match, group_by="category")
+
+
+def test_grouped_checks_run_per_group():
+    pipeline = LedgerChecks()
+    summary = pipeline.run_summary().set_index("check")
+
+    # B falls from 5 to 4 on row 3, A rises 1, 2, 3 when ordered by date
+    assert summary.loc["prices_rise", "failed_rows"].tolist() == [3]
+    # C adds up to 7, not 8
+    assert summary.loc["category_totals_match", "failed_rows"].tolist() == [6]
+    # a single verdict for a group goes to each of its rows; missing keys form a group of their own
+    small = Fn(group_is_small, group_by="category")
+    [fn_result] = pipeline.alias_map.generate_results(LedgerChecks.ledger, small).unwrap()
+    assert fn_result.result.tolist() == [False, True, False, True, False, True, True]
+
+
+def test_groups_are_built_once_and_shared():
+    pipeline = LedgerChecks()
+    pipeline.run_summary(executor=ThreadExecutor(max_workers=4))
+    pipeline.run_summary()
+    assert pipeline.alias_map.groups.builds == 1
+
+    groups = pipeline.alias_map.groups.groups(LedgerChecks.ledger, ("category",))
+    assert groups.codes.tolist() == [0, 1, 0, 1, 0, 2, 3]
+    assert groups.order.tolist() == [0, 2, 4, 1, 3, 5, 6]
+    assert groups.sizes.tolist() == [3, 2, 1, 1]
+    assert groups.unsort(groups.sort(np.arange(7))).tolist() == list(range(7))
+
+
+def test_grouped_checks_see_slices_in_row_order():
+    seen = []
+
+    def record(price: pd.Series) -> pd.Series:
+        seen.append(price.index.tolist())
+        return price > 0
+
+    class Recorded(LedgerChecks):
+        rising = totals = None
+        recorded = Fn(record, group_by=("category", "total"))
+
+    Recorded().run_summary()
+    assert seen == [[0, 2, 4], [1, 3], [5], [6]]
+
+
+def test_grouped_checks_in_worker_processes():
+    summary = LedgerChecks().run_summary(executor=ProcessExecutor(max_workers=2, mp_context=SPAWN))
+    assert summary.set_index("check")["failed_rows"].tolist() == [[3], [6]]
+
+
+def test_bad_grouped_checks():
+    def wrong_length(price: pd.Series) -> np.ndarray:
+        return np.ones(1, dtype=bool)
+
+    class NoKey(Pipeline):
+        alias_map = {"price": "price", "category": "category"}
+        prices = DataSource("prices", pd.DataFrame({"price": [1.0, 2.0]}))
+        check = Fn(wrong_length, group_by="category")
+
+    with pytest.raises(KeyError, match="Can't group"):
+        NoKey().run_summary()
+
+    fn = Fn(wrong_length, group_by="category", raise_on_error=False)
+    data = DataSource("ledger", ledger())
+    assert LedgerChecks().alias_map.generate_results(data, fn).unwrap() == [None]
+
+    def scalar(price: float) -> bool:
+        return price > 0
+
+    def takes_groups(price: pd.Series, groups: Groups) -> pd.Series:
+        return price > 0
+
+    with pytest.raises(ValueError, match="pd.Series"):
+        Fn(scalar, group_by="category")
+    with pytest.raises(ValueError, match="no group_by"):
+        Fn(takes_groups)
+    with pytest.raises(ValueError, match="grid"):
+        Fn(takes_groups, group_by="category", grid={"price": [1]})
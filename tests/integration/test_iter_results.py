@@ -0,0 +1,61 @@
+import asyncio
+import threading
+
+import pandas as pd
+
+from helpers.pipeline_helpers import BasicPipeline
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.support.executor import ThreadExecutor
+
+released = threading.Event()
+
+
+def waits_for_consumer(price: pd.Series) -> pd.Series:
+    """only finishes once the consumer has seen another result"""
+    assert released.wait(timeout=5), "iter_results held back a finished result"
+    return price > 0
+
+
+def quick(price: pd.Series) -> pd.Series:
+    return price > 0
+
+
+class StreamingPipeline(BasicPipeline):
+    slow = Fn(waits_for_consumer)
+    fast = Fn(quick)
+
+
+def test_iter_results_yields_as_completed():
+    released.clear()
+    pipeline = StreamingPipeline()
+    pipeline.data_sources = [ds for ds in pipeline.data_sources if ds.name == "basic_report"]
+    pipeline.functions = [f for f in pipeline.functions if f.name in ("waits_for_consumer", "quick")]
+
+    order = []
+    for data, fn, result in pipeline.iter_results(executor=ThreadExecutor(max_workers=2)):
+        order.append(fn.name)
+        assert isinstance(data, DataSource)
+        assert result.is_ok()
+        released.set()
+    assert order == ["quick", "waits_for_consumer"]
+
+
+def test_iter_results_matches_run_summary():
+    pipeline = BasicPipeline()
+    summary = pipeline.run_summary(raise_errors=False)
+    streamed = list(pipeline.iter_results(raise_errors=False))
+
+    assert len(streamed) == len(pipeline.tasks())
+    assert {(d.name, f.name) for d, f, _ in streamed} == set(zip(summary["data_source"], summary["check"]))
+
+
+def test_aiter_results():
+    pipeline = BasicPipeline()
+
+    async def collect():
+        return [(d.name, f.name, r.is_ok()) async for d, f, r in pipeline.aiter_results(raise_errors=False)]
+
+    streamed = asyncio.run(collect())
+    assert len(streamed) == len(pipeline.tasks())
+    assert sum(ok for *_, ok in streamed) == 3
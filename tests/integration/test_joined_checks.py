@@ -0,0 +1,129 @@
+import gc
+import pickle
+import weakref
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.pipeline import Pipeline
+from tempcli.core.support.executor import ThreadExecutor
+from tempcli.core.support.join import UNPICKLED_JOINS, WORKER_JOINS, Join
+
+REFERENCE = DataSource("reference_prices", pd.DataFrame({
+    "iid": [1003, 1001, 1000, 1002, 1000],
+    "price": [300.0, 200.0, 100.0, 31.0, -1.0],  # the second 1000 is never used
+    "currency": ["USD", "EUR", "USD", "USD", "USD"],
+}))
+
+
+def near_reference(price: pd.Series, ref_price: pd.Series) -> pd.Series:
+    return (price - ref_price).abs() <= 0.05 * ref_price
+
+
+def same_currency(currency: str, ref_currency: str) -> bool:
+    return currency == ref_currency
+
+
+class PositionChecks(Pipeline):
+    alias_map = {"iid": ["iid", "Item"], "price": ["price", "Px"], "currency": "currency"}
+
+    positions = DataSource("positions", pd.DataFrame({
+        "iid": [1000, 1001, 1002, 1003, 1004],
+        "price": [101.0, 250.0, 30.5, 299.0, 10.0],
+        "currency": ["USD", "EUR", "USD", "EUR", "USD"],
+    }))
+    more_positions = DataSource("more_positions", pd.DataFrame({
+        "Item": [1002, 1000],
+        "Px": [40.0, 100.0],
+        "currency": ["USD", "USD"],
+    }))
+
+    price_check = Fn(near_reference, joins={"ref_price": Join(REFERENCE, column="price", on="iid")})
+    currency_check = Fn(same_currency, joins={"ref_currency": Join(REFERENCE, column="currency", on="iid")})
+
+
+def test_joined_parameters_line_up_on_the_key():
+    pipeline = PositionChecks()
+    summary = pipeline.run_summary().set_index(["data_source", "check"])
+
+    # 1004 isn't in the reference, so its reference values are missing and it fails
+    assert summary.loc[("positions", "near_reference"), "failed_rows"].tolist() == [1, 4]
+    assert summary.loc[("positions", "same_currency"), "failed_rows"].tolist() == [3, 4]
+    assert summary.loc[("more_positions", "near_reference"), "failed_rows"].tolist() == [0]
+    assert summary.loc[("positions", "near_reference"), "columns"] == "price, reference_prices.price"
+
+    [fn_result] = pipeline.results[(PositionChecks.positions.key, pipeline.functions[0].key)].unwrap()
+    assert fn_result.kwargs == {"price": "price", "ref_price": "reference_prices.price"}
+
+
+def test_join_indexes_are_built_once():
+    pipeline = PositionChecks()
+    pipeline.run_summary(executor=ThreadExecutor(max_workers=4))
+    pipeline.run_summary()
+
+    # one index of the reference on `iid`, shared by both checks, both sources and both runs
+    assert pipeline.alias_map.joins.builds == 1
+
+    index, rows = pipeline.alias_map.joins.index(REFERENCE, "iid")
+    assert index.tolist() == [1003, 1001, 1000, 1002]
+    assert rows.tolist() == [0, 1, 2, 3]
+    positions = pipeline.alias_map.joins.positions(PositionChecks.positions, "iid", REFERENCE, "iid")
+    assert positions.tolist() == [2, 1, 3, 0, -1]
+
+
+def test_join_indexes_are_built_once_per_worker_process():
+    pipeline = PositionChecks()
+    fn = Fn(near_reference, joins={"ref_price": Join(REFERENCE, column="price", on="iid")})
+    before = WORKER_JOINS.builds
+
+    # each task a worker runs unpickles its own copy of the alias map and the check
+    for _ in range(3):
+        alias_map, task_fn = pickle.loads(pickle.dumps((pipeline.alias_map, fn)))
+        assert alias_map.joins is WORKER_JOINS
+        alias_map.generate_results(PositionChecks.positions, task_fn).unwrap()
+    assert WORKER_JOINS.builds == before + 1
+
+    # a worker only keeps its most recent Joins, and their indexes go with them
+    join = pickle.loads(pickle.dumps(fn)).joins["ref_price"]
+    source = weakref.ref(join.source.data)
+    for _ in range(UNPICKLED_JOINS):
+        pickle.loads(pickle.dumps(Join(REFERENCE, column="price", on="iid")))
+    del join, task_fn
+    gc.collect()
+    assert source() is None
+
+
+def test_unresolvable_joins():
+    class NoKey(Pipeline):
+        alias_map = {"price": "price"}
+        positions = DataSource("positions", pd.DataFrame({"price": [1.0]}))
+        price_check = Fn(near_reference, joins={"ref_price": Join(REFERENCE, column="price", on="iid")})
+
+    with pytest.raises(KeyError, match="Can't join `ref_price`"):
+        NoKey().run_summary()
+    summary = NoKey().run_summary(raise_errors=False)
+    assert summary["status"].tolist() == ["error"]
+
+    with pytest.raises(ValueError):
+        Fn(near_reference, joins={"reference": Join(REFERENCE, column="price", on="iid")})
+    with pytest.raises(TypeError):
+        Fn(near_reference, joins={"ref_price": REFERENCE})
+
+
+def test_missing_keys_give_missing_values():
+    pipeline = PositionChecks()
+    seen = {}
+
+    def record(price: pd.Series, ref_price: pd.Series) -> pd.Series:
+        seen["ref_price"] = ref_price
+        return price > 0
+
+    fn = Fn(record, joins={"ref_price": Join(REFERENCE, column="price", on="iid")})
+    pipeline.alias_map.generate_results(PositionChecks.positions, fn).unwrap()
+
+    assert seen["ref_price"].index.equals(PositionChecks.positions.data.index)
+    assert seen["ref_price"].tolist()[:4] == [100.0, 200.0, 31.0, 300.0]
+    assert np.isnan(seen["ref_price"].iloc[4])
@@ -0,0 +1,86 @@
+import multiprocessing
+
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import large_dataframe, price_below_cool_price, price_is_positive
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.pipeline import Pipeline
+from tempcli.core.support.executor import Executor, ProcessExecutor, ThreadExecutor
+from tempcli.core.support.memory import MemoryGovernor, estimate_task_bytes
+
+SPAWN = multiprocessing.get_context("spawn")
+
+
+class LargePipeline(Pipeline):
+    alias_map = {"price": "price", "cool_price": "cool_price"}
+
+    def large_report() -> pd.DataFrame:
+        return large_dataframe()
+
+    price_check = Fn(price_below_cool_price, row_local=True)
+    whole_check = price_is_positive
+
+
+def _task(pipeline, row_local: bool):
+    return next(t for t in pipeline.tasks() if t.fn.row_local == row_local)
+
+
+def test_estimate_scales_with_rows():
+    pipeline = LargePipeline()
+    task = _task(pipeline, row_local=True)
+
+    small = estimate_task_bytes(pipeline.alias_map, task.fn, task.data)
+    bigger = DataSource("large_report", large_dataframe(n_rows=40_000))
+    assert estimate_task_bytes(pipeline.alias_map, task.fn, bigger) == pytest.approx(4 * small)
+
+
+def test_row_local_checks_are_chunked_to_fit():
+    pipeline = LargePipeline()
+    task = _task(pipeline, row_local=True)
+    estimate = estimate_task_bytes(pipeline.alias_map, task.fn, task.data)
+
+    governor = MemoryGovernor(estimate // 2, workers=2)
+    n_bytes, chunk_rows = governor.plan(pipeline.alias_map, task.fn, task.data)
+    assert n_bytes <= estimate // 4
+    assert chunk_rows == pytest.approx(len(task.data.value) / 4, abs=1)
+
+    whole = _task(pipeline, row_local=False)
+    # not row_local, so it runs whole and alone rather than in chunks
+    assert governor.plan(pipeline.alias_map, whole.fn, whole.data) == (estimate // 2, None)
+
+
+@pytest.mark.parametrize("make_executor", [
+    lambda limit: Executor(memory_limit=limit),
+    lambda limit: ThreadExecutor(max_workers=4, memory_limit=limit),
+    lambda limit: ProcessExecutor(max_workers=2, mp_context=SPAWN, memory_limit=limit),
+], ids=["serial", "thread", "process"])
+def test_budgeted_run_matches_unbudgeted(make_executor):
+    pipeline = LargePipeline()
+    expected = pipeline.run_summary()
+    task = _task(pipeline, row_local=True)
+    limit = estimate_task_bytes(pipeline.alias_map, task.fn, task.data) // 3
+
+    summary = pipeline.run_summary(executor=make_executor(limit))
+
+    columns = ["data_source", "check", "rows", "failed", "status"]
+    pd.testing.assert_frame_equal(summary[columns], expected[columns])
+    report = summary.attrs["memory"]
+    assert report["limit"] == limit
+    assert 0 < report["peak_reserved"] <= limit
+    assert report["peak_rss"] > 0
+    assert "price_below_cool_price" in report["chunked"]
+    assert "memory" not in expected.attrs
+
+
+def test_reservations_serialize_under_pressure():
+    governor = MemoryGovernor(100, workers=2)
+
+    assert governor.try_acquire(60)
+    assert not governor.try_acquire(60)  # would go over the limit
+    governor.release(60)
+    assert governor.try_acquire(150)  # over the whole limit, but nothing else runs
+    governor.release(150)
+    assert governor.in_use == 0
+    assert governor.peak_reserved == 150
@@ -0,0 +1,151 @@
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import price_sanity
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.pipeline import Pipeline
+from tempcli.core.support.executor import ProcessExecutor
+from tempcli.core.support.window import Rolling, Window
+
+SPAWN = multiprocessing.get_context("spawn")
+CALLS = []
+
+TODAY = pd.Timestamp("2025-06-01")
+INCEPTION = pd.Timestamp("2020-01-01")
+
+
+def date_sanity(start: pd.Series) -> dict:
+    CALLS.append(len(start))
+    parsed = pd.to_datetime(start, errors="coerce")
+    return {
+        "parseable": parsed.notna() | start.isna(),
+        "not_in_future": ~(parsed > TODAY),
+        "after_inception": ~(parsed < INCEPTION),
+    }
+
+
+def group_sanity(price: pd.Series) -> dict:
+    return {"has_rows": len(price) > 0, "sums_up": price.sum() < 100}
+
+
+def moves(price: pd.Series, rolling: Rolling) -> pd.DataFrame:
+    change = rolling.change("price")
+    return pd.DataFrame({"no_jump": ~(change > 0.5), "no_drop": ~(change < -0.5)})
+
+
+class Orders(Pipeline):
+    alias_map = {"start": "start", "price": "price", "cool_price": "cool_price", "category": "category"}
+
+    orders = DataSource("orders", pd.DataFrame({
+        "start": ["2024-01-01", "garbage", "2030-01-01", "1999-12-31", None],
+        "price": [10.0, np.nan, -5.0, 20.0, 99.0],
+        "cool_price": [20.0, 1.0, 1.0, 10.0, 100.0],
+        "category": ["A", "A", "B", "B", "B"],
+    }))
+
+    dates = Fn(date_sanity)
+    prices = Fn(price_sanity, row_local=True)
+
+
+def test_outputs_are_split_into_named_results():
+    CALLS.clear()
+    summary = Orders().run_summary().set_index("check")
+
+    assert summary.index.tolist() == [
+        "date_sanity.parseable",
+        "date_sanity.not_in_future",
+        "date_sanity.after_inception",
+        "price_sanity.present",
+        "price_sanity.positive",
+        "price_sanity.below_cool_price",
+    ]
+    assert CALLS == [5]  # one pass for the three date verdicts
+    assert summary.loc["date_sanity.parseable", "failed_rows"].tolist() == [1]
+    assert summary.loc["date_sanity.not_in_future", "failed_rows"].tolist() == [2]
+    assert summary.loc["date_sanity.after_inception", "failed_rows"].tolist() == [3]
+    assert summary.loc["price_sanity.present", "failed_rows"].tolist() == [1]
+    assert summary.loc["price_sanity.positive", "failed_rows"].tolist() == [1, 2]
+    assert summary.loc["price_sanity.below_cool_price", "failed_rows"].tolist() == [1, 3]
+    assert summary["columns"].tolist() == ["start"] * 3 + ["price, cool_price"] * 3
+    assert summary["fn_key"].nunique() == 2
+
+
+def test_outputs_survive_partitions_chunks_and_processes():
+    whole = Orders().run_summary()
+    pipeline = Orders()
+    [fn_result, *_] = pipeline.alias_map.generate_results(Orders.orders, Orders.prices, partitions=3).unwrap()
+    assert fn_result.output == "present"
+    assert fn_result.result.tolist() == [True, False, True, True, True]
+    chunked = pipeline.alias_map.generate_results(Orders.orders, Orders.prices, chunk_rows=2).unwrap()
+    assert [r.output for r in chunked] == ["present", "positive", "below_cool_price"]
+    assert chunked[2].result.tolist() == [True, False, True, False, True]
+
+    spawned = Orders().run_summary(executor=ProcessExecutor(max_workers=2, mp_context=SPAWN))
+    assert spawned["check"].tolist() == whole["check"].tolist()
+    assert spawned["failed"].tolist() == whole["failed"].tolist()
+
+
+def test_grouped_and_windowed_outputs():
+    alias_map = Orders().alias_map
+    [has_rows, sums_up] = alias_map.generate_results(Orders.orders, Fn(group_sanity, group_by="category")).unwrap()
+    assert has_rows.result.tolist() == [True] * 5
+    assert sums_up.result.tolist() == [True, True, False, False, False]  # B adds up to 114
+
+    data = DataSource("series", pd.DataFrame({
+        "start": pd.date_range("2025-01-01", periods=6),
+        "price": [10.0, 16.0, 15.0, 5.0, 5.0, 9.0],
+    }))
+    fn = Fn(moves, window=Window("start", 2))
+    whole = alias_map.generate_results(data, fn).unwrap()
+    chunked = alias_map.generate_results(data, fn, chunk_rows=2).unwrap()
+    for a, b in zip(whole, chunked):
+        assert a.output == b.output
+        pd.testing.assert_series_equal(a.result, b.result, check_names=False)
+    assert np.flatnonzero(~whole[0].result).tolist() == [1, 5]
+    assert np.flatnonzero(~whole[1].result).tolist() == [3]
+
+
+def test_unwrapped_multi_output_check_is_not_a_data_source():
+    def price_signs(price: pd.Series) -> pd.DataFrame:
+        return pd.DataFrame({"positive": price > 0, "small": price < 50})
+
+    class Signs(Orders):
+        dates = prices = None
+        signs = price_signs
+
+        def extra() -> pd.DataFrame:  # a factory takes no arguments, so it is still a data source
+            return pd.DataFrame({"price": [1.0, 60.0]})
+
+    pipeline = Signs()
+    assert [ds.name for ds in pipeline.data_sources] == ["extra", "orders"]
+    summary = pipeline.run_summary().set_index(["data_source", "check"])
+    assert summary.loc[("orders", "price_signs.positive"), "failed_rows"].tolist() == [1, 2]
+    assert summary.loc[("extra", "price_signs.small"), "failed_rows"].tolist() == [1]
+
+
+def test_failing_multi_output_check_is_one_error():
+    def broken(price: pd.Series) -> pd.DataFrame:
+        raise ValueError("broken")
+
+    class Broken(Orders):
+        dates = prices = None
+        broken_check = Fn(broken, raise_on_error=False)
+
+    summary = Broken().run_summary()
+    assert summary["check"].tolist() == ["broken"]
+    assert summary["status"].tolist() == ["error"]
+
+
+def test_multi_output_partitions_in_columnar_store(tmp_path):
+    pytest.importorskip("pyarrow")
+    from temp_cli.db.columnar import ColumnarStore
+
+    store = ColumnarStore(tmp_path)
+    summary = Orders().run_summary(sinks=[store])
+    run_id = summary["run_id"].iloc[0]
+    out = store.read(run_id, "orders", "date_sanity.not_in_future")
+    assert out.index[out["failed"]].tolist() == [2]
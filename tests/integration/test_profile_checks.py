@@ -0,0 +1,182 @@
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import BimodalPipeline, bimodal_prices, price_outliers
+from tempcli.core import checks
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.pipeline import Pipeline
+from tempcli.core.support.distributed import Coordinator, run_worker
+from tempcli.core.support.executor import Executor, ProcessExecutor, ThreadExecutor
+from tempcli.core.support.profile import PROFILE_COLUMNS, Profile
+
+SPAWN = multiprocessing.get_context("spawn")
+
+
+def prices() -> pd.DataFrame:
+    return pd.DataFrame({
+        "price": [10.0, 11.0, None, 10.0, 40.0, 9.0, 10.0],
+        "category": ["a", "b", "a", None, "a", "c", "a"],
+        "date": pd.to_datetime(["2025-01-03", None, "2025-01-01", "2025-01-02", "2025-01-10", "2025-01-04", None]),
+    })
+
+
+class ProfiledChecks(Pipeline):
+    alias_map = {"price": "price", "category": "category", "date": "date"}
+
+    prices = DataSource("prices", prices())
+
+    outliers = Fn(price_outliers)
+    price_nulls = checks.null_rate_at_most("price", 0.1)
+    category_nulls = checks.null_rate_at_most("category", 0.2)
+    categories = checks.distinct_between("category", 2, 3)
+    price_bounds = checks.bounded("price", 0, 30)
+    date_bounds = checks.bounded("date", pd.Timestamp("2025-01-01"), pd.Timestamp("2025-12-31"))
+    zscore = checks.zscore_within("price", 2)
+
+
+def test_profile():
+    data = DataSource("prices", prices())
+    profiles = data.profile()
+
+    price = profiles["price"]
+    assert (price.rows, price.nulls, price.distinct) == (7, 1, 4)
+    assert (price.min, price.max) == (9.0, 40.0)
+    assert price.mean == pytest.approx(15.0)
+    assert price.std == pytest.approx(np.std([10, 11, 10, 40, 9, 10], ddof=1))
+    assert price.top[0] == (10.0, 3)
+
+    category = profiles["category"]
+    assert (category.nulls, category.distinct, category.min, category.top[0]) == (1, 3, None, ("a", 4))
+    assert category.null_rate == pytest.approx(1 / 7)
+
+    date = profiles["date"]
+    assert (date.min, date.max) == (pd.Timestamp("2025-01-01"), pd.Timestamp("2025-01-10"))
+
+    empty = DataSource("empty", pd.DataFrame({"price": [np.nan, np.nan]})).profile()["price"]
+    assert (empty.nulls, empty.distinct, empty.min, empty.null_rate) == (2, 0, None, 1.0)
+
+    with pytest.raises(KeyError, match="volume"):
+        data.profile(["volume"])
+
+
+def test_profiles_are_memoized_with_the_source():
+    data = DataSource("prices", prices())
+    first = data.profile(["price"])["price"]
+    assert data.profile()["price"] is first  # only the other columns are profiled
+    assert data.profile(["price"], top=1)["price"] is not first
+
+    data.data.loc[0, "price"] = 100.0
+    assert data.profile(["price"])["price"] is first
+    data.clear_profile()
+    assert data.profile(["price"])["price"].max == 100.0
+
+
+def test_profile_checks():
+    pipeline = ProfiledChecks()
+    summary = pipeline.run_summary().set_index("check")
+
+    # mean 15, std 12.2: only 40 is more than 2 deviations out, and the missing price fails the z-score
+    assert summary.loc["price_outliers", "failed_rows"].tolist() == [2, 4]
+    assert summary.loc["zscore", "failed_rows"].tolist() == [2, 4]
+    assert summary.loc["price_nulls", "failed"] == 1
+    assert summary.loc["category_nulls", "failed"] == 0
+    assert summary.loc["categories", "failed"] == 0
+    assert summary.loc["price_bounds", "failed"] == 1
+    assert summary.loc["date_bounds", "failed"] == 0
+
+    # every check read the profile of the one source
+    assert set(c for c, _ in ProfiledChecks.prices._profiles) == {"price", "category", "date"}
+
+
+def test_partitioned_checks_read_the_whole_column_profile():
+    data = pd.concat([prices()] * 50, ignore_index=True)
+
+    class Long(Pipeline):
+        alias_map = ProfiledChecks.alias_map
+        prices = DataSource("prices", data)
+        outliers, zscore, price_nulls = ProfiledChecks.outliers, ProfiledChecks.zscore, ProfiledChecks.price_nulls
+
+    whole = Long().run_summary()
+    executor = Executor(memory_limit=2_000)
+    chunked = Long().run_summary(executor=executor)
+    assert "zscore" in executor.governor.chunked
+    threaded = Long().run_summary(executor=ThreadExecutor(max_workers=4))
+    spawned = Long().run_summary(executor=ProcessExecutor(max_workers=2, mp_context=SPAWN))
+    for other in (chunked, threaded, spawned):
+        pd.testing.assert_series_equal(other["failed_rows"].map(list), whole["failed_rows"].map(list))
+    assert whole.set_index("check").loc["price_outliers", "failed"] == 100
+
+
+def test_parts_of_a_source_keep_its_profiles():
+    data = DataSource("prices", bimodal_prices())
+    whole = data.profile(["price"])["price"]
+    part = data.take(slice(0, 500))
+    assert part.profile(["price"])["price"] is whole
+    assert len(part.data) == 500
+    assert DataSource("prices", part.data).profile(["price"])["price"].mean < 20  # a fresh source of the rows
+
+
+def test_profiled_checks_agree_across_executors():
+    # each mode is within 1.5 deviations of the mean of both, but far from the mean of its own rows
+    local = BimodalPipeline().run_summary()
+    assert local["failed"].tolist() == [0]
+
+    for executor in (Executor(memory_limit=20_000), ProcessExecutor(max_workers=2, mp_context=SPAWN)):
+        summary = BimodalPipeline().run_summary(executor=executor)
+        assert summary["failed"].tolist() == [0]
+
+    with Coordinator(BimodalPipeline(), b"tempcli-test", chunk_rows=500) as coordinator:
+        assert len(coordinator.tasks(run_id=None)) == 4
+        workers = [
+            SPAWN.Process(target=run_worker, args=(coordinator.address, b"tempcli-test", BimodalPipeline))
+            for _ in range(2)
+        ]
+        for w in workers:
+            w.start()
+        distributed = coordinator.run_summary(timeout=60)
+    for w in workers:
+        w.join(timeout=10)
+    assert distributed["failed"].tolist() == [0]
+
+
+def below(price: pd.Series) -> pd.Series:
+    return price < 100
+
+
+def test_gated_profiled_checks_read_the_whole_columns():
+    class Gated(BimodalPipeline):
+        gate = Fn(below)
+        zscore = checks.zscore_within("price", 1.2, depends_on=below, on_upstream_failure="passing_rows")
+
+    summary = Gated().run_summary().set_index("check")
+    assert summary.loc["below", "failed"] > 0
+    # against the statistics of the passing rows alone, the high prices left would be outliers
+    assert summary.loc["zscore", "failed"] == 0
+
+
+def test_pipeline_profile():
+    profile = ProfiledChecks().profile(top=2)
+    assert list(profile.columns) == list(PROFILE_COLUMNS)
+    assert profile["column"].tolist() == ["price", "category", "date"]
+    assert profile["parameter"].tolist() == ["price", "category", "date"]
+    assert profile.set_index("column").loc["category", "top"] == (("a", 4), ("b", 1))
+
+
+def test_bad_profile_checks():
+    def scalar(price: pd.Series, profile: Profile, limit: int) -> pd.Series:
+        return price < limit
+
+    with pytest.raises(ValueError):
+        Fn(scalar)
+    with pytest.raises(ValueError, match="row_local"):
+        checks.null_rate_at_most("price", 0.1, row_local=True)
+    with pytest.raises(ValueError):
+        checks.null_rate_at_most("price", 2)
+    with pytest.raises(ValueError):
+        checks.distinct_between("price")
+    with pytest.raises(ValueError):
+        checks.zscore_within("price", 0)
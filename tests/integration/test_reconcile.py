@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tempcli.core.components.data import DataSource
+from tempcli.core.reconcile import Reconciler, Tolerance, reconcile, values_match
+
+ALIASES = {
+    "iid": ["iid", "Item ID"],
+    "price": ["price", "Unit Price"],
+    "category": ["category", "Category"],
+}
+
+
+def system() -> DataSource:
+    return DataSource("system", pd.DataFrame({
+        "iid": [1, 2, 3, 4, 5, 2],
+        "price": [10.0, 20.0, 30.0, np.nan, 50.0, 99.0],
+        "category": ["A", "B", "C", "D", "E", "B"],
+    }))
+
+
+def vendor() -> DataSource:
+    return DataSource("vendor", pd.DataFrame({
+        "Item ID": [5, 3, 2, 7, 1, 3],
+        "Unit Price": [50.004, 31.0, 20.0, 70.0, 10.0, 0.0],
+        "Category": ["E", "C", "X", "G", "A", "C"],
+    }))
+
+
+def test_reconcile_splits_rows_into_sets():
+    outcome = reconcile(system(), vendor(), ALIASES, key="iid", compare={"price": 0.01, "category": None})
+
+    # pairs follow the right rows: 5, 3, 2, 1
+    assert outcome.right_rows.tolist() == [0, 1, 2, 4]
+    assert outcome.left_rows.tolist() == [4, 2, 1, 0]
+    assert outcome.mismatches["price"].tolist() == [1]  # 30 vs 31
+    assert outcome.mismatches["category"].tolist() == [2]  # B vs X
+    assert outcome.matched.tolist() == [0, 3]
+    assert outcome.missing_right.tolist() == [3]  # iid 4
+    assert outcome.missing_left.tolist() == [3]  # Item ID 7
+    assert outcome.duplicate_left.tolist() == [5]
+    assert outcome.duplicate_right.tolist() == [5]
+    assert outcome.counts() == {
+        "pairs": 4,
+        "matched": 2,
+        "mismatched": 2,
+        "missing_left": 1,
+        "missing_right": 1,
+        "duplicate_left": 1,
+        "duplicate_right": 1,
+    }
+    assert outcome.summary()["mismatched"].tolist() == [1, 1]
+
+
+def test_reconciler_reuses_the_left_index():
+    reconciler = Reconciler(system(), ALIASES, key="iid")
+    assert set(reconciler.tolerances) == {"price", "category"}
+
+    same = reconciler.against(DataSource("copy", system().data.drop_duplicates("iid")))
+    assert same.counts()["matched"] == 5
+    assert same.counts()["mismatched"] == 0  # NaN matches NaN
+
+    other = reconciler.against(vendor())
+    assert other.counts()["pairs"] == 4
+
+
+def test_composite_keys():
+    left = DataSource("left", pd.DataFrame({"iid": [1, 1, 2], "category": ["A", "B", "A"], "price": [1.0, 2.0, 3.0]}))
+    right = DataSource("right", pd.DataFrame({"iid": [1, 2, 1], "category": ["B", "B", "A"], "price": [2.0, 3.0, 1.5]}))
+
+    outcome = reconcile(left, right, ALIASES, key=["iid", "category"], compare=["price"])
+    assert outcome.left_rows.tolist() == [1, 0]
+    assert outcome.mismatches["price"].tolist() == [1]
+    assert outcome.missing_right.tolist() == [2]
+    assert outcome.missing_left.tolist() == [1]
+
+
+def test_values_match_with_tolerances():
+    left = np.array([100.0, 100.0, np.nan, np.nan, 1.0])
+    right = np.array([100.5, 102.0, np.nan, 1.0, 1.0])
+    assert values_match(left, right, Tolerance(rel_tol=0.01)).tolist() == [True, False, True, False, True]
+
+    nullable = pd.array([1, None, 3], dtype="Int64").to_numpy(dtype=object)
+    assert values_match(nullable, np.array([1, None, 4], dtype=object)).tolist() == [True, True, False]
+
+
+def test_reconcile_needs_one_column_per_parameter():
+    with pytest.raises(KeyError, match="sku"):
+        reconcile(system(), vendor(), ALIASES | {"sku": "sku"}, key="sku")
+
+    both = DataSource("both", system().data.assign(**{"Unit Price": 1.0}))
+    with pytest.raises(ValueError, match="several columns"):
+        reconcile(both, vendor(), ALIASES, key="iid", compare=["price"])
@@ -0,0 +1,111 @@
+import gc
+import pickle
+import weakref
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tempcli.core import checks
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.reference import UNPICKLED_REFERENCES, Reference
+from tempcli.core.pipeline import Pipeline
+from tempcli.core.support.executor import ThreadExecutor
+
+CATEGORIES = Reference(DataSource("categories", pd.DataFrame({"code": ["A", "B", "C", "B"]})), "code", "categories")
+TICKS = Reference(np.arange(0, 100, 0.5), name="ticks")
+
+
+class OrderChecks(Pipeline):
+    alias_map = {"category": ["category", "Cat"], "price": "price"}
+
+    orders = DataSource("orders", pd.DataFrame({
+        "category": ["A", "D", None, "C", "b"],
+        "price": [10.0, 10.2, 99.74, np.nan, -1.0],
+    }))
+    more_orders = DataSource("more_orders", pd.DataFrame({"Cat": ["B", "E"], "price": [0.5, 0.6]}))
+
+    categories = CATEGORIES
+    ticks = TICKS
+
+    known_category = checks.in_reference("category", CATEGORIES)
+    on_tick = checks.near_reference("price", TICKS, tolerance=0.25)
+
+
+def test_reference_checks_flag_the_expected_rows():
+    pipeline = OrderChecks()
+    assert pipeline.references == {"categories": CATEGORIES, "ticks": TICKS}
+    assert [fn.name for fn in pipeline.functions] == ["known_category", "on_tick"]
+
+    summary = pipeline.run_summary(executor=ThreadExecutor(max_workers=4)).set_index(["data_source", "check"])
+    assert summary.loc[("orders", "known_category"), "failed_rows"].tolist() == [1, 2, 4]
+    assert summary.loc[("more_orders", "known_category"), "failed_rows"].tolist() == [1]
+    # 10.2 is 0.2 from 10.0, 99.74 is 0.24 from 99.5, NaN and -1.0 are too far from everything
+    assert summary.loc[("orders", "on_tick"), "failed_rows"].tolist() == [3, 4]
+    assert summary.loc[("more_orders", "on_tick"), "failed_rows"].tolist() == []
+
+
+def test_lookup_structures_are_built_once():
+    reference = Reference(["x", "y", "z", "x"])
+    index = reference.build().index
+    assert index.tolist() == ["x", "y", "z"]
+    assert reference.sorted.tolist() == ["x", "y", "z"]
+
+    for _ in range(3):
+        reference.contains(pd.Series(["x", "q"]))
+    assert reference.index is index
+
+    # copies sent to a worker find the index another copy built in that process, by token
+    copy = pickle.loads(pickle.dumps(reference))
+    assert set(reference.__getstate__()) == {"values", "name", "token"}
+    assert copy.token == reference.token
+    built = copy.index
+    assert built is not index and built.equals(index)
+    assert pickle.loads(pickle.dumps(reference)).index is built
+
+
+def test_indexes_go_with_their_reference():
+    reference = Reference(np.arange(1_000)).build()
+    index = weakref.ref(reference.index)
+    del reference
+    gc.collect()
+    assert index() is None
+
+    # a worker only keeps the indexes of its most recent References
+    references = [Reference([i]) for i in range(UNPICKLED_REFERENCES + 1)]
+    first = weakref.ref(pickle.loads(pickle.dumps(references[0])).index)
+    for reference in references[1:]:
+        pickle.loads(pickle.dumps(reference)).build()
+    gc.collect()
+    assert first() is None
+
+
+def test_missing_values_and_empty_references():
+    with_missing = Reference(pd.Series([1.0, np.nan]))
+    assert with_missing.contains(pd.Series([np.nan, 2.0, 1.0])).tolist() == [True, False, True]
+
+    empty = Reference([])
+    assert empty.contains(pd.Series([1, 2])).tolist() == [False, False]
+    assert empty.within(pd.Series([1, 2]), tolerance=10).tolist() == [False, False]
+
+    dates = Reference(pd.to_datetime(["2025-01-01", "2025-02-01"]))
+    values = pd.Series(pd.to_datetime(["2025-01-02", "2025-01-15", None]))
+    assert dates.within(values, pd.Timedelta("1D")).tolist() == [True, False, False]
+
+
+def test_large_references():
+    rng = np.random.default_rng(seed=0)
+    reference = Reference(rng.permutation(4_000_000)[:2_000_000])
+    values = pd.Series(rng.integers(0, 4_000_000, size=500_000))
+
+    expected = values.isin(set(reference.values.tolist()))
+    assert reference.contains(values).equals(expected)
+
+
+def test_bad_references():
+    with pytest.raises(ValueError, match="column"):
+        Reference(DataSource("categories", pd.DataFrame({"code": ["A"]})))
+    with pytest.raises(TypeError):
+        Reference("ABC")
+    with pytest.raises(TypeError):
+        Reference(5)
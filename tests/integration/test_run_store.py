@@ -0,0 +1,123 @@
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import BasicPipeline
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.pipeline import Pipeline
+from temp_cli.db.store import RunStore, decode_positions, encode_positions
+
+
+@pytest.fixture
+def store(tmp_path):
+    with RunStore(tmp_path / "history.sqlite") as s:
+        yield s
+
+
+@pytest.mark.parametrize("positions", [
+    pytest.param(np.array([], dtype=np.int64), id="empty"),
+    pytest.param(np.array([3, 4, 5, 900, 10_000_000]), id="sparse"),
+    pytest.param(np.arange(0, 100_000, 2), id="dense"),
+])
+def test_positions_round_trip(positions):
+    assert np.array_equal(decode_positions(encode_positions(positions)), positions)
+
+
+def test_save_and_read_back(store):
+    pipeline = BasicPipeline()
+    summary = pipeline.run_summary(raise_errors=False)
+    run_id = store.save(summary, pipeline="BasicPipeline")
+
+    assert store.runs()["run_id"].tolist() == [str(run_id)]
+    assert len(store.check_results(run_id)) == len(summary)
+
+    row = summary[summary["failed"] > 0].iloc[0]
+    rows = store.failing_rows(run_id, row["data_key"], row["fn_key"], columns=row["columns"])
+    np.testing.assert_array_equal(rows, row["failed_rows"])
+
+
+def test_failure_trend_window(store):
+    pipeline = BasicPipeline()
+    now = datetime.now()
+    for days_ago in (120, 30, 10, 1):
+        store.save(pipeline.run_summary(raise_errors=False), created_at=now - timedelta(days=days_ago))
+
+    fn = next(f for f in pipeline.functions if f.name == "price_below_cool_price")
+    ds = next(d for d in pipeline.data_sources if d.name == "basic_report")
+
+    trend = store.failure_trend(fn.key, days=90)
+    assert len(trend) == 3
+    assert trend["created_at"].is_monotonic_increasing
+
+    trend = store.failure_trend(fn.key, days=90, data_key=ds.key)
+    assert trend["rows"].tolist() == [6, 6, 6]
+    assert trend["failure_rate"].tolist() == pytest.approx([2 / 6] * 3)
+
+
+def test_failure_trend_uses_index(store):
+    plan = store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT run_id FROM check_results WHERE fn_key = ? AND created_at >= ?",
+        ("k", 0.0),
+    ).fetchall()
+    assert any("ix_check_results_fn" in str(step) for step in plan)
+
+
+def test_failure_trend_is_fast(store):
+    summary = BasicPipeline().run_summary(raise_errors=False)
+    for i in range(200):
+        summary = summary.assign(run_id=uuid4())
+        store.save(summary, created_at=datetime.now() - timedelta(hours=i))
+
+    start = time.perf_counter()
+    trend = store.failure_trend(summary["fn_key"].iloc[0], days=90)
+    assert time.perf_counter() - start < 0.1
+    assert len(trend) == 200
+
+
+def test_multi_output_checks_are_stored_per_output(store):
+    def signs(price: pd.Series) -> pd.DataFrame:
+        return pd.DataFrame({"positive": price > 0, "small": price < 50})
+
+    class Signs(Pipeline):
+        alias_map = {"price": "price"}
+        prices = DataSource("prices", pd.DataFrame({"price": [10.0, -5.0, 60.0, 20.0]}))
+        check = Fn(signs)
+
+    pipeline = Signs()
+    summary = pipeline.run_summary()
+    run_id = store.save(summary)
+    fn, ds = pipeline.functions[0], pipeline.data_sources[0]
+
+    assert store.failing_rows(run_id, ds.key, fn.key, check="signs.positive").tolist() == [1]
+    assert store.failing_rows(run_id, ds.key, fn.key, check="signs.small").tolist() == [2]
+    with pytest.raises(ValueError, match="several outputs"):
+        store.failing_rows(run_id, ds.key, fn.key)
+
+    trend = store.failure_trend(fn.key)
+    assert trend["check"].tolist() == ["signs.positive", "signs.small"]
+    assert trend["failure_rate"].tolist() == [0.25, 0.25]
+    assert store.failure_trend(fn.key, check="signs.small")["failed"].tolist() == [1]
+
+
+def test_older_databases_are_migrated(tmp_path):
+    path = tmp_path / "old.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE failing_rows (run_id TEXT NOT NULL, data_key TEXT NOT NULL, fn_key TEXT NOT NULL, "
+        "columns TEXT, n INTEGER NOT NULL, positions BLOB NOT NULL)"
+    )
+    conn.close()
+
+    with RunStore(path) as store:
+        pipeline = BasicPipeline()
+        summary = pipeline.run_summary(raise_errors=False)
+        run_id = store.save(summary)
+        row = summary[summary["failed"] > 0].iloc[0]
+        rows = store.failing_rows(run_id, row["data_key"], row["fn_key"], columns=row["columns"])
+        np.testing.assert_array_equal(rows, row["failed_rows"])
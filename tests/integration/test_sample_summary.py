@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import BasicPipeline
+from tempcli.core.support.sample import Sample, sample_positions, wilson_interval
+
+
+class LargePipeline(BasicPipeline):
+    alias_map = BasicPipeline.alias_map | {"kind": "category"}
+
+
+def _large_only(pipeline):
+    pipeline.data_sources = [ds for ds in pipeline.data_sources if ds.name == "large_report"]
+    pipeline.functions = [f for f in pipeline.functions if f.name == "price_below_cool_price"]
+    return pipeline
+
+
+def test_sample_positions_are_deterministic_and_stratified():
+    strata = pd.Series(np.repeat(["A", "B", "C"], [8_000, 1_900, 100]))
+    positions, weights = sample_positions(len(strata), 500, strata=strata, seed=3)
+    again, _ = sample_positions(len(strata), 500, strata=strata, seed=3)
+
+    np.testing.assert_array_equal(positions, again)
+    assert np.all(np.diff(positions) > 0)
+    assert strata.iloc[positions].value_counts().to_dict() == {"A": 400, "B": 95, "C": 5}
+    assert weights.sum() == pytest.approx(len(strata))
+
+
+def test_sample_smaller_source_is_used_whole():
+    positions, weights = sample_positions(10, 50)
+    np.testing.assert_array_equal(positions, np.arange(10))
+    assert weights.tolist() == [1.0] * 10
+
+
+def test_wilson_interval_bounds():
+    low, high = wilson_interval(np.array([0, 50, 100]), np.array([100, 100, 100]))
+    assert low[0] == 0 and high[0] > 0
+    assert low[1] < 0.5 < high[1]
+    assert high[2] == 1 and low[2] < 1
+
+
+@pytest.mark.parametrize("by", [None, "kind", "category"])
+def test_sample_estimate_covers_the_full_rate(by):
+    pipeline = _large_only(LargePipeline())
+    full = pipeline.run_summary().iloc[0]
+    estimate = pipeline.sample_summary(Sample(rows=2_000, by=by, seed=1)).iloc[0]
+
+    assert estimate["rows"] == 2_000
+    assert estimate["population_rows"] == 10_000
+    assert estimate["ci_low"] <= full["failure_rate"] <= estimate["ci_high"]
+    # failing positions point at source rows that really fail
+    assert set(estimate["failed_rows"]) <= set(full["failed_rows"])
+
+
+def test_sample_first_then_full_run():
+    pipeline = _large_only(LargePipeline())
+    summary = pipeline.run_summary(sample_first=Sample(rows=500), proceed=lambda est: est["ci_high"].max() < 0.9)
+    assert pipeline.estimate is not None
+    assert summary.iloc[0]["rows"] == 10_000
+
+
+def test_sample_first_can_skip_the_full_run():
+    pipeline = _large_only(LargePipeline())
+    summary = pipeline.run_summary(sample_first=Sample(rows=500), proceed=lambda est: False)
+    assert summary["status"].eq("cancelled").all()
+    assert len(pipeline.estimate) == len(summary)
+
+
+def test_sample_summary_reports_errors():
+    pipeline = BasicPipeline()
+    estimate = pipeline.sample_summary(Sample(rows=3), raise_errors=False)
+    errors = estimate[estimate["status"] == "error"]
+    assert len(errors) == 1
+    assert errors["ci_low"].isna().all()
@@ -0,0 +1,84 @@
+import time
+
+import pandas as pd
+import pytest
+
+from tempcli.core.components.data import DataSource
+from tempcli.core.pipeline import Pipeline
+from tempcli.core.support.executor import Executor, ThreadExecutor, schedule_tasks
+from tempcli.core.support.timings import TimingHistory
+
+SHORT = 0.1
+LONG = 0.4
+
+
+def _sleeper(seconds: float, name: str):
+    def check(price: pd.Series) -> pd.Series:
+        time.sleep(seconds)
+        return price > 0
+    check.__name__ = name
+    return check
+
+
+class SleepyPipeline(Pipeline):
+    alias_map = {"price": "price"}
+
+    prices = DataSource("prices", pd.DataFrame({"price": [1.0, 2.0, 3.0]}))
+
+    short_1 = _sleeper(SHORT, "short_1")
+    short_2 = _sleeper(SHORT, "short_2")
+    short_3 = _sleeper(SHORT, "short_3")
+    short_4 = _sleeper(SHORT, "short_4")
+    slow = _sleeper(LONG, "slow")  # defined last, so without history it starts last
+
+
+def test_timing_history_scales_with_rows(tmp_path):
+    pipeline = SleepyPipeline()
+    task = pipeline.tasks()[0]
+    history = TimingHistory(tmp_path / "timings.json", smoothing=0.5)
+
+    assert history.estimate(task.fn, task.data) is None
+    history.record(task.fn, task.data, 3.0)
+    history.record(task.fn, task.data, 1.0)
+    assert history.estimate(task.fn, task.data) == pytest.approx(2.0)
+
+    bigger = DataSource("prices", pd.DataFrame({"price": range(30)}))
+    assert history.estimate(task.fn, bigger) == pytest.approx(20.0)
+
+    history.save()
+    assert TimingHistory(tmp_path / "timings.json").estimate(task.fn, task.data) == pytest.approx(2.0)
+
+
+def test_schedule_orders_by_expected_runtime():
+    tasks = SleepyPipeline().tasks()
+    by_name = {t.fn.name: t for t in tasks}
+    history = TimingHistory()
+    for name, seconds in [("short_1", 0.01), ("short_2", 1.0), ("short_3", 2.0), ("slow", 5.0)]:
+        history.record(by_name[name].fn, by_name[name].data, seconds)
+
+    # cheap first, then never-ran, then longest first
+    parallel = [t.fn.name for t in schedule_tasks(tasks, history, workers=4)]
+    assert parallel == ["short_1", "short_4", "slow", "short_3", "short_2"]
+
+    # shortest first on a single worker
+    serial = [t.fn.name for t in schedule_tasks(tasks, history, workers=1)]
+    assert serial == ["short_1", "short_2", "short_3", "slow", "short_4"]
+
+
+def test_history_shortens_the_makespan():
+    pipeline = SleepyPipeline()
+    executor = ThreadExecutor(max_workers=2, history=TimingHistory())
+
+    first = pipeline.run_summary(executor=executor).attrs["schedule"]
+    second = pipeline.run_summary(executor=executor).attrs["schedule"]
+
+    assert first["total_work"] == pytest.approx(4 * SHORT + LONG, abs=0.1)
+    assert first["makespan"] >= 2 * SHORT + LONG - 0.02  # the long check started last
+    assert second["makespan"] < first["makespan"] - SHORT
+    assert second["efficiency"] > first["efficiency"]
+
+
+def test_serial_run_reports_schedule():
+    stats = SleepyPipeline().run_summary(executor=Executor()).attrs["schedule"]
+    assert stats["workers"] == 1
+    assert stats["efficiency"] == pytest.approx(1.0, abs=0.1)
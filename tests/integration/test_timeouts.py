@@ -0,0 +1,109 @@
+import multiprocessing
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import BasicPipeline, hangs
+from tempcli.core.components.func import Fn
+from tempcli.core.support.executor import Executor, ProcessExecutor, ThreadExecutor
+
+SPAWN = multiprocessing.get_context("spawn")
+release = threading.Event()
+
+
+def stuck(price: pd.Series) -> pd.Series:
+    """hangs until the test lets it go, so abandoned threads don't outlive the test run"""
+    release.wait(timeout=30)
+    return price > 0
+
+
+class StuckPipeline(BasicPipeline):
+    stuck_check = Fn(stuck, timeout=0.3)
+
+
+class HangingPipeline(BasicPipeline):
+    hanging_check = Fn(hangs, timeout=0.5)
+
+
+@pytest.fixture
+def released():
+    release.clear()
+    yield
+    release.set()
+
+
+def socket_timeout(price: pd.Series) -> pd.Series:
+    raise TimeoutError("the socket timed out")
+
+
+@pytest.mark.parametrize("executor", [Executor(), ThreadExecutor(max_workers=2)], ids=["serial", "thread"])
+@pytest.mark.parametrize("timeout", [None, 5], ids=["untimed", "timed"])
+def test_a_timeout_error_from_the_check_is_an_error(executor, timeout):
+    # like any other error of the check, rather than the check running over its own timeout
+    class Raising(BasicPipeline):
+        socket_check = Fn(socket_timeout, timeout=timeout)
+
+    with pytest.raises(TimeoutError, match="the socket timed out"):
+        Raising().run_summary(raise_errors=False, executor=executor)
+
+    class Caught(BasicPipeline):
+        socket_check = Fn(socket_timeout, raise_on_error=False, timeout=timeout)
+
+    summary = Caught().run_summary(raise_errors=False, executor=executor)
+    assert _statuses(summary, "socket_timeout") == ["error", "error"]
+
+
+def test_single_thread_isnt_held_by_an_overrunning_check(released):
+    start = time.perf_counter()
+    summary = StuckPipeline().run_summary(raise_errors=False, executor=ThreadExecutor(max_workers=1))
+    elapsed = time.perf_counter() - start
+
+    # two sources, each abandoning `stuck` after 0.3s, rather than waiting for it in the only pool thread
+    assert _statuses(summary, "stuck") == ["timeout", "timeout"]
+    assert set(_statuses(summary, "price_below_cool_price")) <= {"pass", "fail"}
+    assert elapsed < 1.5
+
+
+def _statuses(summary: pd.DataFrame, check: str) -> list[str]:
+    return summary.loc[summary["check"] == check, "status"].tolist()
+
+
+@pytest.mark.parametrize("executor", [Executor(), ThreadExecutor(max_workers=2)], ids=["serial", "thread"])
+def test_thread_modes_abandon_overrunning_check(released, executor):
+    start = time.perf_counter()
+    summary = StuckPipeline().run_summary(raise_errors=False, executor=executor)
+    elapsed = time.perf_counter() - start
+
+    assert _statuses(summary, "stuck") == ["timeout", "timeout"]
+    assert "timed out after 0.3s" in summary.loc[summary["check"] == "stuck", "message"].iloc[0]
+    # the rest of the pipeline still ran, and nothing waited for the abandoned threads
+    assert set(_statuses(summary, "price_below_cool_price")) <= {"pass", "fail"}
+    assert elapsed < 2
+
+
+def test_process_mode_kills_overrunning_check():
+    start = time.perf_counter()
+    executor = ProcessExecutor(max_workers=2, mp_context=SPAWN)
+    summary = HangingPipeline().run_summary(raise_errors=False, executor=executor)
+    elapsed = time.perf_counter() - start
+
+    assert _statuses(summary, "hangs") == ["timeout", "timeout"]
+    assert set(_statuses(summary, "price_below_cool_price")) <= {"pass", "fail"}
+    assert elapsed < 20
+    assert multiprocessing.active_children() == []
+
+
+def test_timed_check_that_finishes_in_time():
+    class Quick(BasicPipeline):
+        price_check = Fn(BasicPipeline.price_check, timeout=10)
+
+    timed = Quick().run_summary(raise_errors=False, executor=ProcessExecutor(max_workers=1, mp_context=SPAWN))
+    plain = BasicPipeline().run_summary(raise_errors=False)
+    assert timed["failed"].tolist() == plain["failed"].tolist()
+
+
+def test_timeout_must_be_positive():
+    with pytest.raises(ValueError):
+        Fn(hangs, timeout=0)
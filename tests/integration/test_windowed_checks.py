@@ -0,0 +1,155 @@
+import gc
+import multiprocessing
+import weakref
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers.pipeline_helpers import no_big_jumps
+from tempcli.core.components.data import DataSource
+from tempcli.core.components.func import Fn
+from tempcli.core.pipeline import Pipeline
+from tempcli.core.support.executor import Executor, ProcessExecutor, ThreadExecutor
+from tempcli.core.support.window import Rolling, Window
+
+SPAWN = multiprocessing.get_context("spawn")
+
+
+def mean_within_bounds(price: pd.Series, rolling: Rolling) -> pd.Series:
+    return rolling.mean("price").between(9, 11)
+
+
+def enough_history(price: pd.Series, rolling: Rolling) -> pd.Series:
+    return rolling.count("price") >= 2
+
+
+def prices() -> pd.DataFrame:
+    # out of date order on purpose
+    return pd.DataFrame({
+        "date": pd.to_datetime([
+            "2025-01-03", "2025-01-01", "2025-01-02", "2025-01-10", "2025-01-04", None, "2025-01-05",
+        ]),
+        "price": [10.0, 10.0, 11.0, 10.0, 13.5, 10.0, 9.0],
+    })
+
+
+class PriceChecks(Pipeline):
+    alias_map = {"date": "date", "price": "price"}
+
+    prices = DataSource("prices", prices())
+
+    jumps = Fn(no_big_jumps, window=Window("date", 1))
+    bounded = Fn(mean_within_bounds, window=Window("date", "3D"))
+    history = Fn(enough_history, window=Window("date", "3D"))
+
+
+def test_windowed_checks_run_in_date_order():
+    summary = PriceChecks().run_summary().set_index("check")
+
+    # in date order: 10, 11, 10, 13.5 (+35%), 9 (-33%), then 10 on the 10th; the undated row has no change
+    assert summary.loc["no_big_jumps", "failed_rows"].tolist() == [4, 6]
+    # 3 day means: 10, 10.5, 10.33, 11.5, 10.83, 10; the undated row has no mean
+    assert summary.loc["mean_within_bounds", "failed_rows"].tolist() == [4, 5]
+    assert summary.loc["enough_history", "failed_rows"].tolist() == [1, 3, 5]
+
+
+def test_statistics_are_shared_by_checks_with_the_same_window():
+    pipeline = PriceChecks()
+    pipeline.run_summary(executor=ThreadExecutor(max_workers=4))
+    pipeline.run_summary()
+    # one per window, for both runs
+    assert pipeline.alias_map.windows.builds == 2
+
+    seen = []
+
+    def record(price: pd.Series, rolling: Rolling) -> pd.Series:
+        seen.append(rolling.mean("price"))
+        assert rolling.mean(price * 2).equals(seen[-1] * 2)  # a derived Series is computed on the spot
+        return price > 0
+
+    fn = Fn(record, window=Window("date", "3D"))
+    pipeline.alias_map.generate_results(PriceChecks.prices, fn).unwrap()
+    pipeline.alias_map.generate_results(PriceChecks.prices, fn).unwrap()
+    assert seen[0] is seen[1]
+
+
+@pytest.mark.parametrize("window", [Window("date", 3), Window("date", "2D"), Window("date", 50, min_periods=1)])
+def test_chunks_carry_the_window(window):
+    rng = np.random.default_rng(seed=3)
+    dates = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 60, size=500), unit="D")
+    data = DataSource("random", pd.DataFrame({"date": dates, "price": rng.uniform(9, 11, size=500)}))
+    data.data.loc[rng.random(500) < 0.02, "date"] = pd.NaT
+
+    def statistics(price: pd.Series, rolling: Rolling) -> pd.Series:
+        return rolling.mean("price") + rolling.std("price") + rolling.diff("price")
+
+    pipeline = PriceChecks()
+    fn = Fn(statistics, window=window)
+    [whole] = pipeline.alias_map.generate_results(data, fn).unwrap()
+    [chunked] = pipeline.alias_map.generate_results(data, fn, chunk_rows=37).unwrap()
+    pd.testing.assert_series_equal(chunked.result, whole.result)
+
+
+def test_windowed_checks_are_chunked_under_a_memory_limit():
+    data = pd.concat([prices()] * 200, ignore_index=True)
+    data["date"] += pd.to_timedelta(np.repeat(np.arange(200) * 30, 7), unit="D")
+
+    class Long(Pipeline):
+        alias_map = PriceChecks.alias_map
+        prices = DataSource("prices", data)
+        jumps, bounded, history = PriceChecks.jumps, PriceChecks.bounded, PriceChecks.history
+
+    whole = Long().run_summary()
+    executor = Executor(memory_limit=5_000)
+    chunked = Long().run_summary(executor=executor)
+    assert "no_big_jumps" in executor.governor.chunked
+    pd.testing.assert_series_equal(chunked["failed_rows"].map(list), whole["failed_rows"].map(list))
+
+    spawned = Long().run_summary(executor=ProcessExecutor(max_workers=2, mp_context=SPAWN))
+    pd.testing.assert_series_equal(spawned["failed_rows"].map(list), whole["failed_rows"].map(list))
+
+
+def test_bad_windows():
+    def no_rolling(price: pd.Series) -> pd.Series:
+        return price > 0
+
+    with pytest.raises(ValueError, match="Rolling"):
+        Fn(no_rolling, window=Window("date", 3))
+    with pytest.raises(ValueError, match="no window"):
+        Fn(mean_within_bounds)
+    with pytest.raises(ValueError):
+        Window("date", 0)
+    with pytest.raises(ValueError):
+        Window("date", "soon")
+
+    class Undated(Pipeline):
+        alias_map = {"date": "date", "price": "price"}
+        prices = DataSource("prices", pd.DataFrame({"price": [1.0]}))
+        bounded = Fn(mean_within_bounds, window=Window("date", "3D"))
+
+    with pytest.raises(KeyError, match="Can't window"):
+        Undated().run_summary()
+
+    def unknown(price: pd.Series, rolling: Rolling) -> pd.Series:
+        return rolling.mean("volume") > 0
+
+    with pytest.raises(KeyError, match="volume"):
+        PriceChecks().alias_map.generate_results(PriceChecks.prices, Fn(unknown, window=Window("date", 3)))
+
+
+
+def test_cached_statistics_go_with_their_frame():
+    pipeline = PriceChecks()
+    fn = Fn(mean_within_bounds, window=Window("date", "3D"))
+    frames = []
+    for _ in range(5):
+        data = DataSource("prices", prices())
+        pipeline.alias_map.generate_results(data, fn).unwrap()
+        frames.append(weakref.ref(data.data))
+        del data
+
+    gc.collect()
+    assert pipeline.alias_map.windows.builds == 5
+    assert all(frame() is None for frame in frames)
+    assert pipeline.alias_map.windows._values == {}